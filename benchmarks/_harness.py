@@ -0,0 +1,158 @@
+# benchmarks/_harness.py
+# Boots a service's FastAPI app in-process against Postgres or a SQLite stand-in.
+#
+# Every service is written to run from its own directory with top-level `core`,
+# `models`, `routes`... packages, so only one service can be imported at a time:
+# load_service() drops the previous service's modules from sys.modules first.
+import os
+import sys
+import importlib
+import tempfile
+from dataclasses import dataclass
+
+from sqlalchemy import JSON, ColumnDefault, DefaultClause, Uuid, event, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.sql import functions
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Top-level module names the services use; purged between loads
+# now() in the format SQLAlchemy binds datetimes with on SQLite, so keyset comparisons line up
+SQLITE_NOW = "(strftime('%Y-%m-%d %H:%M:%f000', 'now'))"
+
+SERVICE_MODULES = ("core", "models", "routes", "routers", "crud", "schemas", "app", "main", "config", "mailconfig")
+
+
+@dataclass
+class ServiceSpec:
+    directory: str
+    package: str  # "" for services laid out as core/, "app" for app/core/
+    schemas: tuple
+
+
+SERVICES = {
+    "booking": ServiceSpec("booking_service", "", ("bookings",)),
+    "vehicle": ServiceSpec("vehicle_service", "", ("vehicles",)),
+    "expenses": ServiceSpec("expenses_service", "", ("expense", "insurance")),
+    "insurance": ServiceSpec("insurance_service", "", ("insurance",)),
+    "provider": ServiceSpec("service_provider_service", "app", ("service_providers",)),
+    "user": ServiceSpec("user_service", "", ("users",)),
+}
+
+
+@dataclass
+class LoadedService:
+    name: str
+    app: object
+    db: object  # the service's core.db module
+    models: list
+
+
+def default_database_url() -> str:
+    return f"sqlite:///{tempfile.mkdtemp(prefix='carserve-bench-')}/bench.db"
+
+
+def _purge_service_modules():
+    for mod in list(sys.modules):
+        if mod.split(".")[0] in SERVICE_MODULES:
+            del sys.modules[mod]
+
+
+def _attach_sqlite_schemas(engine, database_url: str, schemas):
+    """SQLite has no schemas: ATTACH one file per schema on every new connection."""
+    base = database_url.split("///", 1)[1].rsplit(".", 1)[0]
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_conn, _record):
+        cur = dbapi_conn.cursor()
+        for schema in schemas:
+            cur.execute(f"ATTACH DATABASE '{base}-{schema}.db' AS {schema}")
+        cur.execute("PRAGMA journal_mode=WAL")
+        cur.execute("PRAGMA busy_timeout=30000")
+        cur.close()
+
+
+def _sqlite_compatible(metadata):
+    # Postgres-only types and server defaults such as '{}'::jsonb cannot be created on SQLite
+    for table in metadata.tables.values():
+        # GIN indexes would be plain b-trees over JSON text there, used by nothing
+        table.indexes -= {ix for ix in table.indexes if ix.dialect_options["postgresql"]["using"] == "gin"}
+        for column in table.columns:
+            if isinstance(column.type, postgresql.UUID):
+                column.type = Uuid(as_uuid=column.type.as_uuid)
+            elif isinstance(column.type, postgresql.JSONB):
+                column.type = JSON()
+            default = column.server_default
+            if default is not None and "::" in str(getattr(default, "arg", "")):
+                column.server_default = None
+            elif default is not None and isinstance(getattr(default, "arg", None), functions.now):
+                # CURRENT_TIMESTAMP drops the microseconds SQLAlchemy writes and compares against
+                column.server_default = DefaultClause(text(SQLITE_NOW))
+            if isinstance(getattr(column.onupdate, "arg", None), functions.now):
+                column.onupdate = ColumnDefault(text(SQLITE_NOW), for_update=True)
+
+
+def _async_sqlite_url(database_url: str) -> str:
+    return database_url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+
+
+def load_service(name: str, database_url: str, env: dict = None, create_tables: bool = True) -> LoadedService:
+    spec = SERVICES[name]
+    service_dir = os.path.join(ROOT, spec.directory)
+    prefix = f"{spec.package}." if spec.package else ""
+    sqlite = database_url.startswith("sqlite")
+
+    _purge_service_modules()
+    sys.path[:] = [p for p in sys.path if not p.startswith(ROOT + os.sep)]
+    sys.path.insert(0, service_dir)
+    os.chdir(service_dir)
+
+    os.environ["DATABASE_URL"] = database_url
+    if sqlite:
+        os.environ["ASYNC_DATABASE_URL"] = _async_sqlite_url(database_url)
+    # Tables come from create_all below; the alembic head check would only log noise
+    os.environ["SCHEMA_MODE"] = "off" if create_tables else "check"
+    for key, value in (env or {}).items():
+        os.environ[key] = str(value)
+    replica_url = os.environ.get("REPLICA_DATABASE_URL", "")
+    if replica_url.startswith("sqlite"):
+        os.environ["ASYNC_REPLICA_DATABASE_URL"] = _async_sqlite_url(replica_url)
+
+    config = importlib.import_module(f"{prefix}core.config")
+    if hasattr(config, "DATABASE_URL"):
+        config.DATABASE_URL = database_url
+        if sqlite:
+            config.ASYNC_DATABASE_URL = _async_sqlite_url(database_url)
+
+    db = importlib.import_module(f"{prefix}core.db")
+    # A replica (env={"REPLICA_DATABASE_URL": ...}) gets the same treatment as the primary
+    engines = [db.engine, getattr(db, "replica_engine", None)]
+    for async_engine in (getattr(db, "async_engine", None), getattr(db, "async_replica_engine", None)):
+        engines.append(async_engine.sync_engine if async_engine is not None else None)
+    engines = [e for e in engines if e is not None]
+    for engine in engines:
+        if engine.dialect.name == "sqlite":
+            _attach_sqlite_schemas(engine, engine.url.render_as_string(hide_password=False), spec.schemas)
+
+    models = [
+        importlib.import_module(f"{prefix}models.{m[:-3]}")
+        for m in sorted(os.listdir(os.path.join(service_dir, spec.package, "models")))
+        if m.endswith(".py") and m != "__init__.py"
+    ]
+    if create_tables:
+        if sqlite:
+            _sqlite_compatible(db.Base.metadata)
+        for engine in engines:
+            if not engine.dialect.is_async:
+                db.Base.metadata.create_all(bind=engine)
+
+    main = importlib.import_module(f"{prefix}main")
+    return LoadedService(name=name, app=main.app, db=db, models=models)
+
+
+def percentile(samples, pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    k = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+    return ordered[k]
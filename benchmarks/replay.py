@@ -0,0 +1,487 @@
+# benchmarks/replay.py
+# Replays a mixed workload against every service in-process and reports per-route latency.
+#
+#   python benchmarks/replay.py --concurrency 50 --requests 2000 --out run-a.json
+#   DB_ASYNC=true python benchmarks/replay.py --out run-b.json
+#   python benchmarks/replay.py --compare run-a.json run-b.json
+#
+# Without --database-url each run gets a fresh SQLite stand-in (one file per schema).
+# Services are booted one after another (see _harness.load_service); each one is seeded,
+# then its share of the workload is replayed at the chosen concurrency.
+#
+# --workload takes a JSONL file of {"service", "method", "path", "weight", "json"} lines
+# to replay instead of the built-in mix; "{user_id}"-style placeholders in the path are
+# filled from the seeded ids.
+#
+# The run exits non-zero when a route answers with more than --max-error-share of unexpected
+# errors, or a request goes over its QUERY_BUDGETS entry: its timings would not describe the
+# path the route is meant to exercise.
+import argparse
+import asyncio
+import importlib
+import json
+import logging
+import os
+import platform
+import random
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import jwt
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from _harness import SERVICES, default_database_url, load_service, percentile
+
+
+def model(service, name):
+    for module in service.models:
+        if hasattr(module, name):
+            return getattr(module, name)
+    raise LookupError(name)
+
+
+def _ids(db, objs):
+    db.add_all(objs)
+    db.flush()
+    ids = [o.id for o in objs]
+    db.commit()
+    return ids
+
+
+# -----------------------
+# Seeding (realistic shapes, scaled by --scale)
+# -----------------------
+def seed_booking(service, scale):
+    Booking, ServiceLog = model(service, "Booking"), model(service, "ServiceLog")
+    users, vehicles, providers = range(1, 50 * scale + 1), [f"veh-{i}" for i in range(100 * scale)], [f"prov-{i}" for i in range(10 * scale)]
+    now = datetime.now(timezone.utc)
+    with Session(service.db.engine) as db:
+        booking_ids = _ids(db, [
+            Booking(
+                user_id=random.choice(users), vehicle_id=random.choice(vehicles), provider_id=random.choice(providers),
+                service_id=f"svc-{random.randrange(20)}", scheduled_at=now + timedelta(hours=random.randrange(-500, 500)),
+                location={"address": "Nairobi"}, meta={"channel": random.choice(["app", "walk-in", "phone"])},
+            )
+            for _ in range(500 * scale)
+        ])
+        _ids(db, [
+            ServiceLog(
+                user_id=random.choice(users), vehicle_id=random.choice(vehicles), provider_id=random.choice(providers),
+                service_name="Full Servicing", service_items={"oil": "changed", "brake_pads": random.choice(["ok", "changed"])},
+                mileage_km=random.randrange(5000, 200000), performed_at=now - timedelta(days=random.randrange(700)),
+                next_service_km=random.randrange(5000, 200000), next_service_date=now + timedelta(days=random.randrange(-30, 180)),
+                logged_by="provider",
+            )
+            for _ in range(2000 * scale)
+        ])
+        # Inserted past the CRUD layer: build the service-due projection as a backfill would
+        importlib.import_module("crud.booking").rebuild_service_due(db)
+    return {"user_id": list(users), "vehicle_id": vehicles, "provider_id": providers, "booking_id": booking_ids}
+
+
+def seed_vehicle(service, scale):
+    Vehicle = model(service, "Vehicle")
+    users = list(range(1, 50 * scale + 1))
+    with Session(service.db.engine) as db:
+        vehicle_ids = _ids(db, [
+            Vehicle(
+                owner_id=random.choice(users), make=random.choice(["Toyota", "Mazda", "Subaru"]), model="Model",
+                plate=f"K{uuid.uuid4().hex[:7].upper()}", mileage=random.randrange(200000), yom=random.randrange(2000, 2025),
+                fuel_type="petrol", transmission="auto", color="white",
+            )
+            for _ in range(100 * scale)
+        ])
+        owners = dict(db.execute(select(Vehicle.id, Vehicle.owner_id)).all())
+    # Vehicles are only found for their owner: requests naming one are signed as its owner
+    return {"user_id": users, "vehicle_id": vehicle_ids, "owner_of": {"vehicle_id": owners}}
+
+
+def seed_expenses(service, scale):
+    Expense = model(service, "Expense")
+    users = list(range(1, 50 * scale + 1))
+    with Session(service.db.engine) as db:
+        _ids(db, [
+            Expense(owner_id=random.choice(users), vehicle_id=f"veh-{random.randrange(100 * scale)}", provider_id=None,
+                    expense_type=random.choice(["fuel", "parking", "repair"]), location="Nairobi", cost=random.randrange(100, 20000))
+            for _ in range(1000 * scale)
+        ])
+    return {"user_id": users}
+
+
+def seed_insurance(service, scale):
+    Policy = model(service, "Insurance_Policy")
+    users = list(range(1, 50 * scale + 1))
+    now = datetime.now(timezone.utc)
+    with Session(service.db.engine) as db:
+        _ids(db, [
+            Policy(owner_id=random.choice(users), vehicle_id=f"veh-{random.randrange(100 * scale)}", provider_id=f"prov-{random.randrange(10)}",
+                   insurance_type=random.choice(["comprehensive", "third_party"]), commencement_date=now, expiry_date=now + timedelta(days=365))
+            for _ in range(200 * scale)
+        ])
+    return {"user_id": users}
+
+
+def seed_provider(service, scale):
+    ProviderCategory, ServiceCategory = model(service, "ProviderCategory"), model(service, "ServiceCategory")
+    Provider, Service, ProviderService = model(service, "Provider"), model(service, "Service"), model(service, "ProviderService")
+    tag = uuid.uuid4().hex[:6]
+    with Session(service.db.engine) as db:
+        pcats = _ids(db, [ProviderCategory(name=f"{n} {tag}") for n in ("Garage", "Insurance", "Car Wash", "Towing")])
+        scats = _ids(db, [ServiceCategory(name=f"{n} {tag}") for n in ("Basic", "Mechanical", "Cosmetic")])
+        service_ids = _ids(db, [
+            Service(category_id=random.choice(scats), name=f"Service {i}", description="", requirements={"fields": []})
+            for i in range(20)
+        ])
+        provider_ids = _ids(db, [
+            Provider(name=f"Provider {i}", category_id=random.choice(pcats), description="", contact_info={"phone": "+2547"},
+                     location={"address": "Nairobi"}, is_registered=True)
+            for i in range(10 * scale)
+        ])
+        _ids(db, [
+            ProviderService(provider_id=p, service_id=s, price="1000", duration="1h")
+            for p in provider_ids for s in random.sample(service_ids, 3)
+        ])
+    return {"provider_id": provider_ids, "service_id": service_ids}
+
+
+def seed_user(service, scale):
+    User, ProviderUserLink, OTP = model(service, "User"), model(service, "ProviderUserLink"), model(service, "OTP")
+    tag = uuid.uuid4().hex[:6]
+    emails = [f"user{i}-{tag}@example.com" for i in range(50 * scale)]
+    now = datetime.utcnow()
+    with Session(service.db.engine) as db:
+        user_ids = _ids(db, [
+            User(email=email, name=f"User {i}", phone=f"+2547{i:08d}", verified=True) for i, email in enumerate(emails)
+        ])
+        _ids(db, [ProviderUserLink(user_id=u, provider_id=f"prov-{random.randrange(10)}") for u in user_ids[::3]])
+        # Login history: a few used-up codes per user, and one still valid
+        codes = {email: f"{random.randrange(10000):04d}" for email in emails}
+        _ids(db, [
+            OTP(email=email, code=f"{random.randrange(10000):04d}", expires_at=now - timedelta(days=random.randrange(1, 300)))
+            for email in emails for _ in range(20)
+        ] + [OTP(email=email, code=code, expires_at=now + timedelta(minutes=5)) for email, code in codes.items()])
+    return {"user_id": user_ids, "otp": list(codes.items())}
+
+
+SEEDERS = {
+    "booking": seed_booking, "vehicle": seed_vehicle, "expenses": seed_expenses,
+    "insurance": seed_insurance, "provider": seed_provider, "user": seed_user,
+}
+
+
+# -----------------------
+# Built-in mixed workload: (weight, method, path template, body factory)
+# -----------------------
+def _booking_body(ctx):
+    # Spread over a year of slots (the default hourly ones, 08:00-18:00 UTC): bookings at one
+    # instant would mostly get 409 (slot fully booked), and off-slot times 422
+    today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    scheduled_at = today + timedelta(days=random.randrange(1, 366), hours=random.randrange(8, 18))
+    return {"user_id": random.choice(ctx["user_id"]), "vehicle_id": random.choice(ctx["vehicle_id"]),
+            "provider_id": random.choice(ctx["provider_id"]), "scheduled_at": scheduled_at.isoformat()}
+
+
+def _log_body(ctx):
+    return {"user_id": random.choice(ctx["user_id"]), "vehicle_id": random.choice(ctx["vehicle_id"]),
+            "provider_id": random.choice(ctx["provider_id"]), "service_items": {"oil": "changed"}, "mileage_km": 42000}
+
+
+def _vehicle_body(ctx):
+    return {"make": "Toyota", "model": "Axio", "plate": f"K{uuid.uuid4().hex[:7].upper()}", "yom": 2015, "fuel_type": "petrol"}
+
+
+def _expense_body(ctx):
+    return {"owner_id": random.choice(ctx["user_id"]), "vehicle_id": "veh-1", "provider_id": None,
+            "expense_type": "fuel", "location": "Nairobi", "cost": 4200}
+
+
+def _policy_body(ctx):
+    return {"owner_id": random.choice(ctx["user_id"]), "vehicle_id": "veh-1", "provider_id": "prov-1", "insurance_type": "comprehensive"}
+
+
+WORKLOAD = {
+    "booking": [
+        (30, "GET", "/bookings/user/{user_id}", None),
+        (20, "GET", "/bookings/{booking_id}", None),
+        (10, "POST", "/bookings/", _booking_body),
+        (20, "GET", "/service-logs/vehicle/{vehicle_id}", None),
+        (10, "GET", "/service-logs/user/{user_id}", None),
+        (5, "GET", "/service-logs/provider/{provider_id}", None),
+        (5, "POST", "/service-logs/", _log_body),
+    ],
+    "vehicle": [
+        (50, "GET", "/vehicles/", None),
+        (30, "GET", "/vehicles/{vehicle_id}", None),
+        (20, "POST", "/vehicles/", _vehicle_body),
+    ],
+    "expenses": [
+        (60, "GET", "/expense/get-expenses-by-owner/{user_id}", None),
+        (10, "GET", "/expense/get-expenses", None),
+        (30, "POST", "/expense/create-expense", _expense_body),
+    ],
+    "insurance": [
+        (60, "GET", "/insurance/get-insurance-policy-by-owner/{user_id}", None),
+        (10, "GET", "/insurance/get-insurance-policies", None),
+        (30, "POST", "/insurance/create-insurance-policy", _policy_body),
+    ],
+    "provider": [
+        (25, "GET", "/services", None),
+        (10, "GET", "/services/{service_id}", None),
+        (20, "GET", "/{provider_id}", None),
+        (15, "GET", "/{provider_id}/services", None),
+        (15, "GET", "/", None),
+        (10, "GET", "/categories/service-categories", None),
+        (5, "GET", "/categories/provider-categories", None),
+    ],
+    "user": [
+        (60, "GET", "/me", None),
+        (10, "GET", "/all", None),
+        (30, "POST", "/guest", lambda ctx: {"email": f"guest-{uuid.uuid4().hex[:10]}@example.com"}),
+    ],
+}
+
+# Services whose routes read the caller from a bearer token
+AUTHENTICATED = {"vehicle", "user"}
+
+# Non-2xx answers that are part of a route's normal behaviour, not a broken run
+EXPECTED = {
+    "POST /bookings/": ("409",),  # slot already fully booked
+}
+
+# Statements each route of the built-in mix should need, sent as QUERY_ROUTE_BUDGETS: a request
+# that issues more (an N+1, a lazy load that crept in) fails with QueryBudgetExceeded and the
+# run exits non-zero. Counts are the same in sync and async mode except where noted.
+QUERY_BUDGETS = {
+    "booking": {
+        "GET /bookings/user/{user_id}": 1,
+        "GET /bookings/{booking_id}": 1,
+        "POST /bookings/": 3,  # provider lock, slot check, insert
+        "GET /service-logs/vehicle/{vehicle_id}": 1,
+        "GET /service-logs/user/{user_id}": 1,
+        "GET /service-logs/provider/{provider_id}": 1,
+        "POST /service-logs/": 2,  # insert, service-due refresh
+    },
+    "vehicle": {"GET /vehicles/": 1, "GET /vehicles/{vehicle_id}": 1, "POST /vehicles/": 1},
+    "expenses": {
+        "GET /expense/get-expenses-by-owner/{user_id}": 1,
+        "GET /expense/get-expenses": 1,
+        "POST /expense/create-expense": 1,
+    },
+    "insurance": {
+        "GET /insurance/get-insurance-policy-by-owner/{user_id}": 1,
+        "GET /insurance/get-insurance-policies": 1,
+        "POST /insurance/create-insurance-policy": 1,
+    },
+    "provider": {
+        "GET /services": 1,
+        "GET /services/{service_id}": 1,
+        "GET /{provider_id}": 5,  # provider + selectin loads (3 in async mode)
+        "GET /{provider_id}/services": 5,
+        "GET /": 3,
+        "GET /categories/service-categories": 1,
+        "GET /categories/provider-categories": 1,
+    },
+    "user": {"GET /me": 2, "GET /all": 2, "POST /guest": 3},
+}
+
+
+def load_workload_file(path):
+    workload = defaultdict(list)
+    with open(path) as fh:
+        for line in fh:
+            if line.strip():
+                entry = json.loads(line)
+                body = entry.get("json")
+                workload[entry["service"]].append(
+                    (entry.get("weight", 1), entry["method"].upper(), entry["path"], (lambda ctx, b=body: b) if body is not None else None)
+                )
+    return dict(workload)
+
+
+def _fill(template, ctx):
+    """``template`` with each placeholder set to a random seeded id, and the ids picked."""
+    values = {}
+    for key in ctx:
+        if "{" + key + "}" in template:
+            values[key] = random.choice(ctx[key])
+    return template.format(**values), values
+
+
+def auth_headers(service_name, ctx, values, secret_key):
+    """Bearer token for services that read the caller from one: the owner of the id in the
+    path when the seeder recorded it (see ``owner_of``), a random seeded user otherwise."""
+    if service_name not in AUTHENTICATED or not ctx.get("user_id"):
+        return {}
+    user_id = next(
+        (ctx["owner_of"][key][value] for key, value in values.items() if key in ctx.get("owner_of", {})),
+        None,
+    )
+    if user_id is None:
+        user_id = random.choice(ctx["user_id"])
+    return {"Authorization": f"Bearer {jwt.encode({'sub': str(user_id)}, secret_key, algorithm='HS256')}"}
+
+
+async def replay(service, entries, ctx, concurrency, total, secret_key):
+    weights = [e[0] for e in entries]
+    samples = defaultdict(list)
+    statuses = defaultdict(lambda: defaultdict(int))
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=service.app), base_url="http://bench") as client:
+        remaining = total
+
+        async def worker():
+            nonlocal remaining
+            while remaining > 0:
+                remaining -= 1
+                _, method, template, body = random.choices(entries, weights)[0]
+                path, values = _fill(template, ctx)
+                headers = auth_headers(service.name, ctx, values, secret_key)
+                key = f"{method} {template}"
+                started = time.perf_counter()
+                try:
+                    r = await client.request(method, path, json=body(ctx) if body else None, headers=headers)
+                    status = str(r.status_code)
+                except Exception as exc:  # app errors propagate in-process
+                    status = type(exc).__name__
+                samples[key].append(time.perf_counter() - started)
+                statuses[key][status] += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    routes = {}
+    for key, lat in sorted(samples.items()):
+        errors = sum(n for s, n in statuses[key].items() if not s.startswith(("2", "3")))
+        routes[key] = {
+            "count": len(lat),
+            "errors": errors,
+            "status": dict(statuses[key]),
+            "rps": round(len(lat) / elapsed, 1),
+            "p50_ms": round(percentile(lat, 50) * 1000, 2),
+            "p95_ms": round(percentile(lat, 95) * 1000, 2),
+            "p99_ms": round(percentile(lat, 99) * 1000, 2),
+        }
+    return {"requests": total, "seconds": round(elapsed, 3), "rps": round(total / elapsed, 1), "routes": routes}
+
+
+def failures(results, max_error_share):
+    """Routes whose timings do not measure the path they are meant to: any request over its
+    query budget, or more than ``max_error_share`` of responses outside 2xx/3xx and EXPECTED."""
+    problems = []
+    for name, result in results["services"].items():
+        for key, r in result["routes"].items():
+            if r["status"].get("QueryBudgetExceeded"):
+                problems.append(f"{name} {key}: {r['status']['QueryBudgetExceeded']} requests over the query budget")
+            expected = EXPECTED.get(key, ())
+            unexpected = {s: n for s, n in r["status"].items() if not s.startswith(("2", "3")) and s not in expected}
+            if sum(unexpected.values()) > max_error_share * r["count"]:
+                problems.append(f"{name} {key}: unexpected statuses {unexpected} out of {r['count']} requests")
+    return problems
+
+
+def print_service(name, result):
+    print(f"\n== {name}: {result['rps']} req/s over {result['seconds']}s")
+    print(f"{'route':<56}{'count':>7}{'err':>6}{'rps':>9}{'p50':>9}{'p95':>9}{'p99':>9}")
+    for key, r in result["routes"].items():
+        print(f"{key:<56}{r['count']:>7}{r['errors']:>6}{r['rps']:>9}{r['p50_ms']:>9}{r['p95_ms']:>9}{r['p99_ms']:>9}")
+
+
+def compare(path_a, path_b):
+    with open(path_a) as fa, open(path_b) as fb:
+        a, b = json.load(fa), json.load(fb)
+
+    def delta(old, new):
+        return f"{(new - old) / old * 100:+.0f}%" if old else "n/a"
+
+    print(f"A = {path_a}\nB = {path_b}")
+    for name in sorted(set(a["services"]) | set(b["services"])):
+        ra, rb = a["services"].get(name), b["services"].get(name)
+        if not ra or not rb:
+            print(f"\n== {name}: only in {'A' if ra else 'B'}")
+            continue
+        print(f"\n== {name}: {ra['rps']} -> {rb['rps']} req/s ({delta(ra['rps'], rb['rps'])})")
+        print(f"{'route':<56}{'p50 A':>9}{'p50 B':>9}{'p99 A':>9}{'p99 B':>9}{'Δp99':>8}")
+        for key in sorted(set(ra["routes"]) | set(rb["routes"])):
+            x, y = ra["routes"].get(key), rb["routes"].get(key)
+            if not x or not y:
+                continue
+            print(f"{key:<56}{x['p50_ms']:>9}{y['p50_ms']:>9}{x['p99_ms']:>9}{y['p99_ms']:>9}{delta(x['p99_ms'], y['p99_ms']):>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a mixed workload against every service in-process.")
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--services", default=",".join(SERVICES), help="comma-separated subset of " + ",".join(SERVICES))
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=1000, help="requests per service")
+    parser.add_argument("--scale", type=int, default=1, help="multiplier for seeded rows")
+    parser.add_argument("--workload", default=None, help="JSONL workload to replay instead of the built-in mix")
+    parser.add_argument("--env", action="append", default=[], help="KEY=VALUE passed to every service, e.g. DB_ASYNC=true")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument(
+        "--max-error-share", type=float, default=0.01,
+        help="fail the run when a route answers more than this share outside 2xx/3xx (EXPECTED aside)",
+    )
+    parser.add_argument(
+        "--query-budgets", action=argparse.BooleanOptionalAction, default=True,
+        help="fail requests of the built-in mix that issue more statements than QUERY_BUDGETS allows",
+    )
+    parser.add_argument("--out", default=None, help="write results as JSON")
+    parser.add_argument("--compare", nargs=2, metavar=("A", "B"), help="compare two saved runs and exit")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*[os.path.abspath(p) for p in args.compare])
+        return
+
+    out = os.path.abspath(args.out) if args.out else None
+    logging.getLogger("httpx").setLevel(logging.WARNING)  # one INFO line per request otherwise
+    random.seed(args.seed)
+    url = args.database_url or default_database_url()
+    env = dict(kv.split("=", 1) for kv in args.env)
+    workload = load_workload_file(os.path.abspath(args.workload)) if args.workload else WORKLOAD
+
+    results = {
+        "meta": {
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "database": url.split("@")[-1],
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "scale": args.scale,
+            "env": env,
+            "python": platform.python_version(),
+        },
+        "services": {},
+    }
+    for name in args.services.split(","):
+        if name not in workload:
+            continue
+        service_env = dict(env)
+        if args.query_budgets and name in QUERY_BUDGETS:
+            budgets = ",".join(f"{route}={n}" for route, n in QUERY_BUDGETS[name].items())
+            service_env.setdefault("QUERY_ROUTE_BUDGETS", budgets)
+        service = load_service(name, url, env=service_env)
+        ctx = SEEDERS[name](service, args.scale)
+        secret_key = getattr(__import__("sys").modules.get("core.config"), "SECRET_KEY", "supersecret")
+        results["services"][name] = asyncio.run(
+            replay(service, workload[name], ctx, args.concurrency, args.requests, secret_key)
+        )
+        print_service(name, results["services"][name])
+
+    if out:
+        with open(out, "w") as fh:
+            json.dump(results, fh, indent=2)
+        print(f"\nresults written to {out}")
+
+    problems = failures(results, args.max_error_share)
+    if problems:
+        raise SystemExit("run failed:\n  " + "\n  ".join(problems))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+# benchmarks/serialization.py
+# CPU cost of turning a page of ORM rows into a JSON body, per big list endpoint:
+#
+#   fastapi   response_model validation + jsonable dicts + json.dumps (the old default)
+#   orjson    the same, rendered by ORJSONResponse (default_response_class now)
+#   adapter   core.responses.json_response: one precompiled TypeAdapter, validate + dump_json
+#
+#   python benchmarks/serialization.py --rows 200 --iterations 200
+#
+# Rows are seeded with the replay benchmark's seeders and loaded once; only serialization
+# is timed, so the database backend does not matter.
+import argparse
+import asyncio
+import importlib
+import time
+from typing import List
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from sqlalchemy.orm import Session, selectinload
+
+from _harness import SERVICES, default_database_url, load_service, percentile
+from replay import SEEDERS, model
+
+# service -> [(label, schema module, schema name, ORM model name)]
+CASES = {
+    "booking": [("bookings", "schemas.booking", "BookingOut", "Booking"),
+                ("service logs", "schemas.booking", "ServiceLog", "ServiceLog")],
+    "vehicle": [("vehicles", "schemas.vehicles", "VehicleRead", "Vehicle")],
+    "expenses": [("expenses", "schemas.expense", "ExpenseRead", "Expense")],
+    "insurance": [("policies", "schemas.insurance", "InsurancePolicyRead", "Insurance_Policy")],
+    "provider": [("providers", "app.schemas.provider", "Provider", "Provider")],
+    "user": [("users", "schemas.users", "UserRead", "User")],
+}
+
+
+def load_rows(service, orm_model, limit):
+    with Session(service.db.engine) as db:
+        q = db.query(orm_model)
+        if hasattr(orm_model, "provider_services"):
+            ps = model(service, "ProviderService")
+            q = q.options(selectinload(orm_model.provider_services).selectinload(ps.service))
+        return q.limit(limit).all()
+
+
+async def time_paths(responses, tp, rows, iterations):
+    field = create_model_field(name="response", type_=tp)
+
+    async def default_path(response_class):
+        content = await serialize_response(field=field, response_content=rows, is_coroutine=True)
+        return response_class(content).body
+
+    paths = {
+        "fastapi": lambda: default_path(JSONResponse),
+        "orjson": lambda: default_path(ORJSONResponse),
+    }
+    results = {}
+    for label, run in paths.items():
+        samples = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            await run()
+            samples.append(time.perf_counter() - started)
+        results[label] = samples
+
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        responses.json_response(tp, rows).body
+        samples.append(time.perf_counter() - started)
+    results["adapter"] = samples
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--services", default=",".join(CASES))
+    parser.add_argument("--rows", type=int, default=200, help="rows per response (one page)")
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+    url = default_database_url()
+
+    print(f"{'endpoint':<14} {'rows':>5} {'fastapi ms':>11} {'orjson ms':>10} {'adapter ms':>11} {'speedup':>8}")
+    for name in args.services.split(","):
+        service = load_service(name, url)
+        SEEDERS[name](service, max(1, args.rows // 40))
+        package = SERVICES[name].package
+        responses = importlib.import_module(f"{package}.core.responses" if package else "core.responses")
+        for label, module, schema, orm_name in CASES[name]:
+            tp = List[getattr(importlib.import_module(module), schema)]
+            rows = load_rows(service, model(service, orm_name), args.rows)
+            results = asyncio.run(time_paths(responses, tp, rows, args.iterations))
+            p50 = {k: percentile(v, 50) * 1000 for k, v in results.items()}
+            print(f"{label:<14} {len(rows):>5} {p50['fastapi']:>11.3f} {p50['orjson']:>10.3f} "
+                  f"{p50['adapter']:>11.3f} {p50['fastapi'] / p50['adapter']:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+"""Add keyset pagination indexes
+
+Revision ID: 00078f6c44dc
+Revises: 
+Create Date: 2026-10-18 15:33:45.409298
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '00078f6c44dc'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_bookings_user_id_created_at_id', 'bookings', ['user_id', 'created_at', 'id'], unique=False, schema='bookings')
+    op.create_index('ix_service_logs_user_id_created_at_id', 'service_logs', ['user_id', 'created_at', 'id'], unique=False, schema='bookings')
+    op.create_index('ix_service_logs_provider_id_created_at_id', 'service_logs', ['provider_id', 'created_at', 'id'], unique=False, schema='bookings')
+    op.create_index('ix_service_logs_vehicle_id_created_at_id', 'service_logs', ['vehicle_id', 'created_at', 'id'], unique=False, schema='bookings')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_service_logs_vehicle_id_created_at_id', table_name='service_logs', schema='bookings')
+    op.drop_index('ix_service_logs_provider_id_created_at_id', table_name='service_logs', schema='bookings')
+    op.drop_index('ix_service_logs_user_id_created_at_id', table_name='service_logs', schema='bookings')
+    op.drop_index('ix_bookings_user_id_created_at_id', table_name='bookings', schema='bookings')
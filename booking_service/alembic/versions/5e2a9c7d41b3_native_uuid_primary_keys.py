@@ -0,0 +1,33 @@
+"""Native uuid primary keys
+
+Revision ID: 5e2a9c7d41b3
+Revises: 00078f6c44dc
+Create Date: 2026-10-18 20:02:11.540318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e2a9c7d41b3'
+down_revision: Union[str, None] = '00078f6c44dc'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Existing ids are uuid4 text and convert in place; new rows get time-ordered uuid7 keys
+TABLES = ['bookings', 'service_logs']
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        op.alter_column(table, 'id', type_=sa.Uuid(), existing_type=sa.String(), existing_nullable=False,
+                        postgresql_using='id::uuid', schema='bookings')
+
+
+def downgrade() -> None:
+    for table in reversed(TABLES):
+        op.alter_column(table, 'id', type_=sa.String(), existing_type=sa.Uuid(), existing_nullable=False,
+                        postgresql_using='id::text', schema='bookings')
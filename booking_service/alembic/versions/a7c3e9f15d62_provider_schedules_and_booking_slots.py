@@ -0,0 +1,53 @@
+"""Provider schedules and booking slots
+
+Revision ID: a7c3e9f15d62
+Revises: d3f8a1c5e7b2
+Create Date: 2026-10-18 23:02:41.518374
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c3e9f15d62'
+down_revision: Union[str, None] = 'd3f8a1c5e7b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+DEFAULT_SLOT_MINUTES = 60  # settings.booking_slot_minutes when this ran
+
+
+def upgrade() -> None:
+    op.create_table(
+        'provider_schedules',
+        sa.Column('provider_id', sa.String(), nullable=False),
+        sa.Column('slot_minutes', sa.Integer(), nullable=False),
+        sa.Column('capacity', sa.Integer(), nullable=False),
+        sa.Column('opens_at', sa.Time(), nullable=False),
+        sa.Column('closes_at', sa.Time(), nullable=False),
+        sa.Column('updated_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('provider_id'),
+        schema='bookings',
+    )
+    op.add_column('bookings', sa.Column('ends_at', sa.TIMESTAMP(timezone=True), nullable=True), schema='bookings')
+    # Existing bookings hold a default-length slot
+    op.execute(
+        f"UPDATE bookings.bookings SET ends_at = scheduled_at + interval '{DEFAULT_SLOT_MINUTES} minutes' "
+        "WHERE scheduled_at IS NOT NULL"
+    )
+    # Covers the availability range scans; provider_id alone is its leading column
+    op.create_index(
+        'ix_bookings_provider_id_scheduled_at', 'bookings', ['provider_id', 'scheduled_at'], unique=False,
+        schema='bookings', postgresql_include=['ends_at', 'status'],
+    )
+    op.drop_index(op.f('ix_bookings_bookings_provider_id'), table_name='bookings', schema='bookings')
+
+
+def downgrade() -> None:
+    op.create_index(op.f('ix_bookings_bookings_provider_id'), 'bookings', ['provider_id'], unique=False, schema='bookings')
+    op.drop_index('ix_bookings_provider_id_scheduled_at', table_name='bookings', schema='bookings')
+    op.drop_column('bookings', 'ends_at', schema='bookings')
+    op.drop_table('provider_schedules', schema='bookings')
@@ -0,0 +1,37 @@
+"""JSONB columns and GIN indexes
+
+Revision ID: b8d42f6e1c95
+Revises: e5b19d7c3a48
+Create Date: 2026-10-19 03:47:52.204816
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8d42f6e1c95'
+down_revision: Union[str, None] = 'e5b19d7c3a48'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = [('service_logs', 'service_items'), ('bookings', 'meta'), ('bookings', 'location')]
+
+
+def upgrade() -> None:
+    # Each ALTER rewrites its table under an exclusive lock: run in a quiet window
+    for table, column in COLUMNS:
+        op.alter_column(table, column, type_=postgresql.JSONB(), existing_type=sa.JSON(), existing_nullable=True,
+                        postgresql_using=f'{column}::jsonb', schema='bookings')
+        op.create_index(f'ix_{table}_{column}', table, [column], unique=False, schema='bookings',
+                        postgresql_using='gin', postgresql_ops={column: 'jsonb_path_ops'})
+
+
+def downgrade() -> None:
+    for table, column in reversed(COLUMNS):
+        op.drop_index(f'ix_{table}_{column}', table_name=table, schema='bookings')
+        op.alter_column(table, column, type_=sa.JSON(), existing_type=postgresql.JSONB(), existing_nullable=True,
+                        postgresql_using=f'{column}::json', schema='bookings')
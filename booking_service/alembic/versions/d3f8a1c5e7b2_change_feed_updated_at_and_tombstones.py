@@ -0,0 +1,46 @@
+"""Change feed: updated_at and tombstones
+
+Revision ID: d3f8a1c5e7b2
+Revises: 5e2a9c7d41b3
+Create Date: 2026-10-18 21:12:30.019447
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3f8a1c5e7b2'
+down_revision: Union[str, None] = '5e2a9c7d41b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = [('bookings', 'user_id'), ('service_logs', 'user_id')]  # (table, owner column)
+
+
+def upgrade() -> None:
+    # Existing rows get the migration time, so each client's first sync is a full one
+    for table, owner in TABLES:
+        op.add_column(table, sa.Column('updated_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False), schema='bookings')
+        op.create_index(f'ix_{table}_{owner}_updated_at_id', table, [owner, 'updated_at', 'id'], unique=False, schema='bookings')
+    op.create_table(
+        'tombstones',
+        sa.Column('id', sa.Uuid(), nullable=False),
+        sa.Column('entity', sa.String(length=50), nullable=False),
+        sa.Column('entity_id', sa.String(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('deleted_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        schema='bookings',
+    )
+    op.create_index('ix_tombstones_user_id_deleted_at_id', 'tombstones', ['user_id', 'deleted_at', 'id'], unique=False, schema='bookings')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tombstones_user_id_deleted_at_id', table_name='tombstones', schema='bookings')
+    op.drop_table('tombstones', schema='bookings')
+    for table, owner in reversed(TABLES):
+        op.drop_index(f'ix_{table}_{owner}_updated_at_id', table_name=table, schema='bookings')
+        op.drop_column(table, 'updated_at', schema='bookings')
@@ -0,0 +1,60 @@
+"""Vehicle service due projection
+
+Revision ID: e5b19d7c3a48
+Revises: a7c3e9f15d62
+Create Date: 2026-10-19 01:26:09.731552
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b19d7c3a48'
+down_revision: Union[str, None] = 'a7c3e9f15d62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [('user_id', 'next_service_date'), ('user_id', 'km_remaining'), ('provider_id', 'next_service_date'), ('provider_id', 'km_remaining')]
+
+
+def upgrade() -> None:
+    op.create_table(
+        'vehicle_service_due',
+        sa.Column('vehicle_id', sa.String(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('provider_id', sa.String(), nullable=True),
+        sa.Column('log_id', sa.Uuid(), nullable=False),
+        sa.Column('serviced_at', sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column('mileage_km', sa.Integer(), nullable=True),
+        sa.Column('next_service_date', sa.TIMESTAMP(timezone=True), nullable=True),
+        sa.Column('next_service_km', sa.Integer(), nullable=True),
+        sa.Column('km_remaining', sa.Integer(), nullable=True),
+        sa.PrimaryKeyConstraint('vehicle_id'),
+        schema='bookings',
+    )
+    # Backfill: one pass over service_logs, the same query crud.booking.rebuild_service_due() runs
+    op.execute("""
+        INSERT INTO bookings.vehicle_service_due
+            (vehicle_id, user_id, provider_id, log_id, serviced_at, mileage_km, next_service_date, next_service_km, km_remaining)
+        SELECT vehicle_id, user_id, provider_id, id, serviced_at, mileage_km, next_service_date, next_service_km,
+               next_service_km - mileage_km
+        FROM (
+            SELECT vehicle_id, user_id, provider_id, id, COALESCE(performed_at, created_at) AS serviced_at,
+                   MAX(mileage_km) OVER (PARTITION BY vehicle_id) AS mileage_km, next_service_date, next_service_km,
+                   ROW_NUMBER() OVER (PARTITION BY vehicle_id ORDER BY COALESCE(performed_at, created_at) DESC, id DESC) AS rank
+            FROM bookings.service_logs
+            WHERE vehicle_id IS NOT NULL
+        ) ranked
+        WHERE rank = 1
+    """)
+    for owner, due in INDEXES:
+        op.create_index(f'ix_vehicle_service_due_{owner}_{due}', 'vehicle_service_due', [owner, due], unique=False, schema='bookings')
+
+
+def downgrade() -> None:
+    for owner, due in reversed(INDEXES):
+        op.drop_index(f'ix_vehicle_service_due_{owner}_{due}', table_name='vehicle_service_due', schema='bookings')
+    op.drop_table('vehicle_service_due', schema='bookings')
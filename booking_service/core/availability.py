@@ -0,0 +1,112 @@
+# core/availability.py
+# Provider slot availability. A provider's day is cut into slots of slot_minutes between
+# opens_at and closes_at (UTC), and each slot takes up to capacity bookings. A booking holds
+# [scheduled_at, ends_at), with ends_at fixed when it is made, so a later schedule change
+# never moves existing bookings.
+#
+# Only the bookings overlapping the requested window are read: no booking is longer than
+# MAX_SLOT_MINUTES, so the (provider_id, scheduled_at) index scan is bounded on both sides,
+# however many bookings the provider has in all. Free slots then come from one pass over
+# those bookings and the window's slots.
+#
+# A booking must start one of the provider's slots, and not in the past: anything else is
+# refused with 422 before the provider lock is taken, so a 09:30 booking can never hold both
+# the 09:00 and the 10:00 slot.
+#
+# Reserving is check-then-insert in one transaction, serialized per provider: on Postgres by
+# a transaction-scoped advisory lock on the provider id (SQLite serializes writers itself).
+# An exclusion constraint cannot express capacity above one, so the check stays here.
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, List, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import func, select
+
+MAX_SLOT_MINUTES = 24 * 60
+RELEASED_STATUSES = ("cancelled", "rejected")  # bookings in these no longer hold their slot
+
+
+class SlotUnavailable(Exception):
+    """The slot already has as many bookings as the provider takes at once."""
+
+
+def utc(value: datetime) -> datetime:
+    """``value`` as an aware UTC datetime; naive values are taken to be UTC already."""
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def window(start: datetime, end: datetime, max_days: int) -> Tuple[datetime, datetime]:
+    """The requested [start, end) in UTC; 422 if it is empty or longer than ``max_days``."""
+    start, end = utc(start), utc(end)
+    if end <= start:
+        raise HTTPException(status_code=422, detail="'to' must be after 'from'")
+    if end - start > timedelta(days=max_days):
+        raise HTTPException(status_code=422, detail=f"The window may span at most {max_days} days")
+    return start, end
+
+
+def slot_starts(schedule, start: datetime, end: datetime) -> List[datetime]:
+    """Starts of ``schedule``'s slots lying wholly inside [start, end), in order."""
+    step = timedelta(minutes=schedule.slot_minutes)
+    starts = []
+    day = start.date()
+    while day <= end.date():
+        at = datetime.combine(day, schedule.opens_at, timezone.utc)
+        closes = datetime.combine(day, schedule.closes_at, timezone.utc)
+        while at + step <= closes:
+            if at >= start and at + step <= end:
+                starts.append(at)
+            at += step
+        day += timedelta(days=1)
+    return starts
+
+
+def check_slot(schedule, scheduled_at: datetime, now: Optional[datetime] = None) -> None:
+    """422 unless ``scheduled_at`` (UTC) is the start of one of ``schedule``'s slots and has not passed."""
+    if scheduled_at < (now or datetime.now(timezone.utc)):
+        raise HTTPException(status_code=422, detail="scheduled_at is in the past")
+    step = timedelta(minutes=schedule.slot_minutes)
+    if scheduled_at not in slot_starts(schedule, scheduled_at, scheduled_at + step):
+        raise HTTPException(
+            status_code=422,
+            detail=f"scheduled_at must start a {schedule.slot_minutes}-minute slot between "
+                   f"{schedule.opens_at:%H:%M} and {schedule.closes_at:%H:%M} UTC",
+        )
+
+
+def free_slots(
+    schedule,
+    start: datetime,
+    end: datetime,
+    booked: Iterable[Tuple[datetime, datetime]],
+    now: Optional[datetime] = None,
+) -> List[dict]:
+    """Slots in [start, end) that have not started yet and can take another booking.
+
+    ``booked`` holds the (scheduled_at, ends_at) of the active bookings overlapping the window.
+    """
+    step = timedelta(minutes=schedule.slot_minutes)
+    starts = slot_starts(schedule, max(start, now or datetime.now(timezone.utc)), end)
+    # Difference array: each booking adds one to the run of slots it overlaps
+    delta = [0] * (len(starts) + 1)
+    for booked_start, booked_end in booked:
+        first = bisect_right(starts, utc(booked_start) - step)  # first slot ending after it starts
+        last = bisect_left(starts, utc(booked_end))  # first slot starting once it has ended
+        if first < last:
+            delta[first] += 1
+            delta[last] -= 1
+    slots, taken = [], 0
+    for i, at in enumerate(starts):
+        taken += delta[i]
+        if taken < schedule.capacity:
+            slots.append({"start": at, "end": at + step, "available": schedule.capacity - taken})
+    return slots
+
+
+def provider_lock(dialect, provider_id: str):
+    """A statement holding ``provider_id``'s booking lock until the transaction ends, or None
+    where the database already serializes writers."""
+    if dialect.name != "postgresql":
+        return None
+    return select(func.pg_advisory_xact_lock(func.hashtextextended(provider_id, 0)))
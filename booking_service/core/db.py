@@ -1,10 +1,28 @@
 # backend/booking_service/app/core/db.py
 from sqlalchemy import create_engine, MetaData
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker, declarative_base
 from core.config import settings
+from core.replica import ReplicaRouter
+from core.slow_queries import SlowQueryLog
 
 engine = create_engine(settings.database_url, pool_pre_ping=True)
-SessionLocal = sessionmaker(autoflush=False, autocommit=False, bind=engine)
+
+# Optional read replica: GET requests read from it (see core/replica.py)
+replica_engine = (
+    create_engine(settings.replica_database_url, pool_pre_ping=True) if settings.replica_database_url else None
+)
+replicas = ReplicaRouter(
+    replica_engine,
+    sticky_seconds=settings.read_your_writes_seconds,
+    max_lag_seconds=settings.replica_max_lag_seconds,
+    check_seconds=settings.replica_lag_check_seconds,
+)
+# expire_on_commit=False: rows returned by INSERT/UPDATE ... RETURNING stay usable after commit
+SessionLocal = sessionmaker(
+    class_=replicas.session_class(engine, replica_engine),
+    autoflush=False, autocommit=False, expire_on_commit=False, bind=engine,
+)
 Base = declarative_base()
 metadata = MetaData(schema=None)  # we set schema in models explicitly if needed
 
@@ -14,3 +32,64 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# --- Async mode (DB_ASYNC=true) ---
+ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
+
+def to_async_url(url: str):
+    """Swap the sync driver (psycopg2, pysqlite) for its async counterpart."""
+    u = make_url(url)
+    backend = u.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        return u
+    return u.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}")
+
+
+async_engine = None
+async_replica_engine = None
+AsyncSessionLocal = None
+
+if settings.db_async:
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+    async_engine = create_async_engine(
+        settings.async_database_url or to_async_url(settings.database_url),
+        pool_pre_ping=True,
+    )
+    if settings.replica_database_url:
+        async_replica_engine = create_async_engine(
+            settings.async_replica_database_url or to_async_url(settings.replica_database_url),
+            pool_pre_ping=True,
+        )
+    # expire_on_commit=False: attribute access after commit must not trigger implicit IO
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine,
+        sync_session_class=replicas.session_class(
+            async_engine.sync_engine, async_replica_engine and async_replica_engine.sync_engine
+        ),
+        autoflush=False,
+        expire_on_commit=False,
+    )
+
+
+# Slow-query log (see core/slow_queries.py); EXPLAINs always run on a sync engine
+slow_queries = SlowQueryLog(
+    settings.slow_query_ms,
+    explain_sample_rate=settings.slow_query_explain_sample_rate,
+    explain_timeout_ms=settings.slow_query_explain_timeout_ms,
+    logger_name="booking-service.slow_query",
+)
+slow_queries.instrument(engine)
+if replica_engine is not None:
+    slow_queries.instrument(replica_engine, "replica")
+if async_engine is not None:
+    slow_queries.instrument(async_engine.sync_engine, "async", explain_engine=engine)
+if async_replica_engine is not None:
+    slow_queries.instrument(async_replica_engine.sync_engine, "async_replica", explain_engine=replica_engine)
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
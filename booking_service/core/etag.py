@@ -0,0 +1,109 @@
+# core/etag.py
+# Conditional GETs. A strong ETag is a hash of the rendered body; a request whose
+# If-None-Match already names it gets an empty 304 instead of the payload.
+#
+# Catalog routes go one step further: ResponseCache keeps the rendered body and its ETag
+# for a short TTL, so a repeat poll is answered (304 or 200) without touching the
+# database. Writes through this process drop the cache at once; other workers catch
+# up within the TTL, which is also the max-age clients are told to use.
+import hashlib
+import threading
+import time
+from typing import Optional
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+# Cache-Control policies
+PRIVATE_REVALIDATE = "private, no-cache"  # per-user data: always revalidate, 304 when unchanged
+PUBLIC_REVALIDATE = "public, no-cache"  # shared data that can change at any time
+
+
+def catalog_cache_control(seconds: int) -> str:
+    return f"public, max-age={seconds}"
+
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison: W/"x" matches "x"
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+def not_modified(etag: str, cache_control: str, headers=None) -> Response:
+    response = Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+    if headers:
+        response.raw_headers.extend(headers)
+    return response
+
+
+def conditional(request: Request, response: Response, cache_control: str) -> Response:
+    """Tag a rendered response with ETag/Cache-Control; 304 if the client already has it."""
+    etag = make_etag(response.body)
+    if etag_matches(request, etag):
+        return not_modified(etag, cache_control)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+    return response
+
+
+class CachedBody:
+    __slots__ = ("etag", "body", "headers", "media_type", "expires")
+
+    def __init__(self, response: Response, expires: float):
+        self.body = response.body
+        self.etag = make_etag(self.body)
+        self.media_type = response.media_type
+        # Carry extra headers (e.g. X-Next-Cursor), not the ones Response recomputes
+        self.headers = [
+            (k, v) for k, v in response.raw_headers if k not in (b"content-length", b"content-type")
+        ]
+        self.expires = expires
+
+    def respond(self, request: Request, cache_control: str) -> Response:
+        if etag_matches(request, self.etag):
+            return not_modified(self.etag, cache_control, self.headers)
+        response = Response(self.body, media_type=self.media_type)
+        response.raw_headers.extend(self.headers)
+        response.headers["ETag"] = self.etag
+        response.headers["Cache-Control"] = cache_control
+        return response
+
+
+class ResponseCache:
+    """Rendered responses keyed by path + query string, kept for ``ttl`` seconds."""
+
+    def __init__(self, ttl: float, max_entries: int = 1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(request: Request) -> tuple:
+        return request.url.path, request.url.query
+
+    def get(self, request: Request) -> Optional[CachedBody]:
+        entry = self._entries.get(self.key(request))
+        if entry is None or entry.expires <= time.monotonic():
+            return None
+        return entry
+
+    def put(self, request: Request, response: Response) -> CachedBody:
+        entry = CachedBody(response, time.monotonic() + self.ttl)
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                self._entries.clear()
+            self._entries[self.key(request)] = entry
+        return entry
+
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
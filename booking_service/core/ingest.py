@@ -0,0 +1,192 @@
+# core/ingest.py
+# Streaming NDJSON ingest. The request body is read as it arrives, one JSON object per line,
+# and each line is validated on its own: a bad row is reported by line number and skipped
+# instead of failing the request. Valid rows are written in chunks, on Postgres with COPY
+# (no per-row statement, nothing sent back), elsewhere with a multi-row INSERT, so memory
+# stays at about one chunk however large the body is.
+#
+# A chunk the database rejects (an integer out of range, say) is rolled back to its
+# savepoint and retried row by row, so only the offending rows are reported. All chunks
+# share the request's transaction: the rows counted as inserted are committed together at
+# the end, and a request that breaks off part-way commits nothing.
+import io
+import json
+from datetime import date, datetime
+from typing import AsyncIterator, List, Tuple
+
+from fastapi import HTTPException
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import insert
+from sqlalchemy.exc import DBAPIError
+
+from .responses import adapter
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+INGEST_MAX_LINE_BYTES = 64 * 1024
+INGEST_MAX_ERRORS = 100
+
+
+class RowError(BaseModel):
+    line: int  # 1-based line number in the request body
+    error: str
+
+
+class IngestResult(BaseModel):
+    inserted: int = 0
+    failed: int = 0
+    errors: List[RowError] = []  # the first INGEST_MAX_ERRORS; failed counts them all
+
+    def fail(self, line: int, error: str):
+        self.failed += 1
+        if len(self.errors) < INGEST_MAX_ERRORS:
+            self.errors.append(RowError(line=line, error=error))
+
+
+def _describe(exc: ValidationError) -> str:
+    error = exc.errors()[0]
+    location = ".".join(str(part) for part in error["loc"])
+    return f"{location}: {error['msg']}" if location else error["msg"]
+
+
+async def ndjson_chunks(stream: AsyncIterator[bytes], tp, result: IngestResult, chunk_rows: int):
+    """Validate each line of ``stream`` as ``tp``; yield lists of (line number, value).
+
+    Invalid lines are recorded on ``result``. Blank lines are skipped but still counted,
+    so line numbers match the client's file.
+    """
+    ta = adapter(tp)
+    buffer, line, chunk = b"", 0, []
+    async for data in stream:
+        buffer += data
+        *lines, buffer = buffer.split(b"\n")
+        if len(buffer) > INGEST_MAX_LINE_BYTES:
+            raise HTTPException(
+                status_code=413, detail=f"Line {line + len(lines) + 1} is longer than {INGEST_MAX_LINE_BYTES} bytes"
+            )
+        for raw in lines:
+            line += 1
+            if not raw.strip():
+                continue
+            try:
+                chunk.append((line, ta.validate_json(raw)))
+            except ValidationError as exc:
+                result.fail(line, _describe(exc))
+            if len(chunk) >= chunk_rows:
+                yield chunk
+                chunk = []
+    if buffer.strip():  # last line without a trailing newline
+        line += 1
+        try:
+            chunk.append((line, ta.validate_json(buffer)))
+        except ValidationError as exc:
+            result.fail(line, _describe(exc))
+    if chunk:
+        yield chunk
+
+
+def _db_error(exc: DBAPIError) -> str:
+    lines = str(exc.orig).strip().splitlines()
+    return lines[0] if lines else type(exc.orig).__name__
+
+
+def _copy_text(value) -> str:
+    """``value`` as a field of COPY's text format."""
+    if value is None:
+        return "\\N"
+    if isinstance(value, (dict, list)):
+        value = json.dumps(value)
+    elif isinstance(value, (datetime, date)):
+        value = value.isoformat()
+    return (
+        str(value).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+    )
+
+
+def _copy_record(value):
+    """``value`` as asyncpg's copy_records_to_table() encodes it (json columns take text)."""
+    return json.dumps(value) if isinstance(value, (dict, list)) else value
+
+
+def _copy(connection, table, rows: List[dict]):
+    """COPY ``rows`` into ``table`` over a psycopg2 connection."""
+    quote = connection.dialect.identifier_preparer
+    columns = list(rows[0])
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write("\t".join(_copy_text(row[c]) for c in columns))
+        buffer.write("\n")
+    buffer.seek(0)
+    statement = f"COPY {quote.format_table(table)} ({', '.join(quote.quote(c) for c in columns)}) FROM STDIN"
+    cursor = connection.connection.driver_connection.cursor()
+    try:
+        cursor.copy_expert(statement, buffer)
+    except connection.dialect.dbapi.Error as exc:
+        # The driver's own error: raise it the way SQLAlchemy would have
+        raise DBAPIError(statement, None, exc) from exc
+    finally:
+        cursor.close()
+
+
+async def _copy_async(connection, table, rows: List[dict]):
+    """COPY ``rows`` into ``table`` over an asyncpg connection."""
+    from asyncpg import InterfaceError, PostgresError
+
+    columns = list(rows[0])
+    raw = await connection.get_raw_connection()
+    try:
+        await raw.driver_connection.copy_records_to_table(
+            table.name,
+            schema_name=table.schema,
+            columns=columns,
+            records=[tuple(_copy_record(row[c]) for c in columns) for row in rows],
+        )
+    except (InterfaceError, PostgresError) as exc:
+        raise DBAPIError(f"COPY {table.fullname}", None, exc) from exc
+
+
+def _uses_copy(connection, driver: str) -> bool:
+    return connection.dialect.name == "postgresql" and connection.dialect.driver == driver
+
+
+def write_chunk(db, table, rows: List[Tuple[int, dict]], result: IngestResult):
+    """Insert one chunk of (line number, row) into ``table`` in ``db``'s transaction."""
+    try:
+        with db.begin_nested():
+            connection = db.connection()
+            if _uses_copy(connection, "psycopg2"):
+                _copy(connection, table, [row for _, row in rows])
+            else:
+                connection.execute(insert(table), [row for _, row in rows])
+        result.inserted += len(rows)
+        return
+    except DBAPIError:
+        pass
+    for line, row in rows:
+        try:
+            with db.begin_nested():
+                db.connection().execute(insert(table), row)
+            result.inserted += 1
+        except DBAPIError as exc:
+            result.fail(line, _db_error(exc))
+
+
+async def write_chunk_async(db, table, rows: List[Tuple[int, dict]], result: IngestResult):
+    """Async twin of write_chunk() for an AsyncSession."""
+    try:
+        async with db.begin_nested():
+            connection = await db.connection()
+            if _uses_copy(connection, "asyncpg"):
+                await _copy_async(connection, table, [row for _, row in rows])
+            else:
+                await connection.execute(insert(table), [row for _, row in rows])
+        result.inserted += len(rows)
+        return
+    except DBAPIError:
+        pass
+    for line, row in rows:
+        try:
+            async with db.begin_nested():
+                await (await db.connection()).execute(insert(table), row)
+            result.inserted += 1
+        except DBAPIError as exc:
+            result.fail(line, _db_error(exc))
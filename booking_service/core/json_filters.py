@@ -0,0 +1,61 @@
+# core/json_filters.py
+# Filters on JSONB columns. On Postgres they compile to the operators a GIN jsonb_path_ops
+# index answers: containment (@>) and JSON path existence (@?). jsonb_path_ops has no
+# key-exists operator (?), so "has key" is the path $."key" instead.
+#
+# Elsewhere (the SQLite stand-in used by the benchmarks) the same filters are built from
+# json_extract()/json_type() on each key, nested objects included. No index serves them, and
+# arrays only match when equal, not when they contain the value.
+import json
+from typing import Optional
+
+from fastapi import HTTPException
+from sqlalchemy import and_, func, type_coerce
+from sqlalchemy.dialects.postgresql import JSONB
+
+
+def object_param(name: str, raw: Optional[str]) -> Optional[dict]:
+    """Query parameter ``name`` parsed as a non-empty JSON object; 422 otherwise."""
+    if raw is None:
+        return None
+    try:
+        value = json.loads(raw)
+    except ValueError:
+        value = None
+    if not isinstance(value, dict) or not value:
+        raise HTTPException(status_code=422, detail=f"'{name}' must be a non-empty JSON object")
+    return value
+
+
+def _path(key: str) -> str:
+    # "$." followed by the key as a quoted string: works for keys with dots or spaces
+    return "$." + json.dumps(key)
+
+
+def has_key(dialect, column, key: str):
+    """``column`` is an object with a ``key`` entry (of any value)."""
+    if dialect.name == "postgresql":
+        return type_coerce(column, JSONB).path_exists(_path(key))
+    return func.json_type(column, _path(key)).isnot(None)
+
+
+def contains(dialect, column, value: dict):
+    """``column`` contains the object ``value``: every key present with an equal value."""
+    if dialect.name == "postgresql":
+        return type_coerce(column, JSONB).contains(value)
+    return _contains_fallback(column, "$", value)
+
+
+def _contains_fallback(column, path: str, value: dict):
+    clauses = []
+    for key, expected in value.items():
+        at = f"{path}.{json.dumps(key)}"
+        if isinstance(expected, dict):
+            clauses.append(_contains_fallback(column, at, expected))
+        elif isinstance(expected, list):
+            clauses.append(func.json(func.json_extract(column, at)) == json.dumps(expected, separators=(",", ":")))
+        elif expected is None:
+            clauses.append(func.json_type(column, at) == "null")
+        else:
+            clauses.append(func.json_extract(column, at) == expected)
+    return and_(*clauses)
@@ -0,0 +1,124 @@
+# core/metrics.py
+# Prometheus metrics: per-route latency, in-flight requests, threadpool and DB pool occupancy.
+import time
+
+from anyio import to_thread
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+
+# Own registry per import: benchmarks load several services into one process
+REGISTRY = CollectorRegistry()
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "Request latency by route template",
+    ["method", "route", "status"], registry=REGISTRY,
+)
+IN_FLIGHT = Gauge("http_requests_in_flight", "Requests currently being served", registry=REGISTRY)
+
+THREADPOOL_IN_USE = Gauge("threadpool_threads_in_use", "Threadpool slots held by sync routes/dependencies", registry=REGISTRY)
+THREADPOOL_SIZE = Gauge("threadpool_threads_total", "Threadpool capacity", registry=REGISTRY)
+
+DB_POOL_SIZE = Gauge("db_pool_size", "Configured pool size", ["engine"], registry=REGISTRY)
+DB_POOL_CHECKED_OUT = Gauge("db_pool_checked_out", "Connections checked out", ["engine"], registry=REGISTRY)
+DB_POOL_CHECKED_IN = Gauge("db_pool_checked_in", "Idle connections in the pool", ["engine"], registry=REGISTRY)
+DB_POOL_OVERFLOW = Gauge("db_pool_overflow", "Connections opened beyond pool_size", ["engine"], registry=REGISTRY)
+DB_POOL_CHECKOUT = Histogram(
+    "db_pool_checkout_seconds", "Time spent waiting for (or opening) a pooled connection",
+    ["engine"], registry=REGISTRY,
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+
+DB_REPLICA_LAG = Gauge("db_replica_lag_seconds", "Replay lag of the read replica at the last check", registry=REGISTRY)
+DB_REPLICA_AVAILABLE = Gauge("db_replica_available", "1 while the read replica answers lag checks", registry=REGISTRY)
+DB_ROUTED_REQUESTS = Counter(
+    "db_routed_requests_total", "Requests by the database they were routed to and why",
+    ["target", "reason"], registry=REGISTRY,
+)
+
+# Coalescing ratio: sum(rate(..{result!="leader"}[5m])) / sum(rate(..[5m]))
+SINGLE_FLIGHT_CALLS = Counter(
+    "single_flight_calls_total", "Coalesced detail lookups: leader ran the query, joined/reused shared it",
+    ["key", "result"], registry=REGISTRY,
+)
+
+WRITE_BEHIND_PENDING = Gauge(
+    "write_behind_pending", "Accepted submissions not yet written", ["queue"], registry=REGISTRY,
+)
+WRITE_BEHIND_ROWS = Counter(
+    "write_behind_rows_total", "Submissions by outcome: written, failed (refused by the database) or rejected (buffer full)",
+    ["queue", "outcome"], registry=REGISTRY,
+)
+WRITE_BEHIND_FLUSH = Histogram(
+    "write_behind_flush_seconds", "Time to write one batch", ["queue"], registry=REGISTRY,
+)
+
+ADMISSION_ACTIVE = Gauge("admission_active", "Requests holding an admission slot", ["lane"], registry=REGISTRY)
+ADMISSION_QUEUED = Gauge("admission_queued", "Requests waiting for an admission slot", ["lane"], registry=REGISTRY)
+ADMISSION_REJECTED = Counter(
+    "admission_rejected_total", "Requests shed with 503 (queue_full or queue_timeout)",
+    ["lane", "reason"], registry=REGISTRY,
+)
+
+
+def instrument_engine(engine, name: str = "primary"):
+    """Export pool gauges for ``engine`` and time every connection checkout."""
+    pool = engine.pool
+    if hasattr(pool, "checkedout"):
+        DB_POOL_SIZE.labels(name).set_function(pool.size)
+        DB_POOL_CHECKED_OUT.labels(name).set_function(pool.checkedout)
+        DB_POOL_CHECKED_IN.labels(name).set_function(pool.checkedin)
+        DB_POOL_OVERFLOW.labels(name).set_function(lambda: max(pool.overflow(), 0))
+
+    checkout = DB_POOL_CHECKOUT.labels(name)
+    connect = pool.connect
+
+    def timed_connect():
+        started = time.perf_counter()
+        try:
+            return connect()
+        finally:
+            checkout.observe(time.perf_counter() - started)
+
+    pool.connect = timed_connect
+
+
+class MetricsMiddleware:
+    """Records latency per route template (not raw path, to bound label cardinality)."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            IN_FLIGHT.dec()
+            route = scope.get("route")
+            REQUEST_LATENCY.labels(
+                scope["method"], getattr(route, "path", "<unmatched>"), str(status["code"])
+            ).observe(time.perf_counter() - started)
+
+
+router = APIRouter()
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    # Read on the event loop: anyio's default limiter is bound to the running loop
+    limiter = to_thread.current_default_thread_limiter()
+    THREADPOOL_IN_USE.set(limiter.borrowed_tokens)
+    THREADPOOL_SIZE.set(limiter.total_tokens)
+    return Response(generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
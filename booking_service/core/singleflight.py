@@ -0,0 +1,135 @@
+# core/singleflight.py
+# Request coalescing for hot detail lookups. When many clients ask for the same provider,
+# service, booking or vehicle at once, the first request (the leader) runs the query and
+# renders the body; identical requests arriving while it runs wait for and share that
+# result instead of each issuing the same SELECT. With ttl > 0 a finished result is also
+# reused for that many seconds.
+#
+# Keys are (route, params...). Share rendered bytes, never ORM objects: those belong to the
+# leader's session. Writes call forget() so nothing older than the write is handed out
+# afterwards.
+import asyncio
+import threading
+import time
+from typing import Awaitable, Callable, Hashable, Tuple, TypeVar
+
+from .metrics import SINGLE_FLIGHT_CALLS
+from .replica import reading_from_replica
+
+T = TypeVar("T")
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "expires", "event", "future")
+
+    def __init__(self):
+        self.done = False
+        self.result = None
+        self.error = None
+        self.expires = 0.0
+        self.event = None
+        self.future = None
+
+    def fresh(self, now: float) -> bool:
+        return self.done and self.error is None and self.expires > now
+
+
+class SingleFlight:
+    """Concurrent calls with the same key share one execution.
+
+    ``do`` is for sync routes (threadpool), ``do_async`` for coroutines on the event loop.
+    """
+
+    def __init__(self, ttl: float = 0.0, max_entries: int = 1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def _key(self, key: Tuple[Hashable, ...]) -> tuple:
+        # A request pinned to the primary (read-your-writes) must not get a replica read
+        return key + (reading_from_replica(),)
+
+    def _join(self, key: tuple, make_wait) -> Tuple[_Call, str]:
+        """The call to wait on for ``key`` and whether this caller leads, joins or reuses it."""
+        now = time.monotonic()
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                if not call.done:
+                    return call, "joined"
+                if call.fresh(now):
+                    return call, "reused"
+            if len(self._calls) >= self.max_entries:
+                self._calls = {k: c for k, c in self._calls.items() if not c.done}
+            call = _Call()
+            make_wait(call)
+            self._calls[key] = call
+            return call, "leader"
+
+    def _finish(self, key: tuple, call: _Call, result=None, error=None):
+        with self._lock:
+            call.result, call.error, call.done = result, error, True
+            call.expires = time.monotonic() + self.ttl
+            # Keep a successful result for reuse unless a write forgot the key meanwhile
+            if (error is not None or self.ttl <= 0) and self._calls.get(key) is call:
+                del self._calls[key]
+
+    def do(self, key: Tuple[Hashable, ...], fn: Callable[[], T]) -> T:
+        key = self._key(key)
+        call, result = self._join(key, lambda c: setattr(c, "event", threading.Event()))
+        SINGLE_FLIGHT_CALLS.labels(key[0], result).inc()
+        if result == "leader":
+            try:
+                value = fn()
+            except BaseException as exc:
+                self._finish(key, call, error=exc)
+                call.event.set()
+                raise
+            self._finish(key, call, result=value)
+            call.event.set()
+            return value
+        call.event.wait()
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    async def do_async(self, key: Tuple[Hashable, ...], fn: Callable[[], Awaitable[T]]) -> T:
+        key = self._key(key)
+        while True:
+            call, result = self._join(key, lambda c: setattr(c, "future", asyncio.get_running_loop().create_future()))
+            SINGLE_FLIGHT_CALLS.labels(key[0], result).inc()
+            if result == "leader":
+                try:
+                    value = await fn()
+                except asyncio.CancelledError:
+                    # The leader's client went away: waiters retry rather than fail with it
+                    self._finish(key, call, error=asyncio.CancelledError())
+                    call.future.cancel()
+                    raise
+                except Exception as exc:
+                    self._finish(key, call, error=exc)
+                    call.future.set_exception(exc)
+                    call.future.exception()  # mark retrieved when nobody is waiting
+                    raise
+                self._finish(key, call, result=value)
+                call.future.set_result(value)
+                return value
+            if result == "reused":
+                return call.result
+            try:
+                return await asyncio.shield(call.future)
+            except asyncio.CancelledError:
+                if not call.future.cancelled():
+                    raise
+
+    def forget(self, key: Tuple[Hashable, ...]):
+        """Drop ``key``'s result (both replica and primary variants) after a write."""
+        with self._lock:
+            for variant in (key + (False,), key + (True,)):
+                self._calls.pop(variant, None)
+
+    def clear(self):
+        """Drop every result, for writes that change many keys' bodies."""
+        with self._lock:
+            self._calls = {k: c for k, c in self._calls.items() if not c.done}
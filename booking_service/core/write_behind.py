@@ -0,0 +1,272 @@
+# core/write_behind.py
+# Write-behind submission. A client that does not need its row written before the response
+# sends "Prefer: respond-async" and gets 202 with the row's id straight away. The row is
+# appended to a local spool file and held in a bounded in-memory buffer; a background thread
+# writes the buffer in multi-row batches once batch_rows rows are waiting, or every
+# flush_seconds, so a burst of submissions costs a few transactions instead of one each.
+#
+# Durability: a submission is acknowledged only once its spool line is written (and fsynced,
+# with fsync=True), and the spool is replayed into the buffer on start, so a crash loses
+# nothing acknowledged. A batch may have committed just before a crash without the spool
+# being trimmed: write_batch() must skip ids that already exist.
+#
+# Backpressure: with buffer_rows submissions waiting, submit() raises BufferFull (503 +
+# Retry-After at the route). A batch the database refuses is retried one row at a time and
+# the rows that still fail are reported as "failed"; connection errors leave the batch
+# pending and the writer tries again after retry_seconds.
+#
+# The spool belongs to one process: give every worker its own path.
+import json
+import logging
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Callable, List, Optional
+
+from fastapi import HTTPException
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError
+
+from .metrics import WRITE_BEHIND_FLUSH, WRITE_BEHIND_PENDING, WRITE_BEHIND_ROWS
+
+logger = logging.getLogger(__name__)
+
+OUTCOMES_KEPT = 10000  # recent written/failed ids answered from memory by status()
+
+
+class BufferFull(Exception):
+    """buffer_rows submissions are already waiting; try again later."""
+
+
+class Submission(BaseModel):
+    id: str
+    status: str  # "queued", "written" or "failed"
+    error: Optional[str] = None
+
+
+def respond_async(prefer: Optional[str]) -> bool:
+    """True if a Prefer header asks for respond-async (RFC 7240)."""
+    return bool(prefer) and any(
+        token.split(";")[0].strip().lower() == "respond-async" for token in prefer.split(",")
+    )
+
+
+def accepted(writer: "WriteBehind", id: str, row: dict, location: str) -> ORJSONResponse:
+    """Queue ``row`` on ``writer``: 202 pointing at ``location``, or 503 while the buffer is full."""
+    try:
+        writer.submit(id, row)
+    except BufferFull:
+        retry_after = str(max(1, math.ceil(writer.flush_seconds)))
+        raise HTTPException(status_code=503, detail="Too many submissions waiting", headers={"Retry-After": retry_after})
+    return ORJSONResponse(
+        Submission(id=id, status="queued").model_dump(),
+        status_code=202,
+        headers={"Location": location, "Preference-Applied": "respond-async"},
+    )
+
+
+def _transient(exc: Exception) -> bool:
+    # The database could not be reached, as opposed to refusing the rows
+    return isinstance(exc, (OperationalError, InterfaceError)) or (
+        isinstance(exc, DBAPIError) and exc.connection_invalidated
+    )
+
+
+def _describe(exc: Exception) -> str:
+    if isinstance(exc, DBAPIError):
+        lines = str(exc.orig).strip().splitlines()
+        return lines[0] if lines else type(exc.orig).__name__
+    return f"{type(exc).__name__}: {exc}"[:500]
+
+
+def _line(entry: dict) -> bytes:
+    return json.dumps(entry, separators=(",", ":")).encode() + b"\n"
+
+
+class WriteBehind:
+    """Buffered, spooled submissions for one table; a no-op when ``spool_path`` is empty.
+
+    ``write_batch(entries)`` writes a list of {"id", "at", "row"} in one transaction,
+    skipping ids already in the table, and raises if the database refuses it.
+    """
+
+    def __init__(self, name: str, spool_path: Optional[str], write_batch: Callable[[List[dict]], None], *,
+                 buffer_rows: int = 10000, batch_rows: int = 500, flush_seconds: float = 1.0,
+                 fsync: bool = True, retry_seconds: float = 5.0, drain_seconds: float = 30.0):
+        self.name = name
+        self.spool_path = spool_path
+        self.write_batch = write_batch
+        self.buffer_rows = buffer_rows
+        self.batch_rows = batch_rows
+        self.flush_seconds = flush_seconds
+        self.fsync = fsync
+        self.retry_seconds = retry_seconds
+        self.drain_seconds = drain_seconds
+        self._pending = OrderedDict()  # id -> spool entry, oldest first
+        self._outcomes = OrderedDict()  # id -> (status, error) for recently finished ids
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._spool = None
+        self._spooled = 0  # lines in the spool file
+        self._thread = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.spool_path)
+
+    # --- request side ---
+
+    def submit(self, id: str, row: dict):
+        """Spool and buffer ``row`` (JSON-serializable) under ``id``; BufferFull if full."""
+        entry = {"id": id, "at": datetime.now(timezone.utc).isoformat(), "row": row}
+        line = _line(entry)
+        with self._cond:
+            if self._spool is None:
+                raise RuntimeError(f"write-behind {self.name} is not running")
+            if len(self._pending) >= self.buffer_rows:
+                WRITE_BEHIND_ROWS.labels(self.name, "rejected").inc()
+                raise BufferFull()
+            self._spool.write(line)
+            self._spool.flush()
+            if self.fsync:
+                os.fsync(self._spool.fileno())
+            self._spooled += 1
+            self._pending[id] = entry
+            WRITE_BEHIND_PENDING.labels(self.name).set(len(self._pending))
+            if len(self._pending) >= self.batch_rows:
+                self._cond.notify()
+
+    def status(self, id: str) -> Optional[Submission]:
+        """What became of submission ``id``; None if this process no longer remembers it."""
+        with self._cond:
+            if id in self._pending:
+                return Submission(id=id, status="queued")
+            outcome = self._outcomes.get(id)
+        return Submission(id=id, status=outcome[0], error=outcome[1]) if outcome else None
+
+    # --- writer (started/stopped by the lifespan) ---
+
+    def start(self):
+        if not self.enabled or self._thread is not None:
+            return
+        self._replay()
+        self._stop.clear()
+        self._spool = open(self.spool_path, "ab")
+        self._thread = threading.Thread(target=self._run, name=f"write-behind-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Write what is still buffered (for up to drain_seconds), then stop the writer."""
+        if self._thread is None:
+            return
+        with self._cond:
+            self._stop.set()
+            self._cond.notify()
+        self._thread.join(timeout=self.drain_seconds)
+        if not self._thread.is_alive():
+            with self._cond:
+                self._spool.close()
+                self._spool = None
+        self._thread = None
+
+    def _replay(self):
+        """Load the spool left by the previous run into the buffer."""
+        if not os.path.exists(self.spool_path):
+            return
+        with open(self.spool_path, "rb") as spool:
+            for number, line in enumerate(spool, 1):
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A line cut short by the crash was never acknowledged
+                    logger.warning("write-behind %s: skipping unreadable spool line %d", self.name, number)
+                    continue
+                self._pending[entry["id"]] = entry
+        if self._pending:
+            logger.info("write-behind %s: replaying %d spooled submissions", self.name, len(self._pending))
+        # Rewritten clean, so new lines never land after a torn one
+        self._rewrite_spool()
+        WRITE_BEHIND_PENDING.labels(self.name).set(len(self._pending))
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if not self._stop.is_set() and len(self._pending) < self.batch_rows:
+                    self._cond.wait(self.flush_seconds)
+                stopping = self._stop.is_set()
+                batch = list(islice(self._pending.values(), self.batch_rows))
+            if not batch:
+                if stopping:
+                    return
+                continue
+            if not self._flush(batch):
+                if stopping:
+                    return  # still spooled: written after the next start
+                self._stop.wait(self.retry_seconds)
+
+    def _flush(self, batch: List[dict]) -> bool:
+        """Write ``batch``; False if the database could not be reached."""
+        started = time.perf_counter()
+        failed = {}
+        try:
+            self.write_batch(batch)
+        except Exception as exc:
+            if _transient(exc):
+                logger.warning("write-behind %s: %d rows not written, retrying in %ss",
+                               self.name, len(batch), self.retry_seconds, exc_info=True)
+                return False
+            # Some row is refused: find out which, one transaction each
+            for entry in batch:
+                try:
+                    self.write_batch([entry])
+                except Exception as row_exc:
+                    if _transient(row_exc):
+                        return False
+                    failed[entry["id"]] = _describe(row_exc)
+            logger.warning("write-behind %s: %d of %d rows refused", self.name, len(failed), len(batch))
+        WRITE_BEHIND_FLUSH.labels(self.name).observe(time.perf_counter() - started)
+        self._done(batch, failed)
+        return True
+
+    def _done(self, batch: List[dict], failed: dict):
+        with self._cond:
+            for entry in batch:
+                id = entry["id"]
+                self._pending.pop(id, None)
+                self._outcomes[id] = ("failed", failed[id]) if id in failed else ("written", None)
+                self._outcomes.move_to_end(id)
+            while len(self._outcomes) > OUTCOMES_KEPT:
+                self._outcomes.popitem(last=False)
+            WRITE_BEHIND_PENDING.labels(self.name).set(len(self._pending))
+            self._trim_spool()
+        WRITE_BEHIND_ROWS.labels(self.name, "written").inc(len(batch) - len(failed))
+        if failed:
+            WRITE_BEHIND_ROWS.labels(self.name, "failed").inc(len(failed))
+
+    def _trim_spool(self):
+        # Caller holds the lock. Empty buffer: truncate. Otherwise rewrite the spool with just
+        # the pending rows once finished ones make up most of it.
+        if self._spool is None:
+            return
+        if not self._pending:
+            self._spool.truncate(0)
+            self._spooled = 0
+        elif self._spooled > 2 * len(self._pending) + self.batch_rows:
+            self._spool.close()
+            self._rewrite_spool()
+            self._spool = open(self.spool_path, "ab")
+
+    def _rewrite_spool(self):
+        """Replace the spool file with the pending rows only."""
+        tmp = f"{self.spool_path}.tmp"
+        with open(tmp, "wb") as out:
+            out.writelines(_line(entry) for entry in self._pending.values())
+            out.flush()
+            os.fsync(out.fileno())
+        os.replace(tmp, self.spool_path)
+        self._spooled = len(self._pending)
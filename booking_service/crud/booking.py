@@ -1,80 +1,379 @@
 # backend/booking_service/app/crud/booking.py
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, func, insert, or_, select, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
 
-from models.booking import Booking, ServiceLog
-from schemas.booking import BookingCreate, BookingUpdate, ServiceLogCreate
+from core.availability import MAX_SLOT_MINUTES, RELEASED_STATUSES, SlotUnavailable, check_slot, free_slots, provider_lock, utc
+from core.changes import ChangeFeed, Source
+from core.config import settings
+from core.db import SessionLocal
+from core.ids import new_id
+from core.ingest import IngestResult, write_chunk
+from core.json_filters import contains, has_key
+from core.pagination import DEFAULT_LIMIT, paginate, page
+from core.reads import row_select
+from core.write_behind import Submission, WriteBehind
+from models.booking import Booking, ProviderSchedule, ServiceLog, Tombstone, VehicleServiceDue
+from schemas.booking import BookingCreate, BookingOut, BookingUpdate, ProviderScheduleIn, ServiceLogCreate
+from schemas.booking import ServiceLog as ServiceLogOut
 
-from typing import List, Optional
+from typing import Iterable, List, Optional
 from uuid import UUID
 
 
+# --- Service due projection: each vehicle's latest log, for the due-soon scans ---
+
+UPSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def service_due_refresh(dialect, vehicle_ids: Optional[Iterable[str]] = None):
+    """Upsert the due projection of ``vehicle_ids`` (every vehicle when None) from their logs.
+
+    Run in the transaction that inserted the logs. Each vehicle's logs are read through the
+    vehicle_id index; a row is only replaced by a log serviced at the same time or later,
+    so a transaction that could not see a concurrent insert never rolls the row back.
+    """
+    serviced_at = func.coalesce(ServiceLog.performed_at, ServiceLog.created_at)
+    ranked = select(
+        ServiceLog.vehicle_id,
+        ServiceLog.user_id,
+        ServiceLog.provider_id,
+        ServiceLog.id.label("log_id"),
+        serviced_at.label("serviced_at"),
+        func.max(ServiceLog.mileage_km).over(partition_by=ServiceLog.vehicle_id).label("mileage_km"),
+        ServiceLog.next_service_date,
+        ServiceLog.next_service_km,
+        func.row_number().over(
+            partition_by=ServiceLog.vehicle_id, order_by=(serviced_at.desc(), ServiceLog.id.desc())
+        ).label("rank"),
+    ).where(ServiceLog.vehicle_id.isnot(None))
+    if vehicle_ids is not None:
+        ranked = ranked.where(ServiceLog.vehicle_id.in_(list(vehicle_ids)))
+    ranked = ranked.subquery()
+    columns = ["vehicle_id", "user_id", "provider_id", "log_id", "serviced_at", "mileage_km", "next_service_date", "next_service_km"]
+    latest = select(
+        *[ranked.c[c] for c in columns], (ranked.c.next_service_km - ranked.c.mileage_km).label("km_remaining")
+    ).where(ranked.c.rank == 1)
+    stmt = UPSERTS[dialect.name](VehicleServiceDue).from_select(columns + ["km_remaining"], latest)
+    return stmt.on_conflict_do_update(
+        index_elements=[VehicleServiceDue.vehicle_id],
+        set_={c: stmt.excluded[c] for c in columns[1:] + ["km_remaining"]},
+        where=VehicleServiceDue.serviced_at <= stmt.excluded.serviced_at,
+    )
+
+
+def logged_vehicles(rows) -> set:
+    return {row["vehicle_id"] for row in rows if row["vehicle_id"] is not None}
+
+
+def rebuild_service_due(db: Session):
+    """Recompute the projection for every vehicle (after a backfill, or to repair it)."""
+    db.execute(service_due_refresh(db.connection().dialect))
+    db.commit()
+
+
+def service_due_query(user_id: Optional[int], provider_id: Optional[str], due_by: datetime, km: int):
+    """Vehicles of a user's fleet, or a provider's customers, due by ``due_by`` or within ``km``.
+
+    Overdue vehicles (a past date, negative km_remaining) are included.
+    """
+    due = VehicleServiceDue
+    owner = due.user_id == user_id if user_id is not None else due.provider_id == provider_id
+    return row_select(due).where(owner, or_(due.next_service_date <= due_by, due.km_remaining <= km))
+
+
+SERVICE_DUE_PAGE_KEY = (VehicleServiceDue.vehicle_id,)
+
+
+def list_service_due(db: Session, user_id: Optional[int], provider_id: Optional[str], due_by: datetime, km: int,
+                     limit: int = DEFAULT_LIMIT, cursor: Optional[str] = None):
+    stmt = paginate(service_due_query(user_id, provider_id, due_by, km), SERVICE_DUE_PAGE_KEY, cursor, limit)
+    return page(db.execute(stmt).all(), SERVICE_DUE_PAGE_KEY, limit)
+
+
 def create_service_log(db: Session, payload: ServiceLogCreate):
-    log = ServiceLog(**payload.dict())
-    db.add(log)
+    log = db.scalars(insert(ServiceLog).values(**payload.dict()).returning(ServiceLog)).one()
+    if log.vehicle_id is not None:
+        db.execute(service_due_refresh(db.connection().dialect, [log.vehicle_id]))
     db.commit()
-    db.refresh(log)
     return log
 
-def list_service_logs_for_user(db: Session, user_id: int):
-    return db.query(ServiceLog).filter(ServiceLog.user_id == user_id).all()
+
+def write_service_log_batch(entries: List[dict]):
+    """One transaction for a batch of queued logs (core/write_behind.py); ids already written are skipped."""
+    with SessionLocal() as db:
+        written = set(db.scalars(select(ServiceLog.id).where(ServiceLog.id.in_([e["id"] for e in entries]))))
+        rows = [
+            # created_at is when the log was accepted, not when the batch ran
+            {"id": e["id"], "created_at": datetime.fromisoformat(e["at"]), **ServiceLogCreate.model_validate(e["row"]).dict()}
+            for e in entries
+            if e["id"] not in written
+        ]
+        if rows:
+            db.execute(insert(ServiceLog), rows)
+            db.execute(service_due_refresh(db.connection().dialect, logged_vehicles(rows)))
+        db.commit()
+
+
+# Write-behind submissions: POST /service-logs/ with "Prefer: respond-async"
+service_log_writer = WriteBehind(
+    "service_logs",
+    settings.service_log_spool_path,
+    write_service_log_batch,
+    buffer_rows=settings.service_log_buffer_rows,
+    batch_rows=settings.service_log_batch_rows,
+    flush_seconds=settings.service_log_flush_seconds,
+    fsync=settings.service_log_spool_fsync,
+)
+
+
+def service_log_submission(db: Session, log_id: str) -> Optional[Submission]:
+    submission = service_log_writer.status(log_id)
+    if submission is None and db.scalar(select(ServiceLog.id).where(ServiceLog.id == log_id)) is not None:
+        # Written longer ago than this process remembers (or by another worker)
+        submission = Submission(id=log_id, status="written")
+    return submission
+
+# Keyset sort keys: newest first, id breaks created_at ties
+BOOKING_PAGE_KEY = (Booking.created_at, Booking.id)
+SERVICE_LOG_PAGE_KEY = (ServiceLog.created_at, ServiceLog.id)
+
+# Service-log lists are read-only: they select plain Rows (core/reads.py), not ORM instances
+
+
+def list_service_logs_for_user(db: Session, user_id: int, limit: int = DEFAULT_LIMIT, cursor: Optional[str] = None):
+    stmt = paginate(row_select(ServiceLog).where(ServiceLog.user_id == user_id), SERVICE_LOG_PAGE_KEY, cursor, limit, descending=True)
+    return page(db.execute(stmt).all(), SERVICE_LOG_PAGE_KEY, limit)
+
+
+# --- Availability (core/availability.py) ---
+
+def default_schedule(provider_id: str) -> ProviderSchedule:
+    return ProviderSchedule(
+        provider_id=provider_id,
+        slot_minutes=settings.booking_slot_minutes,
+        capacity=settings.booking_slot_capacity,
+        opens_at=settings.booking_opens_at,
+        closes_at=settings.booking_closes_at,
+    )
+
+
+def booked_ranges(provider_id: str, start: datetime, end: datetime, exclude: Optional[str] = None):
+    """(scheduled_at, ends_at) of the provider's active bookings overlapping [start, end)."""
+    stmt = select(Booking.scheduled_at, Booking.ends_at).where(
+        Booking.provider_id == provider_id,
+        # The lower bound keeps the index range scan to the window: no booking is longer
+        Booking.scheduled_at > start - timedelta(minutes=MAX_SLOT_MINUTES),
+        Booking.scheduled_at < end,
+        Booking.ends_at > start,
+        func.coalesce(Booking.status, "pending").notin_(RELEASED_STATUSES),
+    )
+    if exclude is not None:
+        stmt = stmt.where(Booking.id != exclude)
+    return stmt
 
 
+def availability(schedule: ProviderSchedule, start: datetime, end: datetime, booked) -> dict:
+    return {
+        "provider_id": schedule.provider_id,
+        "slot_minutes": schedule.slot_minutes,
+        "capacity": schedule.capacity,
+        "slots": free_slots(schedule, start, end, booked),
+    }
 
-def list_service_logs_for_user(db: Session, user_id: int):
-    return db.query(ServiceLog).filter(ServiceLog.user_id == user_id).all()
+
+def needs_slot(current, changes: dict) -> bool:
+    """Whether ``changes`` make booking ``current`` take a slot it does not already hold."""
+    scheduled_at = changes.get("scheduled_at", current.scheduled_at)
+    active = changes.get("status", current.status) not in RELEASED_STATUSES
+    held = current.scheduled_at is not None and current.status not in RELEASED_STATUSES
+    return scheduled_at is not None and active and (not held or "scheduled_at" in changes)
+
+
+def get_provider_schedule(db: Session, provider_id: str) -> ProviderSchedule:
+    return db.get(ProviderSchedule, provider_id) or default_schedule(provider_id)
+
+
+def set_provider_schedule(db: Session, provider_id: str, payload: ProviderScheduleIn) -> ProviderSchedule:
+    schedule = db.merge(ProviderSchedule(provider_id=provider_id, **payload.dict()))
+    db.commit()
+    return schedule
+
+
+def get_availability(db: Session, provider_id: str, start: datetime, end: datetime) -> dict:
+    schedule = get_provider_schedule(db, provider_id)
+    return availability(schedule, start, end, db.execute(booked_ranges(provider_id, start, end)).all())
+
+
+def reserve_slot(db: Session, provider_id: str, scheduled_at: datetime, exclude: Optional[str] = None) -> dict:
+    """Check the provider's slot at ``scheduled_at`` and hold it until the caller commits.
+
+    Returns the scheduled_at/ends_at values to write; 422 when ``scheduled_at`` does not start
+    one of the provider's slots or has passed, SlotUnavailable (transaction rolled back) when
+    the slot is full.
+    """
+    scheduled_at = utc(scheduled_at)
+    schedule = get_provider_schedule(db, provider_id)
+    check_slot(schedule, scheduled_at)
+    ends_at = scheduled_at + timedelta(minutes=schedule.slot_minutes)
+    lock = provider_lock(db.connection().dialect, provider_id)
+    if lock is not None:
+        db.execute(lock)
+    taken = db.scalar(select(func.count()).select_from(booked_ranges(provider_id, scheduled_at, ends_at, exclude).subquery()))
+    if taken >= schedule.capacity:
+        db.rollback()
+        raise SlotUnavailable(provider_id, scheduled_at)
+    return {"scheduled_at": scheduled_at, "ends_at": ends_at}
 
 
 def create_booking(db: Session, payload: BookingCreate) -> Booking:
-    b = Booking(
+    slot = {"scheduled_at": None, "ends_at": None}
+    if payload.scheduled_at is not None:
+        slot = reserve_slot(db, payload.provider_id, payload.scheduled_at)
+    stmt = insert(Booking).values(
         user_id=payload.user_id,
         vehicle_id=payload.vehicle_id,
         provider_id=payload.provider_id,
         service_id=payload.service_id,
-        scheduled_at=payload.scheduled_at,
+        **slot,
         location=payload.location,
         meta=payload.meta,
-    )
-    db.add(b)
+    ).returning(Booking)
+    b = db.scalars(stmt).one()
     db.commit()
-    db.refresh(b)
     return b
 
 def get_booking(db: Session, booking_id: str) -> Optional[Booking]:
     return db.query(Booking).filter(Booking.id == booking_id).first()
 
 def update_booking(db: Session, booking_id: str, updates: BookingUpdate):
-    b = db.query(Booking).filter(Booking.id == booking_id).first()
-    if not b:
-        return None
-    for k, v in updates.dict(exclude_unset=True).items():
-        setattr(b, k, v)
+    # One UPDATE ... RETURNING instead of SELECT, UPDATE and a refresh
+    changes = updates.dict(exclude_unset=True)
+    if not changes:
+        return get_booking(db, booking_id)
+    if "scheduled_at" in changes or "status" in changes:
+        current = db.execute(
+            select(Booking.provider_id, Booking.scheduled_at, Booking.status).where(Booking.id == booking_id)
+        ).first()
+        if current is None:
+            return None
+        if needs_slot(current, changes):
+            changes.update(reserve_slot(db, current.provider_id, changes.get("scheduled_at", current.scheduled_at), exclude=booking_id))
+        elif "scheduled_at" in changes:
+            changes["ends_at"] = None  # holds no slot; one is reserved again if it is reactivated
+    b = db.scalars(update(Booking).where(Booking.id == booking_id).values(**changes).returning(Booking)).first()
     db.commit()
-    db.refresh(b)
     return b
 
 def delete_booking(db: Session, booking_id: str):
-    b = db.query(Booking).filter(Booking.id == booking_id).first()
-    if not b:
-        return False
-    db.delete(b)
+    deleted = db.execute(delete(Booking).where(Booking.id == booking_id).returning(Booking.id, Booking.user_id)).first()
+    if deleted:
+        # Same transaction: the change feed sees the delete exactly when the row is gone
+        db.execute(insert(Tombstone).values(entity="booking", entity_id=deleted.id, user_id=deleted.user_id))
     db.commit()
-    return True
+    return deleted is not None
 
 
-def list_bookings_for_user(db: Session, user_id: int, limit: int = 50, offset: int = 0) -> List[Booking]:
-    return db.query(Booking).filter(Booking.user_id == user_id).order_by(Booking.created_at.desc()).offset(offset).limit(limit).all()
+def list_bookings_for_user(db: Session, user_id: int, limit: int = DEFAULT_LIMIT, cursor: Optional[str] = None):
+    q = paginate(db.query(Booking).filter(Booking.user_id == user_id), BOOKING_PAGE_KEY, cursor, limit, descending=True)
+    return page(q.all(), BOOKING_PAGE_KEY, limit)
+
 def create_bulk_service_logs(db: Session, payloads: List[ServiceLogCreate]):
-    logs = [ServiceLog(**p.dict()) for p in payloads]
-    db.add_all(logs)
+    if not payloads:
+        return []
+    # Multi-row INSERT ... RETURNING in payload order, instead of one refresh per log
+    rows = [p.dict() for p in payloads]
+    logs = db.scalars(insert(ServiceLog).returning(ServiceLog, sort_by_parameter_order=True), rows).all()
+    vehicles = logged_vehicles(rows)
+    if vehicles:
+        db.execute(service_due_refresh(db.connection().dialect, vehicles))
     db.commit()
-    for log in logs:
-        db.refresh(log)
     return logs
 
 
-def list_service_logs_for_provider(db: Session, provider_id: str):
-    return db.query(ServiceLog).filter(ServiceLog.provider_id == provider_id).order_by(ServiceLog.created_at.desc()).all()
+def service_log_rows(chunk) -> list:
+    # ids are assigned here: COPY does not run the model's Python-side defaults
+    return [(line, {"id": new_id(), **payload.dict()}) for line, payload in chunk]
+
+
+def ingest_service_logs(db: Session, chunk, result: IngestResult):
+    """Write one chunk of validated NDJSON lines; the caller commits (see core/ingest.py)."""
+    rows = service_log_rows(chunk)
+    write_chunk(db, ServiceLog.__table__, rows, result)
+    # Vehicles of rows the database refused are recomputed too: harmless, and cheaper than tracking them
+    vehicles = logged_vehicles(row for _, row in rows)
+    if vehicles:
+        db.execute(service_due_refresh(db.connection().dialect, vehicles))
+
+
+def list_service_logs_for_provider(db: Session, provider_id: str, limit: int = DEFAULT_LIMIT, cursor: Optional[str] = None):
+    stmt = paginate(row_select(ServiceLog).where(ServiceLog.provider_id == provider_id), SERVICE_LOG_PAGE_KEY, cursor, limit, descending=True)
+    return page(db.execute(stmt).all(), SERVICE_LOG_PAGE_KEY, limit)
+
+
+def list_service_logs_for_vehicle(db: Session, vehicle_id: str, limit: int = DEFAULT_LIMIT, cursor: Optional[str] = None):
+    stmt = paginate(row_select(ServiceLog).where(ServiceLog.vehicle_id == vehicle_id), SERVICE_LOG_PAGE_KEY, cursor, limit, descending=True)
+    return page(db.execute(stmt).all(), SERVICE_LOG_PAGE_KEY, limit)
+
+
+def vehicle_history_query(vehicle_id: str):
+    """Every log for a vehicle, newest first; streamed by GET /service-logs/vehicle/{id}/history."""
+    return (
+        row_select(ServiceLog)
+        .where(ServiceLog.vehicle_id == vehicle_id)
+        .order_by(ServiceLog.created_at.desc(), ServiceLog.id.desc())
+    )
+
+
+# --- JSON search (core/json_filters.py): answered by the GIN indexes on Postgres ---
+
+def _equal(conditions: list, *pairs):
+    conditions.extend(column == value for column, value in pairs if value is not None)
+    return conditions
+
+
+def service_log_search_query(dialect, values: dict, keys: List[str], user_id: Optional[int] = None,
+                             vehicle_id: Optional[str] = None, provider_id: Optional[str] = None):
+    """Logs whose service_items have every key/value of ``values`` and every key in ``keys``."""
+    # All the key/value pairs in one containment test: a single GIN lookup
+    conditions = [contains(dialect, ServiceLog.service_items, values)] if values else []
+    conditions += [has_key(dialect, ServiceLog.service_items, key) for key in keys]
+    _equal(conditions, (ServiceLog.user_id, user_id), (ServiceLog.vehicle_id, vehicle_id), (ServiceLog.provider_id, provider_id))
+    return row_select(ServiceLog).where(*conditions)
+
+
+def booking_search_query(dialect, meta: Optional[dict] = None, location: Optional[dict] = None, user_id: Optional[int] = None,
+                         provider_id: Optional[str] = None, status: Optional[str] = None):
+    """Bookings whose meta and location contain the given objects."""
+    conditions = [contains(dialect, column, value) for column, value in ((Booking.meta, meta), (Booking.location, location)) if value]
+    _equal(conditions, (Booking.user_id, user_id), (Booking.provider_id, provider_id), (Booking.status, status))
+    return row_select(Booking).where(*conditions)
+
+
+def search_service_logs(db: Session, values, keys, user_id=None, vehicle_id=None, provider_id=None,
+                        limit: int = DEFAULT_LIMIT, cursor: Optional[str] = None):
+    stmt = service_log_search_query(db.connection().dialect, values, keys, user_id, vehicle_id, provider_id)
+    stmt = paginate(stmt, SERVICE_LOG_PAGE_KEY, cursor, limit, descending=True)
+    return page(db.execute(stmt).all(), SERVICE_LOG_PAGE_KEY, limit)
+
+
+def search_bookings(db: Session, meta=None, location=None, user_id=None, provider_id=None, status=None,
+                    limit: int = DEFAULT_LIMIT, cursor: Optional[str] = None):
+    stmt = booking_search_query(db.connection().dialect, meta, location, user_id, provider_id, status)
+    stmt = paginate(stmt, BOOKING_PAGE_KEY, cursor, limit, descending=True)
+    return page(db.execute(stmt).all(), BOOKING_PAGE_KEY, limit)
+
+
+# Delta sync: a user's bookings and service logs changed after a cursor, plus deleted bookings
+feed = ChangeFeed(
+    [Source("booking", Booking, "user_id", BookingOut), Source("service_log", ServiceLog, "user_id", ServiceLogOut)],
+    Tombstone,
+    settings.changes_settle_seconds,
+)
 
 
-def list_service_logs_for_vehicle(db: Session, vehicle_id: str):
-    return db.query(ServiceLog).filter(ServiceLog.vehicle_id == vehicle_id).order_by(ServiceLog.created_at.desc()).all()
+def list_changes(db: Session, user_id: int, since: Optional[str], limit: int) -> bytes:
+    results = [db.execute(stmt).all() for stmt in feed.queries(user_id, since, limit)]
+    return feed.page(results, since, limit)
@@ -0,0 +1,204 @@
+# backend/booking_service/app/crud/booking_async.py
+# Async twins of crud/booking.py, used when DB_ASYNC is enabled.
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.availability import SlotUnavailable, check_slot, provider_lock, utc
+
+from core.ingest import IngestResult, write_chunk_async
+from core.pagination import DEFAULT_LIMIT, paginate, page
+from core.reads import row_select
+from models.booking import Booking, ProviderSchedule, ServiceLog, Tombstone
+from core.write_behind import Submission
+from crud.booking import (
+    availability,
+    booked_ranges,
+    booking_search_query,
+    default_schedule,
+    feed,
+    logged_vehicles,
+    needs_slot,
+    SERVICE_DUE_PAGE_KEY,
+    service_due_query,
+    service_due_refresh,
+    service_log_search_query,
+    service_log_rows,
+    service_log_writer,
+)
+from schemas.booking import BookingCreate, BookingUpdate, ProviderScheduleIn, ServiceLogCreate
+
+from typing import List, Optional
+
+
+async def create_service_log(db: AsyncSession, payload: ServiceLogCreate):
+    log = (await db.scalars(insert(ServiceLog).values(**payload.dict()).returning(ServiceLog))).one()
+    if log.vehicle_id is not None:
+        await db.execute(service_due_refresh((await db.connection()).dialect, [log.vehicle_id]))
+    await db.commit()
+    return log
+
+
+async def service_log_submission(db: AsyncSession, log_id: str) -> Optional[Submission]:
+    submission = service_log_writer.status(log_id)
+    if submission is None and await db.scalar(select(ServiceLog.id).where(ServiceLog.id == log_id)) is not None:
+        submission = Submission(id=log_id, status="written")
+    return submission
+
+
+BOOKING_PAGE_KEY = (Booking.created_at, Booking.id)
+SERVICE_LOG_PAGE_KEY = (ServiceLog.created_at, ServiceLog.id)
+
+
+async def list_service_logs_for_user(db: AsyncSession, user_id: int, limit: int = DEFAULT_LIMIT, cursor: Optional[str] = None):
+    stmt = paginate(row_select(ServiceLog).where(ServiceLog.user_id == user_id), SERVICE_LOG_PAGE_KEY, cursor, limit, descending=True)
+    result = await db.execute(stmt)
+    return page(result.all(), SERVICE_LOG_PAGE_KEY, limit)
+
+
+async def get_provider_schedule(db: AsyncSession, provider_id: str) -> ProviderSchedule:
+    return await db.get(ProviderSchedule, provider_id) or default_schedule(provider_id)
+
+
+async def set_provider_schedule(db: AsyncSession, provider_id: str, payload: ProviderScheduleIn) -> ProviderSchedule:
+    schedule = await db.merge(ProviderSchedule(provider_id=provider_id, **payload.dict()))
+    await db.commit()
+    return schedule
+
+
+async def get_availability(db: AsyncSession, provider_id: str, start: datetime, end: datetime) -> dict:
+    schedule = await get_provider_schedule(db, provider_id)
+    result = await db.execute(booked_ranges(provider_id, start, end))
+    return availability(schedule, start, end, result.all())
+
+
+async def reserve_slot(db: AsyncSession, provider_id: str, scheduled_at: datetime, exclude: Optional[str] = None) -> dict:
+    scheduled_at = utc(scheduled_at)
+    schedule = await get_provider_schedule(db, provider_id)
+    check_slot(schedule, scheduled_at)
+    ends_at = scheduled_at + timedelta(minutes=schedule.slot_minutes)
+    lock = provider_lock((await db.connection()).dialect, provider_id)
+    if lock is not None:
+        await db.execute(lock)
+    taken = await db.scalar(select(func.count()).select_from(booked_ranges(provider_id, scheduled_at, ends_at, exclude).subquery()))
+    if taken >= schedule.capacity:
+        await db.rollback()
+        raise SlotUnavailable(provider_id, scheduled_at)
+    return {"scheduled_at": scheduled_at, "ends_at": ends_at}
+
+
+async def create_booking(db: AsyncSession, payload: BookingCreate) -> Booking:
+    slot = {"scheduled_at": None, "ends_at": None}
+    if payload.scheduled_at is not None:
+        slot = await reserve_slot(db, payload.provider_id, payload.scheduled_at)
+    stmt = insert(Booking).values(
+        user_id=payload.user_id,
+        vehicle_id=payload.vehicle_id,
+        provider_id=payload.provider_id,
+        service_id=payload.service_id,
+        **slot,
+        location=payload.location,
+        meta=payload.meta,
+    ).returning(Booking)
+    b = (await db.scalars(stmt)).one()
+    await db.commit()
+    return b
+
+
+async def get_booking(db: AsyncSession, booking_id: str) -> Optional[Booking]:
+    return await db.get(Booking, booking_id)
+
+
+async def update_booking(db: AsyncSession, booking_id: str, updates: BookingUpdate):
+    changes = updates.dict(exclude_unset=True)
+    if not changes:
+        return await get_booking(db, booking_id)
+    if "scheduled_at" in changes or "status" in changes:
+        result = await db.execute(
+            select(Booking.provider_id, Booking.scheduled_at, Booking.status).where(Booking.id == booking_id)
+        )
+        current = result.first()
+        if current is None:
+            return None
+        if needs_slot(current, changes):
+            changes.update(await reserve_slot(db, current.provider_id, changes.get("scheduled_at", current.scheduled_at), exclude=booking_id))
+        elif "scheduled_at" in changes:
+            changes["ends_at"] = None
+    b = (await db.scalars(update(Booking).where(Booking.id == booking_id).values(**changes).returning(Booking))).first()
+    await db.commit()
+    return b
+
+
+async def delete_booking(db: AsyncSession, booking_id: str):
+    result = await db.execute(delete(Booking).where(Booking.id == booking_id).returning(Booking.id, Booking.user_id))
+    deleted = result.first()
+    if deleted:
+        await db.execute(insert(Tombstone).values(entity="booking", entity_id=deleted.id, user_id=deleted.user_id))
+    await db.commit()
+    return deleted is not None
+
+
+async def list_bookings_for_user(db: AsyncSession, user_id: int, limit: int = DEFAULT_LIMIT, cursor: Optional[str] = None):
+    stmt = paginate(select(Booking).where(Booking.user_id == user_id), BOOKING_PAGE_KEY, cursor, limit, descending=True)
+    result = await db.execute(stmt)
+    return page(result.scalars().all(), BOOKING_PAGE_KEY, limit)
+
+
+async def create_bulk_service_logs(db: AsyncSession, payloads: List[ServiceLogCreate]):
+    if not payloads:
+        return []
+    rows = [p.dict() for p in payloads]
+    result = await db.scalars(insert(ServiceLog).returning(ServiceLog, sort_by_parameter_order=True), rows)
+    logs = result.all()
+    vehicles = logged_vehicles(rows)
+    if vehicles:
+        await db.execute(service_due_refresh((await db.connection()).dialect, vehicles))
+    await db.commit()
+    return logs
+
+
+async def ingest_service_logs(db: AsyncSession, chunk, result: IngestResult):
+    rows = service_log_rows(chunk)
+    await write_chunk_async(db, ServiceLog.__table__, rows, result)
+    vehicles = logged_vehicles(row for _, row in rows)
+    if vehicles:
+        await db.execute(service_due_refresh((await db.connection()).dialect, vehicles))
+
+
+async def list_service_due(db: AsyncSession, user_id: Optional[int], provider_id: Optional[str], due_by: datetime, km: int,
+                           limit: int = DEFAULT_LIMIT, cursor: Optional[str] = None):
+    stmt = paginate(service_due_query(user_id, provider_id, due_by, km), SERVICE_DUE_PAGE_KEY, cursor, limit)
+    result = await db.execute(stmt)
+    return page(result.all(), SERVICE_DUE_PAGE_KEY, limit)
+
+
+async def list_service_logs_for_provider(db: AsyncSession, provider_id: str, limit: int = DEFAULT_LIMIT, cursor: Optional[str] = None):
+    stmt = paginate(row_select(ServiceLog).where(ServiceLog.provider_id == provider_id), SERVICE_LOG_PAGE_KEY, cursor, limit, descending=True)
+    result = await db.execute(stmt)
+    return page(result.all(), SERVICE_LOG_PAGE_KEY, limit)
+
+
+async def list_service_logs_for_vehicle(db: AsyncSession, vehicle_id: str, limit: int = DEFAULT_LIMIT, cursor: Optional[str] = None):
+    stmt = paginate(row_select(ServiceLog).where(ServiceLog.vehicle_id == vehicle_id), SERVICE_LOG_PAGE_KEY, cursor, limit, descending=True)
+    result = await db.execute(stmt)
+    return page(result.all(), SERVICE_LOG_PAGE_KEY, limit)
+
+
+async def search_service_logs(db: AsyncSession, values, keys, user_id=None, vehicle_id=None, provider_id=None,
+                              limit: int = DEFAULT_LIMIT, cursor: Optional[str] = None):
+    stmt = service_log_search_query((await db.connection()).dialect, values, keys, user_id, vehicle_id, provider_id)
+    result = await db.execute(paginate(stmt, SERVICE_LOG_PAGE_KEY, cursor, limit, descending=True))
+    return page(result.all(), SERVICE_LOG_PAGE_KEY, limit)
+
+
+async def search_bookings(db: AsyncSession, meta=None, location=None, user_id=None, provider_id=None, status=None,
+                          limit: int = DEFAULT_LIMIT, cursor: Optional[str] = None):
+    stmt = booking_search_query((await db.connection()).dialect, meta, location, user_id, provider_id, status)
+    result = await db.execute(paginate(stmt, BOOKING_PAGE_KEY, cursor, limit, descending=True))
+    return page(result.all(), BOOKING_PAGE_KEY, limit)
+
+
+async def list_changes(db: AsyncSession, user_id: int, since: Optional[str], limit: int) -> bytes:
+    results = [(await db.execute(stmt)).all() for stmt in feed.queries(user_id, since, limit)]
+    return feed.page(results, since, limit)
@@ -1,27 +1,104 @@
 # backend/booking_service/main.py
-from fastapi import FastAPI, Request
-from routers import bookings, service_logs
-from core.db import engine
-from models import booking as booking_models
-import sqlalchemy
-import logging
-
-app = FastAPI(title="Booking Service")
-
-# --- Request logger middleware ---
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    body = await request.body()
-    logging.getLogger("uvicorn").info(
-        f"Incoming {request.method} {request.url}: {body.decode()}"
-    )
-    response = await call_next(request)
-    return response
+import os
+
+from fastapi import FastAPI
+from core.config import settings
+from core.admission import AdmissionControlMiddleware
+from core.db import Base, engine, async_engine, replica_engine, async_replica_engine, replicas, slow_queries
+from core.metrics import MetricsMiddleware, instrument_engine, router as metrics_router
+from core.query_stats import QueryStatsMiddleware, instrument_queries, parse_route_budgets
+from core.access_log import AccessLogMiddleware
+from core.replica import ReplicaRoutingMiddleware
+from core.slow_queries import debug_router as slow_queries_router
+from core.responses import ORJSONResponse
+from core.ids import add_invalid_id_handler
+from core.startup import lifespan_for
+from crud.booking import service_log_writer
+
+# Schema check and pool warm-up happen once at startup, not at import
+app = FastAPI(
+    title="Booking Service",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan_for(
+        engine,
+        async_engine,
+        schema_mode=settings.schema_mode,
+        metadata=Base.metadata,
+        alembic_ini=os.path.join(os.path.dirname(__file__), "alembic.ini"),
+        warmup_connections=settings.db_warmup_connections,
+        background=(replicas, slow_queries, service_log_writer),
+    ),
+)
+
+# --- Query stats (statement count/time per request, N+1 warnings) ---
+app.add_middleware(
+    QueryStatsMiddleware,
+    debug_headers=settings.debug,
+    budget=settings.query_budget,
+    route_budgets=parse_route_budgets(settings.query_route_budgets),
+    n_plus_one_threshold=settings.n_plus_one_threshold,
+)
+instrument_queries(engine)
+if async_engine is not None:
+    instrument_queries(async_engine.sync_engine)
+if replica_engine is not None:
+    instrument_queries(replica_engine)
+if async_replica_engine is not None:
+    instrument_queries(async_replica_engine.sync_engine)
+
+# --- Read replica routing (GET reads from the replica unless the client just wrote) ---
+app.add_middleware(ReplicaRoutingMiddleware, router=replicas)
+
+# --- Admission control (503 + Retry-After instead of an ever-deeper queue under overload) ---
+app.add_middleware(
+    AdmissionControlMiddleware,
+    max_concurrency=settings.admission_max_concurrency,
+    queue=settings.admission_queue,
+    max_wait=settings.admission_queue_wait_seconds,
+    route_concurrency=settings.admission_route_concurrency,
+    priority_paths=("/", "/metrics"),
+    priority_concurrency=settings.admission_priority_concurrency,
+    retry_after=settings.admission_retry_after_seconds,
+)
+
+# --- Metrics (Prometheus text at /metrics) ---
+app.add_middleware(MetricsMiddleware)
+instrument_engine(engine)
+if async_engine is not None:
+    instrument_engine(async_engine.sync_engine, "async")
+if replica_engine is not None:
+    instrument_engine(replica_engine, "replica")
+if async_replica_engine is not None:
+    instrument_engine(async_replica_engine.sync_engine, "async_replica")
+app.include_router(metrics_router)
+# Raw SQL, parameter shapes and plans: only exposed alongside the X-DB-Query-* headers
+if settings.debug:
+    app.include_router(slow_queries_router(slow_queries))
+
+# --- Access log (streams bodies through, never buffers them) ---
+# Added last, so it is the outermost middleware: 503s from admission control and the time
+# requests spend queued show up in its status and duration
+app.add_middleware(
+    AccessLogMiddleware,
+    logger_name="booking-service.access",
+    body_sample_rate=settings.access_log_body_sample_rate,
+    body_max_bytes=settings.access_log_body_max_bytes,
+)
+
+# Malformed ids in paths and bodies are 404s, not database errors
+add_invalid_id_handler(app)
 
 # --- Routers ---
+# DB_ASYNC=true serves the same routes from the AsyncEngine instead of the threadpool
+if settings.db_async:
+    from routers import bookings_async as bookings, service_logs_async as service_logs, changes_async as changes
+else:
+    from routers import bookings, service_logs, changes
+
 # Explicit prefixes are better so your docs stay clean
 app.include_router(bookings.router, prefix="/bookings")
 app.include_router(service_logs.router, prefix="/service-logs")
+app.include_router(changes.router, prefix="/changes")
 
 
 
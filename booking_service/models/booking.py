@@ -1,36 +1,78 @@
 # backend/booking_service/app/models/booking.py
 
-from sqlalchemy import Column, String, JSON, TIMESTAMP, Integer, func
-from sqlalchemy.dialects.postgresql import UUID
-import uuid
+from sqlalchemy import Column, String, JSON, TIMESTAMP, Time, Integer, Index, func
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 
 from core.db import Base
+from core.ids import UUIDKey, new_id
 
 class Booking(Base):
     __tablename__ = "bookings"
-    __table_args__ = {"schema": "bookings"}
-
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    __table_args__ = (
+        # Keyset pagination: per-user pages walk (created_at, id) straight off the index
+        Index("ix_bookings_user_id_created_at_id", "user_id", "created_at", "id"),
+        # Change feed: a user's changes since a cursor
+        Index("ix_bookings_user_id_updated_at_id", "user_id", "updated_at", "id"),
+        # Availability: a provider's bookings in a time range, answered from the index alone on Postgres
+        Index(
+            "ix_bookings_provider_id_scheduled_at", "provider_id", "scheduled_at",
+            postgresql_include=["ends_at", "status"],
+        ),
+        # Search by containment (meta @> '{"channel": "walk-in"}'); see core/json_filters.py
+        Index("ix_bookings_meta", "meta", postgresql_using="gin", postgresql_ops={"meta": "jsonb_path_ops"}),
+        Index("ix_bookings_location", "location", postgresql_using="gin", postgresql_ops={"location": "jsonb_path_ops"}),
+        {"schema": "bookings"},
+    )
+
+    id = Column(UUIDKey, primary_key=True, default=new_id)
 
     # ✅ user_id should be int since users table uses integers
     user_id = Column(Integer, nullable=False)
 
     vehicle_id = Column(String, index=True)
-    provider_id = Column(String, index=True)
+    provider_id = Column(String)
     service_id = Column(String, index=True)
 
     status = Column(String(50), default="pending")
     scheduled_at = Column(TIMESTAMP(timezone=True), nullable=True)
-    location = Column(JSON, nullable=True)
-    meta = Column(JSON, nullable=True)
+    # End of the slot reserved at scheduled_at, fixed when it was booked
+    ends_at = Column(TIMESTAMP(timezone=True), nullable=True)
+    location = Column(JSONB, nullable=True)
+    meta = Column(JSONB, nullable=True)
     created_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
+    updated_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
 
-class ServiceLog(Base):
-    __tablename__ = "service_logs"
+class ProviderSchedule(Base):
+    """A provider's booking slots; providers without a row get the configured defaults."""
+
+    __tablename__ = "provider_schedules"
     __table_args__ = {"schema": "bookings"}
 
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    provider_id = Column(String, primary_key=True)
+    slot_minutes = Column(Integer, nullable=False)
+    capacity = Column(Integer, nullable=False)  # bookings one slot can take
+    opens_at = Column(Time, nullable=False)  # UTC
+    closes_at = Column(Time, nullable=False)
+    updated_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+
+class ServiceLog(Base):
+    __tablename__ = "service_logs"
+    __table_args__ = (
+        Index("ix_service_logs_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index("ix_service_logs_provider_id_created_at_id", "provider_id", "created_at", "id"),
+        Index("ix_service_logs_vehicle_id_created_at_id", "vehicle_id", "created_at", "id"),
+        Index("ix_service_logs_user_id_updated_at_id", "user_id", "updated_at", "id"),
+        # Search by item: service_items @> '{"brake_pads": "changed"}', or @? '$."brake_pads"'
+        Index(
+            "ix_service_logs_service_items", "service_items",
+            postgresql_using="gin", postgresql_ops={"service_items": "jsonb_path_ops"},
+        ),
+        {"schema": "bookings"},
+    )
+
+    id = Column(UUIDKey, primary_key=True, default=new_id)
 
     # User & Vehicle
     user_id = Column(Integer, nullable=False)
@@ -46,7 +88,7 @@ class ServiceLog(Base):
     service_name = Column(String(255), nullable=True)
 
     # Items checked/changed
-    service_items = Column(JSON, nullable=True)  
+    service_items = Column(JSONB, nullable=True)
 
     mileage_km = Column(Integer, nullable=True)
     performed_at = Column(TIMESTAMP(timezone=True), nullable=True)
@@ -64,5 +106,46 @@ class ServiceLog(Base):
     notes = Column(String, nullable=True)
 
     created_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
+    updated_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+
+class VehicleServiceDue(Base):
+    """Each vehicle's latest service log, kept up to date by every insert into service_logs."""
+
+    __tablename__ = "vehicle_service_due"
+    __table_args__ = (
+        # Due-soon scans: a user's fleet or a provider's customers, by date or by distance
+        Index("ix_vehicle_service_due_user_id_next_service_date", "user_id", "next_service_date"),
+        Index("ix_vehicle_service_due_user_id_km_remaining", "user_id", "km_remaining"),
+        Index("ix_vehicle_service_due_provider_id_next_service_date", "provider_id", "next_service_date"),
+        Index("ix_vehicle_service_due_provider_id_km_remaining", "provider_id", "km_remaining"),
+        {"schema": "bookings"},
+    )
+
+    vehicle_id = Column(String, primary_key=True)
+    user_id = Column(Integer, nullable=False)
+    provider_id = Column(String, nullable=True)  # who did the latest service
+    log_id = Column(UUIDKey, nullable=False)
+    serviced_at = Column(TIMESTAMP(timezone=True), nullable=False)  # performed_at, else created_at
+    mileage_km = Column(Integer, nullable=True)  # highest reading in any of the vehicle's logs
+    next_service_date = Column(TIMESTAMP(timezone=True), nullable=True)
+    next_service_km = Column(Integer, nullable=True)
+    km_remaining = Column(Integer, nullable=True)  # next_service_km - mileage_km
+
+
+class Tombstone(Base):
+    """A deleted booking, kept so the change feed can tell clients to drop it."""
+
+    __tablename__ = "tombstones"
+    __table_args__ = (
+        Index("ix_tombstones_user_id_deleted_at_id", "user_id", "deleted_at", "id"),
+        {"schema": "bookings"},
+    )
+
+    id = Column(UUIDKey, primary_key=True, default=new_id)
+    entity = Column(String(50), nullable=False)
+    entity_id = Column(String, nullable=False)
+    user_id = Column(Integer, nullable=False)
+    deleted_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
 
 
@@ -1,15 +1,27 @@
 #1. backend/booking_service/app/routers/bookings.py
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
-from typing import List
+from datetime import datetime
+from typing import List, Optional
 from uuid import UUID
 
+from core.availability import SlotUnavailable, window
+from core.config import settings
+from core.json_filters import object_param
 from core.db import get_db
-from schemas.booking import BookingCreate, BookingOut, BookingUpdate
+from core.etag import PRIVATE_REVALIDATE, conditional
+from core.pagination import DEFAULT_LIMIT, MAX_LIMIT, set_next_cursor
+from core.responses import json_body, json_response, raw_json_response
+from core.singleflight import SingleFlight
+from schemas.booking import Availability, BookingCreate, BookingOut, BookingUpdate, ProviderScheduleIn, ProviderScheduleOut
 from crud.booking import (
     create_booking,
+    get_availability,
+    get_provider_schedule,
+    set_provider_schedule,
     get_booking,
     list_bookings_for_user,
+    search_bookings,
     update_booking,
     delete_booking,
 )
@@ -17,26 +29,86 @@ from crud.booking import (
 # ❌ remove prefix="/bookings"
 router = APIRouter(tags=["bookings"])
 
+# Concurrent requests for the same booking share one lookup and rendered body
+flights = SingleFlight(settings.single_flight_ttl_seconds)
 
-@router.post("/", response_model=BookingOut)
+
+@router.post("/", response_model=BookingOut, responses={409: {"description": "The provider's slot is fully booked"}})
 def create(payload: BookingCreate, db: Session = Depends(get_db)):
-    b = create_booking(db, payload)
-    return b
+    try:
+        return create_booking(db, payload)
+    except SlotUnavailable:
+        raise HTTPException(status_code=409, detail="Slot fully booked")
+
+
+# 🔹 A provider's free slots between from and to, each with the bookings it can still take
+@router.get("/availability", response_model=Availability)
+def availability(
+    provider_id: str,
+    start: datetime = Query(alias="from"),
+    end: datetime = Query(alias="to"),
+    db: Session = Depends(get_db),
+):
+    start, end = window(start, end, settings.availability_max_days)
+    return json_response(Availability, get_availability(db, provider_id, start, end))
+
+
+# 🔹 Bookings whose meta / location contain the given JSON objects, e.g.
+# ?meta={"channel": "walk-in"}; optionally for one user, provider or status. Newest first
+@router.get("/search", response_model=List[BookingOut])
+def search(
+    response: Response,
+    meta: Optional[str] = Query(None, description="JSON object the booking's meta must contain"),
+    location: Optional[str] = Query(None, description="JSON object the booking's location must contain"),
+    user_id: Optional[int] = None,
+    provider_id: Optional[str] = None,
+    status: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    db: Session = Depends(get_db),
+):
+    meta, location = object_param("meta", meta), object_param("location", location)
+    if meta is None and location is None:
+        raise HTTPException(status_code=422, detail="Pass meta or location")
+    rows, next_cursor = search_bookings(
+        db, meta, location, user_id, provider_id, status, limit=limit, cursor=cursor
+    )
+    set_next_cursor(response, next_cursor)
+    return json_response(List[BookingOut], rows, response)
+
+
+@router.get("/providers/{provider_id}/schedule", response_model=ProviderScheduleOut)
+def get_schedule(provider_id: str, db: Session = Depends(get_db)):
+    return get_provider_schedule(db, provider_id)
+
+
+# Applies to bookings made from now on; existing ones keep the slot they were given
+@router.put("/providers/{provider_id}/schedule", response_model=ProviderScheduleOut)
+def put_schedule(provider_id: str, payload: ProviderScheduleIn, db: Session = Depends(get_db)):
+    return set_provider_schedule(db, provider_id, payload)
 
 
 
 @router.get("/{booking_id}", response_model=BookingOut)
-def get_one(booking_id: str, db: Session = Depends(get_db)):
-    b = get_booking(db, booking_id)
-    if not b:
-        raise HTTPException(status_code=404, detail="Booking not found")
-    return b
+def get_one(booking_id: str, request: Request, db: Session = Depends(get_db)):
+    def load():
+        b = get_booking(db, booking_id)
+        if not b:
+            raise HTTPException(status_code=404, detail="Booking not found")
+        return json_body(BookingOut, b)
+
+    body = flights.do(("get_booking", booking_id), load)
+    return conditional(request, raw_json_response(body), PRIVATE_REVALIDATE)
 
-@router.put("/{booking_id}", response_model=BookingOut)
+@router.put("/{booking_id}", response_model=BookingOut, responses={409: {"description": "The provider's slot is fully booked"}})
 def update(booking_id: str, updates: BookingUpdate, db: Session = Depends(get_db)):
-    b = update_booking(db, booking_id, updates)
+    try:
+        b = update_booking(db, booking_id, updates)
+    except SlotUnavailable:
+        raise HTTPException(status_code=409, detail="Slot fully booked")
     if not b:
         raise HTTPException(status_code=404, detail="Booking not found")
+    flights.forget(("get_booking", booking_id))
     return b
 
 @router.delete("/{booking_id}", status_code=204)
@@ -44,13 +116,22 @@ def delete(booking_id: str, db: Session = Depends(get_db)):
     ok = delete_booking(db, booking_id)
     if not ok:
         raise HTTPException(status_code=404, detail="Booking not found")
+    flights.forget(("get_booking", booking_id))
     return {}
 
 
 
 @router.get("/user/{user_id}", response_model=List[BookingOut])
-def list_for_user(user_id: int, db: Session = Depends(get_db)):
-    return list_bookings_for_user(db, user_id)
+def list_for_user(
+    user_id: int,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    db: Session = Depends(get_db),
+):
+    rows, next_cursor = list_bookings_for_user(db, user_id, limit=limit, cursor=cursor)
+    set_next_cursor(response, next_cursor)
+    return json_response(List[BookingOut], rows, response)
 
 
 
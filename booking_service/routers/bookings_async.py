@@ -0,0 +1,131 @@
+# backend/booking_service/app/routers/bookings_async.py
+# Same routes as routers/bookings.py, served from the AsyncEngine (DB_ASYNC=true).
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+from typing import List, Optional
+
+from core.availability import SlotUnavailable, window
+from core.config import settings
+from core.json_filters import object_param
+from core.db import get_async_db
+from core.etag import PRIVATE_REVALIDATE, conditional
+from core.pagination import DEFAULT_LIMIT, MAX_LIMIT, set_next_cursor
+from core.responses import json_body, json_response, raw_json_response
+from core.singleflight import SingleFlight
+from schemas.booking import Availability, BookingCreate, BookingOut, BookingUpdate, ProviderScheduleIn, ProviderScheduleOut
+from crud.booking_async import (
+    create_booking,
+    get_availability,
+    get_provider_schedule,
+    set_provider_schedule,
+    get_booking,
+    list_bookings_for_user,
+    search_bookings,
+    update_booking,
+    delete_booking,
+)
+
+router = APIRouter(tags=["bookings"])
+
+# Concurrent requests for the same booking share one lookup and rendered body
+flights = SingleFlight(settings.single_flight_ttl_seconds)
+
+
+@router.post("/", response_model=BookingOut, responses={409: {"description": "The provider's slot is fully booked"}})
+async def create(payload: BookingCreate, db: AsyncSession = Depends(get_async_db)):
+    try:
+        return await create_booking(db, payload)
+    except SlotUnavailable:
+        raise HTTPException(status_code=409, detail="Slot fully booked")
+
+
+# 🔹 A provider's free slots between from and to, each with the bookings it can still take
+@router.get("/availability", response_model=Availability)
+async def availability(
+    provider_id: str,
+    start: datetime = Query(alias="from"),
+    end: datetime = Query(alias="to"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    start, end = window(start, end, settings.availability_max_days)
+    return json_response(Availability, await get_availability(db, provider_id, start, end))
+
+
+# 🔹 Bookings whose meta / location contain the given JSON objects, e.g.
+# ?meta={"channel": "walk-in"}; optionally for one user, provider or status. Newest first
+@router.get("/search", response_model=List[BookingOut])
+async def search(
+    response: Response,
+    meta: Optional[str] = Query(None, description="JSON object the booking's meta must contain"),
+    location: Optional[str] = Query(None, description="JSON object the booking's location must contain"),
+    user_id: Optional[int] = None,
+    provider_id: Optional[str] = None,
+    status: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    db: AsyncSession = Depends(get_async_db),
+):
+    meta, location = object_param("meta", meta), object_param("location", location)
+    if meta is None and location is None:
+        raise HTTPException(status_code=422, detail="Pass meta or location")
+    rows, next_cursor = await search_bookings(
+        db, meta, location, user_id, provider_id, status, limit=limit, cursor=cursor
+    )
+    set_next_cursor(response, next_cursor)
+    return json_response(List[BookingOut], rows, response)
+
+
+@router.get("/providers/{provider_id}/schedule", response_model=ProviderScheduleOut)
+async def get_schedule(provider_id: str, db: AsyncSession = Depends(get_async_db)):
+    return await get_provider_schedule(db, provider_id)
+
+
+# Applies to bookings made from now on; existing ones keep the slot they were given
+@router.put("/providers/{provider_id}/schedule", response_model=ProviderScheduleOut)
+async def put_schedule(provider_id: str, payload: ProviderScheduleIn, db: AsyncSession = Depends(get_async_db)):
+    return await set_provider_schedule(db, provider_id, payload)
+
+
+@router.get("/{booking_id}", response_model=BookingOut)
+async def get_one(booking_id: str, request: Request, db: AsyncSession = Depends(get_async_db)):
+    async def load():
+        b = await get_booking(db, booking_id)
+        if not b:
+            raise HTTPException(status_code=404, detail="Booking not found")
+        return json_body(BookingOut, b)
+
+    body = await flights.do_async(("get_booking", booking_id), load)
+    return conditional(request, raw_json_response(body), PRIVATE_REVALIDATE)
+
+@router.put("/{booking_id}", response_model=BookingOut, responses={409: {"description": "The provider's slot is fully booked"}})
+async def update(booking_id: str, updates: BookingUpdate, db: AsyncSession = Depends(get_async_db)):
+    try:
+        b = await update_booking(db, booking_id, updates)
+    except SlotUnavailable:
+        raise HTTPException(status_code=409, detail="Slot fully booked")
+    if not b:
+        raise HTTPException(status_code=404, detail="Booking not found")
+    flights.forget(("get_booking", booking_id))
+    return b
+
+@router.delete("/{booking_id}", status_code=204)
+async def delete(booking_id: str, db: AsyncSession = Depends(get_async_db)):
+    ok = await delete_booking(db, booking_id)
+    if not ok:
+        raise HTTPException(status_code=404, detail="Booking not found")
+    flights.forget(("get_booking", booking_id))
+    return {}
+
+
+@router.get("/user/{user_id}", response_model=List[BookingOut])
+async def list_for_user(
+    user_id: int,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    db: AsyncSession = Depends(get_async_db),
+):
+    rows, next_cursor = await list_bookings_for_user(db, user_id, limit=limit, cursor=cursor)
+    set_next_cursor(response, next_cursor)
+    return json_response(List[BookingOut], rows, response)
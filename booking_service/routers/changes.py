@@ -0,0 +1,23 @@
+# booking_service/routers/changes.py
+# Delta sync: a user's bookings and service logs changed after the client's cursor,
+# plus the bookings deleted since (see core/changes.py).
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import Optional
+
+from core.changes import CHANGES_DEFAULT_LIMIT, CHANGES_MAX_LIMIT, ChangePage
+from core.db import get_db
+from core.responses import raw_json_response
+from crud.booking import list_changes
+
+router = APIRouter(tags=["changes"])
+
+
+@router.get("", response_model=ChangePage)
+def changes(
+    user_id: int,
+    since: Optional[str] = None,
+    limit: int = Query(CHANGES_DEFAULT_LIMIT, ge=1, le=CHANGES_MAX_LIMIT),
+    db: Session = Depends(get_db),
+):
+    return raw_json_response(list_changes(db, user_id, since, limit))
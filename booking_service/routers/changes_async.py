@@ -0,0 +1,21 @@
+# Same routes as routers/changes.py, served from the AsyncEngine (DB_ASYNC=true).
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+
+from core.changes import CHANGES_DEFAULT_LIMIT, CHANGES_MAX_LIMIT, ChangePage
+from core.db import get_async_db
+from core.responses import raw_json_response
+from crud.booking_async import list_changes
+
+router = APIRouter(tags=["changes"])
+
+
+@router.get("", response_model=ChangePage)
+async def changes(
+    user_id: int,
+    since: Optional[str] = None,
+    limit: int = Query(CHANGES_DEFAULT_LIMIT, ge=1, le=CHANGES_MAX_LIMIT),
+    db: AsyncSession = Depends(get_async_db),
+):
+    return raw_json_response(await list_changes(db, user_id, since, limit))
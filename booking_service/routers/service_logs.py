@@ -1,27 +1,89 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from typing import List
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
 from uuid import UUID
 
-from core.db import get_db
-from schemas.booking import ServiceLogCreate, ServiceLog
+from core.config import settings
+from core.db import SessionLocal, get_db
+from core.ids import new_id
+from core.ingest import NDJSON_MEDIA_TYPE, IngestResult, ndjson_chunks
+from core.pagination import DEFAULT_LIMIT, MAX_LIMIT, set_next_cursor
+from core.reads import stream_json
+from core.responses import json_response
+from core.write_behind import Submission, accepted, respond_async
+from schemas.booking import ServiceDue, ServiceLogCreate, ServiceLog
 from crud.booking import (
     create_service_log,
     create_bulk_service_logs,
+    ingest_service_logs,
+    service_log_submission,
+    service_log_writer,
     list_service_logs_for_user,
     list_service_logs_for_provider,
     list_service_logs_for_vehicle,
+    list_service_due,
+    search_service_logs,
+    vehicle_history_query,
 )
 
 router = APIRouter(tags=["service logs"])
 
+ITEM_FILTER = Query(..., description=(
+    '"key" (item present) or "key:value", once per key; repeat with other keys to require several. '
+    'The value is everything after the first colon, matched as text since service item values are '
+    'strings: oil:true matches "true"'
+))
 
-# 🔹 Single service log (either by user or provider)
-@router.post("/", response_model=ServiceLog)
-def create_log(payload: ServiceLogCreate, db: Session = Depends(get_db)):
+
+def item_filters(item: List[str]) -> Tuple[dict, List[str]]:
+    """?item=brake_pads:changed&item=oil as ({"brake_pads": "changed"}, ["oil"]).
+
+    422 on a key given twice: a service item has one value, so two can never both match.
+    """
+    values, keys = {}, []
+    for raw in item:
+        key, sep, value = raw.partition(":")
+        if not key:
+            raise HTTPException(status_code=422, detail=f"Empty service item key in {raw!r}")
+        if key in values or key in keys:
+            raise HTTPException(status_code=422, detail=f"Service item {key!r} given more than once")
+        if sep:
+            values[key] = value
+        else:
+            keys.append(key)
+    return values, keys
+
+
+NDJSON_BODY = {"requestBody": {"required": True, "content": {NDJSON_MEDIA_TYPE: {"schema": {"type": "string"}}}}}
+
+
+# 🔹 Single service log (either by user or provider). With "Prefer: respond-async" (and a spool
+# configured) the log is queued for the background writer instead: 202 + its id at once
+@router.post("/", response_model=ServiceLog, responses={202: {"model": Submission}})
+def create_log(
+    payload: ServiceLogCreate,
+    request: Request,
+    prefer: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+):
+    if respond_async(prefer) and service_log_writer.enabled:
+        log_id = new_id()
+        location = str(request.url_for("submission_status", log_id=log_id))
+        return accepted(service_log_writer, log_id, payload.model_dump(mode="json"), location)
     return create_service_log(db, payload)
 
 
+# 🔹 What became of a queued log: queued, written or failed (with the database's reason)
+@router.get("/submissions/{log_id}", response_model=Submission)
+def submission_status(log_id: str, db: Session = Depends(get_db)):
+    submission = service_log_submission(db, log_id)
+    if submission is None:
+        raise HTTPException(status_code=404, detail="Submission not found")
+    return submission
+
+
 # 🔹 Provider logs full template (bulk)
 @router.post("/bulk", response_model=List[ServiceLog])
 def create_bulk_logs(payloads: List[ServiceLogCreate], db: Session = Depends(get_db)):
@@ -29,19 +91,102 @@ def create_bulk_logs(payloads: List[ServiceLogCreate], db: Session = Depends(get
     return logs
 
 
+# 🔹 Streaming bulk ingest: NDJSON, one ServiceLogCreate per line. Rows are validated and
+# written as they arrive; bad lines are reported by line number instead of failing the batch.
+@router.post("/ingest", response_model=IngestResult, openapi_extra=NDJSON_BODY)
+async def ingest_logs(request: Request, db: Session = Depends(get_db)):
+    result = IngestResult()
+    async for chunk in ndjson_chunks(request.stream(), ServiceLogCreate, result, settings.ingest_chunk_rows):
+        await run_in_threadpool(ingest_service_logs, db, chunk, result)
+    await run_in_threadpool(db.commit)
+    return json_response(IngestResult, result)
+
+
+# 🔹 Vehicles due for service within `days` days or `km` km (overdue ones included), from
+# each vehicle's latest log: a user's fleet (user_id) or a provider's customers (provider_id)
+@router.get("/due", response_model=List[ServiceDue])
+def list_due(
+    response: Response,
+    user_id: Optional[int] = None,
+    provider_id: Optional[str] = None,
+    days: int = Query(30, ge=0),
+    km: int = Query(1000, ge=0),
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    db: Session = Depends(get_db),
+):
+    if (user_id is None) == (provider_id is None):
+        raise HTTPException(status_code=422, detail="Pass exactly one of user_id and provider_id")
+    due_by = datetime.now(timezone.utc) + timedelta(days=days)
+    rows, next_cursor = list_service_due(db, user_id, provider_id, due_by, km, limit=limit, cursor=cursor)
+    set_next_cursor(response, next_cursor)
+    return json_response(List[ServiceDue], rows, response)
+
+
+# 🔹 Logs by service item, e.g. ?item=brake_pads:changed for "which vehicles had the brake
+# pads changed"; optionally within one user's, vehicle's or provider's logs. Newest first
+@router.get("/search", response_model=List[ServiceLog])
+def search_logs(
+    response: Response,
+    item: List[str] = ITEM_FILTER,
+    user_id: Optional[int] = None,
+    vehicle_id: Optional[str] = None,
+    provider_id: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    db: Session = Depends(get_db),
+):
+    values, keys = item_filters(item)
+    rows, next_cursor = search_service_logs(
+        db, values, keys, user_id, vehicle_id, provider_id, limit=limit, cursor=cursor
+    )
+    set_next_cursor(response, next_cursor)
+    return json_response(List[ServiceLog], rows, response)
+
+
 # 🔹 Fetch logs by user
 @router.get("/user/{user_id}", response_model=List[ServiceLog])
-def list_user_logs(user_id: int, db: Session = Depends(get_db)):
-    return list_service_logs_for_user(db, user_id)
+def list_user_logs(
+    user_id: int,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    db: Session = Depends(get_db),
+):
+    rows, next_cursor = list_service_logs_for_user(db, user_id, limit=limit, cursor=cursor)
+    set_next_cursor(response, next_cursor)
+    return json_response(List[ServiceLog], rows, response)
 
 
 # 🔹 Fetch logs by provider
 @router.get("/provider/{provider_id}", response_model=List[ServiceLog])
-def list_provider_logs(provider_id: str, db: Session = Depends(get_db)):
-    return list_service_logs_for_provider(db, provider_id)
+def list_provider_logs(
+    provider_id: str,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    db: Session = Depends(get_db),
+):
+    rows, next_cursor = list_service_logs_for_provider(db, provider_id, limit=limit, cursor=cursor)
+    set_next_cursor(response, next_cursor)
+    return json_response(List[ServiceLog], rows, response)
 
 
 # 🔹 Fetch logs by vehicle
 @router.get("/vehicle/{vehicle_id}", response_model=List[ServiceLog])
-def list_vehicle_logs(vehicle_id: str, db: Session = Depends(get_db)):
-    return list_service_logs_for_vehicle(db, vehicle_id)
+def list_vehicle_logs(
+    vehicle_id: str,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    db: Session = Depends(get_db),
+):
+    rows, next_cursor = list_service_logs_for_vehicle(db, vehicle_id, limit=limit, cursor=cursor)
+    set_next_cursor(response, next_cursor)
+    return json_response(List[ServiceLog], rows, response)
+
+
+# 🔹 Full vehicle history, streamed (flat memory however long the history is)
+@router.get("/vehicle/{vehicle_id}/history", response_model=List[ServiceLog])
+def vehicle_history(vehicle_id: str):
+    return stream_json(List[ServiceLog], SessionLocal, vehicle_history_query(vehicle_id))
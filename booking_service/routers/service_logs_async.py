@@ -0,0 +1,164 @@
+# Same routes as routers/service_logs.py, served from the AsyncEngine (DB_ASYNC=true).
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from core.config import settings
+from core.db import AsyncSessionLocal, get_async_db
+from core.ids import new_id
+from core.ingest import IngestResult, ndjson_chunks
+from core.pagination import DEFAULT_LIMIT, MAX_LIMIT, set_next_cursor
+from core.reads import stream_json_async
+from core.responses import json_response
+from core.write_behind import Submission, accepted, respond_async
+from schemas.booking import ServiceDue, ServiceLogCreate, ServiceLog
+from crud.booking_async import (
+    create_service_log,
+    create_bulk_service_logs,
+    ingest_service_logs,
+    service_log_submission,
+    list_service_logs_for_user,
+    list_service_logs_for_provider,
+    list_service_logs_for_vehicle,
+    list_service_due,
+    search_service_logs,
+)
+from crud.booking import service_log_writer, vehicle_history_query
+from routers.service_logs import ITEM_FILTER, NDJSON_BODY, item_filters
+
+router = APIRouter(tags=["service logs"])
+
+
+# 🔹 Single service log (either by user or provider). With "Prefer: respond-async" (and a spool
+# configured) the log is queued for the background writer instead: 202 + its id at once
+@router.post("/", response_model=ServiceLog, responses={202: {"model": Submission}})
+async def create_log(
+    payload: ServiceLogCreate,
+    request: Request,
+    prefer: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+):
+    if respond_async(prefer) and service_log_writer.enabled:
+        log_id = new_id()
+        location = str(request.url_for("submission_status", log_id=log_id))
+        # The spool write (and fsync) blocks: keep it off the event loop
+        return await run_in_threadpool(accepted, service_log_writer, log_id, payload.model_dump(mode="json"), location)
+    return await create_service_log(db, payload)
+
+
+# 🔹 What became of a queued log: queued, written or failed (with the database's reason)
+@router.get("/submissions/{log_id}", response_model=Submission)
+async def submission_status(log_id: str, db: AsyncSession = Depends(get_async_db)):
+    submission = await service_log_submission(db, log_id)
+    if submission is None:
+        raise HTTPException(status_code=404, detail="Submission not found")
+    return submission
+
+
+# 🔹 Provider logs full template (bulk)
+@router.post("/bulk", response_model=List[ServiceLog])
+async def create_bulk_logs(payloads: List[ServiceLogCreate], db: AsyncSession = Depends(get_async_db)):
+    return await create_bulk_service_logs(db, payloads)
+
+
+# 🔹 Streaming bulk ingest: NDJSON, one ServiceLogCreate per line. Rows are validated and
+# written as they arrive; bad lines are reported by line number instead of failing the batch.
+@router.post("/ingest", response_model=IngestResult, openapi_extra=NDJSON_BODY)
+async def ingest_logs(request: Request, db: AsyncSession = Depends(get_async_db)):
+    result = IngestResult()
+    async for chunk in ndjson_chunks(request.stream(), ServiceLogCreate, result, settings.ingest_chunk_rows):
+        await ingest_service_logs(db, chunk, result)
+    await db.commit()
+    return json_response(IngestResult, result)
+
+
+# 🔹 Vehicles due for service within `days` days or `km` km (overdue ones included), from
+# each vehicle's latest log: a user's fleet (user_id) or a provider's customers (provider_id)
+@router.get("/due", response_model=List[ServiceDue])
+async def list_due(
+    response: Response,
+    user_id: Optional[int] = None,
+    provider_id: Optional[str] = None,
+    days: int = Query(30, ge=0),
+    km: int = Query(1000, ge=0),
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    db: AsyncSession = Depends(get_async_db),
+):
+    if (user_id is None) == (provider_id is None):
+        raise HTTPException(status_code=422, detail="Pass exactly one of user_id and provider_id")
+    due_by = datetime.now(timezone.utc) + timedelta(days=days)
+    rows, next_cursor = await list_service_due(db, user_id, provider_id, due_by, km, limit=limit, cursor=cursor)
+    set_next_cursor(response, next_cursor)
+    return json_response(List[ServiceDue], rows, response)
+
+
+# 🔹 Logs by service item, e.g. ?item=brake_pads:changed for "which vehicles had the brake
+# pads changed"; optionally within one user's, vehicle's or provider's logs. Newest first
+@router.get("/search", response_model=List[ServiceLog])
+async def search_logs(
+    response: Response,
+    item: List[str] = ITEM_FILTER,
+    user_id: Optional[int] = None,
+    vehicle_id: Optional[str] = None,
+    provider_id: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    db: AsyncSession = Depends(get_async_db),
+):
+    values, keys = item_filters(item)
+    rows, next_cursor = await search_service_logs(
+        db, values, keys, user_id, vehicle_id, provider_id, limit=limit, cursor=cursor
+    )
+    set_next_cursor(response, next_cursor)
+    return json_response(List[ServiceLog], rows, response)
+
+
+# 🔹 Fetch logs by user
+@router.get("/user/{user_id}", response_model=List[ServiceLog])
+async def list_user_logs(
+    user_id: int,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    db: AsyncSession = Depends(get_async_db),
+):
+    rows, next_cursor = await list_service_logs_for_user(db, user_id, limit=limit, cursor=cursor)
+    set_next_cursor(response, next_cursor)
+    return json_response(List[ServiceLog], rows, response)
+
+
+# 🔹 Fetch logs by provider
+@router.get("/provider/{provider_id}", response_model=List[ServiceLog])
+async def list_provider_logs(
+    provider_id: str,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    db: AsyncSession = Depends(get_async_db),
+):
+    rows, next_cursor = await list_service_logs_for_provider(db, provider_id, limit=limit, cursor=cursor)
+    set_next_cursor(response, next_cursor)
+    return json_response(List[ServiceLog], rows, response)
+
+
+# 🔹 Fetch logs by vehicle
+@router.get("/vehicle/{vehicle_id}", response_model=List[ServiceLog])
+async def list_vehicle_logs(
+    vehicle_id: str,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    db: AsyncSession = Depends(get_async_db),
+):
+    rows, next_cursor = await list_service_logs_for_vehicle(db, vehicle_id, limit=limit, cursor=cursor)
+    set_next_cursor(response, next_cursor)
+    return json_response(List[ServiceLog], rows, response)
+
+
+# 🔹 Full vehicle history, streamed (flat memory however long the history is)
+@router.get("/vehicle/{vehicle_id}/history", response_model=List[ServiceLog])
+async def vehicle_history(vehicle_id: str):
+    return stream_json_async(List[ServiceLog], AsyncSessionLocal, vehicle_history_query(vehicle_id))
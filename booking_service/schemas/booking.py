@@ -1,7 +1,7 @@
 # backend/booking_service/app/schemas/booking.py
-from pydantic import BaseModel
-from typing import Optional, Dict
-from datetime import datetime
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+from typing import List, Optional, Dict
+from datetime import datetime, time
 from uuid import UUID
 from typing import Union
 
@@ -23,10 +23,40 @@ class BookingUpdate(BaseModel):
 class BookingOut(BookingCreate):
     id: str
     status: str
+    ends_at: Optional[datetime] = None
     created_at: Optional[datetime]
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+# availability:
+
+class ProviderScheduleIn(BaseModel):
+    slot_minutes: int = Field(ge=5, le=24 * 60)
+    capacity: int = Field(ge=1)
+    opens_at: time  # UTC
+    closes_at: time
+
+    @model_validator(mode="after")
+    def _opening_hours(self):
+        if self.closes_at <= self.opens_at:
+            raise ValueError("closes_at must be after opens_at")
+        return self
+
+class ProviderScheduleOut(ProviderScheduleIn):
+    provider_id: str
+
+    model_config = ConfigDict(from_attributes=True)
+
+class Slot(BaseModel):
+    start: datetime
+    end: datetime
+    available: int  # bookings the slot can still take
+
+class Availability(BaseModel):
+    provider_id: str
+    slot_minutes: int
+    capacity: int
+    slots: List[Slot]  # free slots only, in time order
 
 #service-logs:
 
@@ -57,5 +87,17 @@ class ServiceLog(ServiceLogBase):
     id: str
     created_at: datetime
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
+
+class ServiceDue(BaseModel):
+    vehicle_id: str
+    user_id: int
+    provider_id: Optional[str] = None
+    log_id: str  # the latest log, which set the due date and distance
+    serviced_at: datetime
+    mileage_km: Optional[int] = None
+    next_service_date: Optional[datetime] = None
+    next_service_km: Optional[int] = None
+    km_remaining: Optional[int] = None
+
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,33 @@
+"""Native uuid primary keys
+
+Revision ID: a7c3e91b5f20
+Revises: c4d81f2e6b07
+Create Date: 2026-10-18 20:04:29.887613
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c3e91b5f20'
+down_revision: Union[str, None] = 'c4d81f2e6b07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Existing ids are uuid4 text and convert in place; new rows get time-ordered uuid7 keys
+TABLES = ['expenses']
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        op.alter_column(table, 'id', type_=sa.Uuid(), existing_type=sa.String(), existing_nullable=False,
+                        postgresql_using='id::uuid', schema='expense')
+
+
+def downgrade() -> None:
+    for table in reversed(TABLES):
+        op.alter_column(table, 'id', type_=sa.String(), existing_type=sa.Uuid(), existing_nullable=False,
+                        postgresql_using='id::text', schema='expense')
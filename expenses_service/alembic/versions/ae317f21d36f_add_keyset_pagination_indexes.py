@@ -0,0 +1,28 @@
+"""Add keyset pagination indexes
+
+Revision ID: ae317f21d36f
+Revises: 7f044b434387
+Create Date: 2026-10-18 14:29:26.976905
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ae317f21d36f'
+down_revision: Union[str, None] = '7f044b434387'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_expenses_created_at_id', 'expenses', ['created_at', 'id'], unique=False, schema='expense')
+    op.create_index('ix_expenses_owner_id_created_at_id', 'expenses', ['owner_id', 'created_at', 'id'], unique=False, schema='expense')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_expenses_owner_id_created_at_id', table_name='expenses', schema='expense')
+    op.drop_index('ix_expenses_created_at_id', table_name='expenses', schema='expense')
@@ -0,0 +1,31 @@
+"""Drop unused expense indexes
+
+Revision ID: c4d81f2e6b07
+Revises: ae317f21d36f
+Create Date: 2026-10-18 19:14:05.774219
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d81f2e6b07'
+down_revision: Union[str, None] = 'ae317f21d36f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# No query filters or sorts on these; owner_id is the leading column of ix_expenses_owner_id_created_at_id
+COLUMNS = ['owner_id', 'vehicle_id', 'provider_id', 'expense_type', 'location', 'cost']
+
+
+def upgrade() -> None:
+    for column in COLUMNS:
+        op.drop_index(op.f(f'ix_expense_expenses_{column}'), table_name='expenses', schema='expense')
+
+
+def downgrade() -> None:
+    for column in reversed(COLUMNS):
+        op.create_index(op.f(f'ix_expense_expenses_{column}'), 'expenses', [column], unique=False, schema='expense')
@@ -0,0 +1,33 @@
+"""Change feed: updated_at
+
+Revision ID: e6a4b2d09f13
+Revises: a7c3e91b5f20
+Create Date: 2026-10-18 21:13:41.775290
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6a4b2d09f13'
+down_revision: Union[str, None] = 'a7c3e91b5f20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = [('expenses', 'owner_id')]  # (table, owner column)
+
+
+def upgrade() -> None:
+    # Existing rows get the migration time, so each client's first sync is a full one
+    for table, owner in TABLES:
+        op.add_column(table, sa.Column('updated_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False), schema='expense')
+        op.create_index(f'ix_{table}_{owner}_updated_at_id', table, [owner, 'updated_at', 'id'], unique=False, schema='expense')
+
+
+def downgrade() -> None:
+    for table, owner in reversed(TABLES):
+        op.drop_index(f'ix_{table}_{owner}_updated_at_id', table_name=table, schema='expense')
+        op.drop_column(table, 'updated_at', schema='expense')
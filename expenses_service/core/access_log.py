@@ -0,0 +1,101 @@
+# core/access_log.py
+# Streaming access log: request/response bodies are never buffered, only counted as
+# they pass through, and records are written by a background thread via a queue.
+import atexit
+import logging
+import logging.handlers
+import queue
+import random
+import time
+
+QUEUE_SIZE = 10000
+
+_listener = None
+
+
+class _DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops records instead of blocking when the queue is full."""
+
+    dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            type(self).dropped += 1
+
+
+def get_access_logger(name: str) -> logging.Logger:
+    global _listener
+    logger = logging.getLogger(name)
+    if _listener is None:
+        q = queue.Queue(maxsize=QUEUE_SIZE)
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s %(message)s"))
+        _listener = logging.handlers.QueueListener(q, handler)
+        _listener.start()
+        atexit.register(_listener.stop)
+    if not logger.handlers:
+        logger.addHandler(_DroppingQueueHandler(_listener.queue))
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    return logger
+
+
+class AccessLogMiddleware:
+    """Logs method, path, status, duration and byte counts for every HTTP request.
+
+    A fraction ``body_sample_rate`` of requests also logs the first
+    ``body_max_bytes`` of the request body, captured as it is streamed to the app.
+    """
+
+    def __init__(self, app, logger_name: str = "access", body_sample_rate: float = 0.0, body_max_bytes: int = 1024):
+        self.app = app
+        self.logger = get_access_logger(logger_name)
+        self.body_sample_rate = body_sample_rate
+        self.body_max_bytes = body_max_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        sample = self.body_sample_rate > 0 and random.random() < self.body_sample_rate
+        head = bytearray()
+        stats = {"status": 500, "in": 0, "out": 0}
+
+        async def receive_wrapper():
+            message = await receive()
+            if message["type"] == "http.request":
+                chunk = message.get("body", b"")
+                stats["in"] += len(chunk)
+                if sample and len(head) < self.body_max_bytes:
+                    head.extend(chunk[: self.body_max_bytes - len(head)])
+            return message
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                stats["status"] = message["status"]
+            elif message["type"] == "http.response.body":
+                stats["out"] += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        finally:
+            path = scope["path"]
+            if scope.get("query_string"):
+                path = f"{path}?{scope['query_string'].decode('latin-1')}"
+            duration_ms = (time.perf_counter() - started) * 1000
+            if sample:
+                self.logger.info(
+                    "%s %s %d %.1fms in=%d out=%d body=%r",
+                    scope["method"], path, stats["status"], duration_ms, stats["in"], stats["out"],
+                    head.decode("utf-8", "replace"),
+                )
+            else:
+                self.logger.info(
+                    "%s %s %d %.1fms in=%d out=%d",
+                    scope["method"], path, stats["status"], duration_ms, stats["in"], stats["out"],
+                )
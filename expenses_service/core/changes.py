@@ -0,0 +1,103 @@
+# core/changes.py
+# Change feed (delta sync). Synced tables carry an updated_at column, and deletes leave a
+# row in the service's tombstones table, so GET .../changes?since=<cursor> returns only
+# what changed after the client's last sync. Each table is read with an index range scan on
+# (owner, updated_at, id), so the work follows the amount of change, not the collection size.
+#
+# The feed is ordered by (updated_at, id) across all of a service's synced tables and its
+# tombstones; the cursor is the key of the last change served. updated_at is stamped when
+# the writing transaction runs, not when it commits, so a slow transaction can commit a
+# change that sorts before a cursor already handed out. Changes younger than
+# settle_seconds are therefore held back until a later poll; keep it above the longest
+# write transaction (and the replica lag, when reads go to a replica).
+from datetime import datetime, timedelta, timezone
+from typing import Any, List, Optional
+
+from pydantic import BaseModel
+from sqlalchemy import select, tuple_
+
+from .pagination import decode_cursor, encode_cursor
+from .reads import row_select
+from .responses import adapter
+
+CHANGES_DEFAULT_LIMIT = 200
+CHANGES_MAX_LIMIT = 1000
+
+
+class Change(BaseModel):
+    entity: str  # e.g. "vehicle", "booking"
+    op: str  # "upsert" (data is the full row) or "delete" (data is null)
+    id: str
+    at: datetime
+    data: Optional[Any] = None
+
+
+class ChangePage(BaseModel):
+    changes: List[Change]
+    cursor: Optional[str]  # send back as ?since=; unchanged when there was nothing new
+    has_more: bool  # poll again straight away
+
+
+class Source:
+    """One synced table: rows whose ``owner`` column matches, sent as ``schema``."""
+
+    def __init__(self, entity: str, model, owner: str, schema):
+        self.entity = entity
+        self.model = model
+        self.schema = schema
+        self.owner = getattr(model, owner)
+        self.key = (model.updated_at, model.id)
+
+
+def _after(stmt, key, after, horizon, limit: int):
+    stmt = stmt.where(key[0] <= horizon)
+    if after:
+        stmt = stmt.where(tuple_(*key) > tuple(after))
+    return stmt.order_by(*key).limit(limit + 1)
+
+
+class ChangeFeed:
+    def __init__(self, sources: List[Source], tombstones=None, settle_seconds: float = 0):
+        self.sources = sources
+        self.tombstones = tombstones
+        self.settle_seconds = settle_seconds
+
+    def queries(self, owner, since: Optional[str], limit: int) -> list:
+        """One statement per source (and one for tombstones), to be run in this order."""
+        after = decode_cursor(since, [datetime, str]) if since else None
+        horizon = datetime.now(timezone.utc) - timedelta(seconds=self.settle_seconds)
+        stmts = [
+            _after(row_select(s.model).where(s.owner == owner), s.key, after, horizon, limit)
+            for s in self.sources
+        ]
+        if self.tombstones is not None:
+            # Tombstones name their owner column like the synced tables do (owner_id, user_id)
+            t = self.tombstones
+            t_owner = getattr(t, self.sources[0].owner.key)
+            stmts.append(_after(
+                select(t.id, t.entity, t.entity_id, t.deleted_at).where(t_owner == owner),
+                (t.deleted_at, t.id), after, horizon, limit,
+            ))
+        return stmts
+
+    def page(self, results: list, since: Optional[str], limit: int) -> bytes:
+        """Merge the rows of queries() into one ChangePage, encoded as JSON."""
+        merged = []
+        for source, rows in zip(self.sources, results):
+            merged += [((row.updated_at, row.id), source, row) for row in rows]
+        if self.tombstones is not None:
+            merged += [((row.deleted_at, row.id), None, row) for row in results[len(self.sources)]]
+        # Each query returned its first limit + 1 rows, so the first limit overall are all here
+        merged.sort(key=lambda change: change[0])
+        has_more = len(merged) > limit
+        merged = merged[:limit]
+
+        changes = []
+        for (at, _), source, row in merged:
+            if source is None:
+                changes.append(Change(entity=row.entity, op="delete", id=row.entity_id, at=at))
+            else:
+                data = adapter(source.schema).validate_python(row._mapping, from_attributes=True)
+                changes.append(Change(entity=source.entity, op="upsert", id=row.id, at=at, data=data))
+        cursor = encode_cursor(*merged[-1][0]) if merged else since
+        return adapter(ChangePage).dump_json(ChangePage(changes=changes, cursor=cursor, has_more=has_more))
@@ -12,8 +12,59 @@ DB_PORT = os.getenv("DB_PORT", "5432")
 
 DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 
+# Async mode: AsyncEngine + async routes instead of the threadpool-bound sync path
+DB_ASYNC = os.getenv("DB_ASYNC", "false").lower() in ("1", "true", "yes")
+ASYNC_DATABASE_URL = os.getenv(
+    "ASYNC_DATABASE_URL",
+    f"postgresql+asyncpg://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}",
+)
+
 SECRET_KEY = os.getenv("SECRET_KEY", "supersecret")
 ALGORITHM = "HS256"
 
 # CORS
 ALLOWED_ORIGINS = os.getenv("ALLOWED_ORIGINS", "*").split(",")
+
+# Access log: request bodies are only logged for a sampled fraction of requests
+ACCESS_LOG_BODY_SAMPLE_RATE = float(os.getenv("ACCESS_LOG_BODY_SAMPLE_RATE", "0"))
+ACCESS_LOG_BODY_MAX_BYTES = int(os.getenv("ACCESS_LOG_BODY_MAX_BYTES", "1024"))
+
+# Query stats: X-DB-Query-* headers in debug mode, per-request statement budget for tests
+DEBUG = os.getenv("DEBUG", "false").lower() in ("1", "true", "yes")
+QUERY_BUDGET = int(os.getenv("QUERY_BUDGET", "0"))
+# Per-route budgets overriding QUERY_BUDGET: "GET /route/{id}=2,POST /route/=4"
+QUERY_ROUTE_BUDGETS = os.getenv("QUERY_ROUTE_BUDGETS", "")
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", "10"))
+
+# Startup: "check" compares the database with the alembic head once, "create_all" runs DDL (dev only), "off" skips
+SCHEMA_MODE = os.getenv("SCHEMA_MODE", "check")
+DB_WARMUP_CONNECTIONS = int(os.getenv("DB_WARMUP_CONNECTIONS", "2"))
+
+# Optional read replica: GET requests read from it; writes, and reads right after a write, use the primary
+REPLICA_DATABASE_URL = os.getenv("REPLICA_DATABASE_URL") or None
+ASYNC_REPLICA_DATABASE_URL = os.getenv("ASYNC_REPLICA_DATABASE_URL") or (
+    REPLICA_DATABASE_URL and REPLICA_DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1)
+)
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "10"))
+REPLICA_LAG_CHECK_SECONDS = float(os.getenv("REPLICA_LAG_CHECK_SECONDS", "5"))
+
+# Admission control: at most ADMISSION_MAX_CONCURRENCY requests run at once (0 = off), sized
+# below the threadpool; up to ADMISSION_QUEUE wait ADMISSION_QUEUE_WAIT_SECONDS, the rest get 503
+ADMISSION_MAX_CONCURRENCY = int(os.getenv("ADMISSION_MAX_CONCURRENCY", "32"))
+ADMISSION_ROUTE_CONCURRENCY = int(os.getenv("ADMISSION_ROUTE_CONCURRENCY", "16"))
+ADMISSION_PRIORITY_CONCURRENCY = int(os.getenv("ADMISSION_PRIORITY_CONCURRENCY", "8"))
+ADMISSION_QUEUE = int(os.getenv("ADMISSION_QUEUE", "64"))
+ADMISSION_QUEUE_WAIT_SECONDS = float(os.getenv("ADMISSION_QUEUE_WAIT_SECONDS", "2"))
+ADMISSION_RETRY_AFTER_SECONDS = int(os.getenv("ADMISSION_RETRY_AFTER_SECONDS", "1"))
+
+# Slow-query log: statements slower than SLOW_QUERY_MS (0 = off) are logged with their route and
+# parameter shape. SLOW_QUERY_EXPLAIN_SAMPLE_RATE of them also get an EXPLAIN (ANALYZE, BUFFERS) plan, run
+# in the background; 0 by default, since ANALYZE runs the statement again on an already slow database
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+SLOW_QUERY_EXPLAIN_SAMPLE_RATE = float(os.getenv("SLOW_QUERY_EXPLAIN_SAMPLE_RATE", "0"))
+SLOW_QUERY_EXPLAIN_TIMEOUT_MS = int(os.getenv("SLOW_QUERY_EXPLAIN_TIMEOUT_MS", "5000"))
+
+# Change feed: changes younger than this are held back for the next poll, so a write
+# transaction still in flight cannot commit behind a cursor already handed out
+CHANGES_SETTLE_SECONDS = float(os.getenv("CHANGES_SETTLE_SECONDS", "2"))
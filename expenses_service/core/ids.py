@@ -0,0 +1,70 @@
+# core/ids.py
+# Primary keys: time-ordered UUIDs stored natively.
+#
+# Random uuid4 text keys are 36 bytes, and every insert lands on a random B-tree leaf, so
+# the primary key index grows by page splits. uuid7() puts a millisecond timestamp in the
+# high bits: new keys sort after the ones before them and inserts append to the right-hand
+# edge of the index. UUIDKey stores them in 16 bytes (native uuid on Postgres, CHAR(32)
+# elsewhere) while the application and the API keep seeing the usual string form.
+import os
+import time
+import uuid
+
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import Uuid
+from sqlalchemy.exc import StatementError
+from sqlalchemy.types import TypeDecorator
+
+
+def uuid7() -> uuid.UUID:
+    """A version 7 UUID: 48-bit Unix time in milliseconds, then 74 random bits."""
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), "big")
+    value &= ~(0xF000 << 64 | 0xC000 << 48)  # clear version and variant bits
+    value |= 0x7000 << 64 | 0x8000 << 48
+    return uuid.UUID(int=value)
+
+
+def new_id() -> str:
+    return str(uuid7())
+
+
+def canonical_id(value) -> str:
+    """``value`` in the string form UUIDKey returns; ValueError if it is not a UUID."""
+    return str(uuid.UUID(str(value)))
+
+
+class InvalidId(ValueError):
+    """A value bound to a UUIDKey column is not a UUID, so no row can have it."""
+
+
+class UUIDKey(TypeDecorator):
+    """Native UUID column whose Python values are canonical strings."""
+
+    impl = Uuid(as_uuid=True)
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None or isinstance(value, uuid.UUID):
+            return value
+        try:
+            return uuid.UUID(str(value))
+        except ValueError:
+            raise InvalidId(value) from None
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else str(value)
+
+    @property
+    def python_type(self):
+        return str
+
+
+async def invalid_id_handler(request, exc: StatementError):
+    # A malformed id in a path or body never matches a row: answer as the route would for a miss
+    if isinstance(exc.orig, InvalidId):
+        return ORJSONResponse({"detail": "Not found"}, status_code=404)
+    raise exc
+
+
+def add_invalid_id_handler(app):
+    app.add_exception_handler(StatementError, invalid_id_handler)
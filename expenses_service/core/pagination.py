@@ -0,0 +1,57 @@
+# core/pagination.py
+# Keyset (cursor) pagination: an opaque cursor holds the sort key of the last row served,
+# so every page is an index range scan from that key instead of an OFFSET skip.
+import base64
+import json
+from datetime import datetime
+from typing import Optional
+
+from fastapi import HTTPException, Response
+from sqlalchemy import tuple_
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(*values) -> str:
+    raw = json.dumps([v.isoformat() if isinstance(v, datetime) else v for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, types) -> list:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError(cursor)
+        return [datetime.fromisoformat(v) if t is datetime else t(v) for v, t in zip(values, types)]
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def paginate(q, columns, cursor: Optional[str], limit: int, descending: bool = False):
+    """Order ``q`` (a Query or select()) by ``columns`` and start after ``cursor``.
+
+    Fetches ``limit + 1`` rows so page() can tell whether another page exists.
+    """
+    if cursor:
+        values = decode_cursor(cursor, [c.type.python_type for c in columns])
+        # A plain tuple on the right binds each value with its column's type (UUIDKey, timestamps)
+        key, bound = (tuple_(*columns), tuple(values)) if len(columns) > 1 else (columns[0], values[0])
+        q = q.filter(key < bound if descending else key > bound)
+    return q.order_by(*[c.desc() if descending else c.asc() for c in columns]).limit(limit + 1)
+
+
+def page(rows, columns, limit: int):
+    """Trim the look-ahead row and return ``(rows, next_cursor)``."""
+    rows = list(rows)
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(*[getattr(rows[-1], c.key) for c in columns])
+
+
+def set_next_cursor(response: Response, next_cursor: Optional[str]):
+    # List bodies stay plain JSON arrays; the cursor for the next page travels in a header
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
@@ -0,0 +1,259 @@
+# core/slow_queries.py
+# Slow-query log. Every statement slower than threshold_ms is recorded with the route that
+# issued it and the shape of its parameters (bind names and types, never values). Records
+# are kept in a ring buffer served at /debug/slow-queries (mounted in debug mode only) and
+# written as JSON lines to the "<service>.slow_query" log.
+#
+# When explain_sample_rate is set (0 by default: every plan is extra load on a database
+# that is already slow), a sampled fraction of slow SELECTs is explained on a background
+# thread, so the plan shows directly which index is missing or which plan regressed. The
+# request that ran the slow statement never waits for it. ANALYZE executes the statement
+# again, so it is only used for plain reads: a SELECT that locks rows (FOR UPDATE) or calls a
+# function not known to be side-effect free, such as pg_advisory_xact_lock(), gets a plain
+# EXPLAIN. Writes are never explained; each EXPLAIN runs under a statement_timeout in a
+# transaction that is rolled back.
+import itertools
+import json
+import queue
+import random
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+
+from fastapi import APIRouter
+from sqlalchemy import event
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql import visitors
+from sqlalchemy.sql.expression import ClauseElement, Executable
+from sqlalchemy.sql.functions import FunctionElement
+
+from .access_log import get_access_logger
+from .query_stats import current_route
+
+_IGNORE = "slow_query_ignore"  # execution option set on our own EXPLAIN connections
+
+# Functions a SELECT may call and still be re-executed by EXPLAIN ANALYZE: pure, no locks
+ANALYZE_SAFE_FUNCTIONS = frozenset({
+    "abs", "avg", "coalesce", "count", "date_trunc", "dense_rank", "greatest", "json_extract",
+    "json_type", "jsonb_path_exists", "lag", "lead", "least", "length", "lower", "max", "min",
+    "now", "nullif", "rank", "row_number", "sum", "upper",
+})
+
+
+def analyze_safe(statement) -> bool:
+    """True if re-running ``statement`` only reads: no row locks, no unknown functions."""
+    for element in visitors.iterate(statement):
+        if getattr(element, "_for_update_arg", None) is not None:
+            return False
+        if isinstance(element, FunctionElement) and getattr(element, "name", "").lower() not in ANALYZE_SAFE_FUNCTIONS:
+            return False
+    return True
+
+
+class _Explain(Executable, ClauseElement):
+    inherit_cache = False
+
+    def __init__(self, statement, prefix: str):
+        self.statement = statement
+        self.prefix = prefix
+
+
+@compiles(_Explain)
+def _compile_explain(element, compiler, **kw):
+    text = compiler.process(element.statement, **kw)
+    # Plan rows are not the SELECT's columns: drop its result map so no result processors
+    # (UUIDKey, DateTime on SQLite, ...) run over them
+    compiler._result_columns = []
+    return f"{element.prefix} {text}"
+
+
+def _shape(params) -> str:
+    if isinstance(params, dict):
+        return "{" + ", ".join(f"{k}: {type(v).__name__}" for k, v in params.items()) + "}"
+    if isinstance(params, (list, tuple)):
+        return "(" + ", ".join(type(v).__name__ for v in params) + ")"
+    return type(params).__name__
+
+
+def param_shape(context, parameters, executemany: bool) -> str:
+    """Bind names and value types, e.g. ``{user_id_1: int, param_1: int}``; ``N x {...}`` for executemany."""
+    params = getattr(context, "compiled_parameters", None) or parameters
+    if executemany or (isinstance(params, list) and len(params) > 1):
+        return f"{len(params)} x {_shape(params[0])}" if params else "[]"
+    if isinstance(params, list):
+        params = params[0] if params else {}
+    return _shape(params)
+
+
+class SlowQueryLog:
+    """Records statements slower than ``threshold_ms`` (0 = off) on instrumented engines."""
+
+    def __init__(
+        self,
+        threshold_ms: float,
+        *,
+        explain_sample_rate: float = 0.0,
+        explain_timeout_ms: int = 5000,
+        logger_name: str = "slow_query",
+        max_entries: int = 200,
+        max_statements: int = 500,
+    ):
+        self.threshold_ms = threshold_ms
+        self.explain_sample_rate = explain_sample_rate
+        self.explain_timeout_ms = explain_timeout_ms
+        self.logger_name = logger_name
+        self.max_statements = max_statements
+        self._log = None
+        self._recent = deque(maxlen=max_entries)
+        self._totals = {}  # statement -> [count, total ms, max ms]
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._jobs = queue.Queue(maxsize=100)
+        self._thread = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold_ms > 0
+
+    def instrument(self, engine, name: str = "primary", explain_engine=None):
+        """Time statements on ``engine`` (``async_engine.sync_engine`` for async).
+
+        ``explain_engine`` is the sync engine EXPLAINs run on; it defaults to ``engine``
+        and must be given for async engines, whose connections belong to the event loop.
+        """
+        if not self.enabled:
+            return
+        explain_engine = explain_engine or engine
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def _before(conn, cursor, statement, parameters, context, executemany):
+            if context is not None:
+                context._slow_query_started = time.perf_counter()
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def _after(conn, cursor, statement, parameters, context, executemany):
+            started = getattr(context, "_slow_query_started", None)
+            if started is None or context.execution_options.get(_IGNORE):
+                return
+            ms = (time.perf_counter() - started) * 1000
+            if ms >= self.threshold_ms:
+                try:
+                    self._record(name, explain_engine, statement, parameters, context, executemany, ms)
+                except Exception:
+                    # Never fail the statement being observed
+                    pass
+
+    def _record(self, name, explain_engine, statement, parameters, context, executemany, ms):
+        entry = {
+            "id": next(self._ids),
+            "at": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+            "ms": round(ms, 2),
+            "route": current_route(),
+            "engine": name,
+            "statement": statement[:2000],
+            "params": param_shape(context, parameters, executemany),
+        }
+        compiled = getattr(context, "compiled", None)
+        if (
+            self.explain_sample_rate > 0
+            and not executemany
+            and compiled is not None
+            and getattr(compiled.statement, "is_select", False)
+            and random.random() < self.explain_sample_rate
+        ):
+            try:
+                params = dict(context.compiled_parameters[0]) if context.compiled_parameters else {}
+                self._jobs.put_nowait((entry, explain_engine, compiled.statement, params))
+                entry["plan"] = "pending"
+            except queue.Full:
+                pass
+        with self._lock:
+            self._recent.append(entry)
+            totals = self._totals.get(statement)
+            if totals is None and len(self._totals) < self.max_statements:
+                totals = self._totals[statement] = [0, 0.0, 0.0]
+            if totals is not None:
+                totals[0] += 1
+                totals[1] += ms
+                totals[2] = max(totals[2], ms)
+        self._emit({"event": "slow_query", **entry})
+
+    def _emit(self, record: dict):
+        if self._log is None:
+            self._log = get_access_logger(self.logger_name)
+        self._log.warning(json.dumps(record, default=str))
+
+    # --- EXPLAIN worker (started/stopped by the lifespan) ---
+
+    def start(self):
+        if not self.enabled or self.explain_sample_rate <= 0 or self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="slow-query-explain", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._jobs.put(None)
+            self._thread.join(timeout=self.explain_timeout_ms / 1000 + 1)
+            self._thread = None
+
+    def _run(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            entry = job[0]
+            try:
+                entry["plan"] = self.explain(*job[1:])
+            except Exception as exc:
+                entry["plan"] = None
+                entry["explain_error"] = f"{type(exc).__name__}: {exc}"[:500]
+            self._emit({"event": "slow_query_plan", "id": entry["id"], "route": entry["route"],
+                        "plan": entry["plan"], "error": entry.get("explain_error")})
+
+    def explain(self, engine, statement, params) -> list:
+        """The plan of the SELECT ``statement`` as text lines; with run times if analyze_safe()."""
+        dialect = engine.dialect.name
+        if dialect == "postgresql":
+            prefix = "EXPLAIN (ANALYZE, BUFFERS)" if analyze_safe(statement) else "EXPLAIN"
+        elif dialect == "sqlite":
+            prefix = "EXPLAIN QUERY PLAN"
+        else:
+            raise NotImplementedError(f"no EXPLAIN support for {dialect}")
+        with engine.connect() as conn:
+            conn = conn.execution_options(**{_IGNORE: True})
+            if dialect == "postgresql":
+                conn.exec_driver_sql(f"SET LOCAL statement_timeout = {int(self.explain_timeout_ms)}")
+            rows = conn.execute(_Explain(statement, prefix), params).all()
+            conn.rollback()
+        # Postgres: one "QUERY PLAN" column; SQLite: (id, parent, notused, detail)
+        return [str(row[-1]) for row in rows]
+
+    # --- read side ---
+
+    def recent(self, limit: int = 50) -> list:
+        with self._lock:
+            return list(self._recent)[-limit:][::-1]
+
+    def top(self, limit: int = 20) -> list:
+        with self._lock:
+            items = sorted(self._totals.items(), key=lambda kv: kv[1][1], reverse=True)[:limit]
+        return [
+            {"statement": s[:2000], "count": n, "total_ms": round(total, 2), "max_ms": round(peak, 2)}
+            for s, (n, total, peak) in items
+        ]
+
+
+def debug_router(log: SlowQueryLog) -> APIRouter:
+    """GET /debug/slow-queries: the latest slow statements (with plans) and the worst by total time.
+
+    Unauthenticated: include it only when DEBUG is on.
+    """
+    router = APIRouter()
+
+    @router.get("/debug/slow-queries", include_in_schema=False)
+    async def slow_queries(limit: int = 50):
+        return {"threshold_ms": log.threshold_ms, "recent": log.recent(limit), "top": log.top()}
+
+    return router
@@ -1,15 +1,75 @@
 #vehicle_Service/main.py
-from fastapi import FastAPI, Request
+import os
+
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-import logging
 
-from core.db import Base, engine
-from core.config import ALLOWED_ORIGINS
-from routes.expense import router as expense_router
-from models import expense as _models  # ensure model is imported before create_all
+from core.admission import AdmissionControlMiddleware
+from core.db import Base, engine, async_engine, replica_engine, async_replica_engine, replicas, slow_queries
+from core.metrics import MetricsMiddleware, instrument_engine, router as metrics_router
+from core.query_stats import QueryStatsMiddleware, instrument_queries, parse_route_budgets
+from core.replica import ReplicaRoutingMiddleware
+from core.slow_queries import debug_router as slow_queries_router
+from core.responses import ORJSONResponse
+from core.ids import add_invalid_id_handler
+from core.startup import lifespan_for
+from core.config import (
+    ALLOWED_ORIGINS, DB_ASYNC, ACCESS_LOG_BODY_SAMPLE_RATE, ACCESS_LOG_BODY_MAX_BYTES,
+    DEBUG, QUERY_BUDGET, QUERY_ROUTE_BUDGETS, N_PLUS_ONE_THRESHOLD, SCHEMA_MODE, DB_WARMUP_CONNECTIONS,
+    ADMISSION_MAX_CONCURRENCY, ADMISSION_ROUTE_CONCURRENCY, ADMISSION_PRIORITY_CONCURRENCY,
+    ADMISSION_QUEUE, ADMISSION_QUEUE_WAIT_SECONDS, ADMISSION_RETRY_AFTER_SECONDS,
+)
+from core.access_log import AccessLogMiddleware
+
+# Schema check and pool warm-up happen once at startup, not at import
+app = FastAPI(
+    title="Expenses", version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan_for(
+        engine,
+        async_engine,
+        schema_mode=SCHEMA_MODE,
+        metadata=Base.metadata,
+        alembic_ini=os.path.join(os.path.dirname(__file__), "alembic.ini"),
+        warmup_connections=DB_WARMUP_CONNECTIONS,
+        background=(replicas, slow_queries),
+    ),
+)
+
+# --- Query stats (statement count/time per request, N+1 warnings) ---
+app.add_middleware(
+    QueryStatsMiddleware,
+    debug_headers=DEBUG,
+    budget=QUERY_BUDGET,
+    route_budgets=parse_route_budgets(QUERY_ROUTE_BUDGETS),
+    n_plus_one_threshold=N_PLUS_ONE_THRESHOLD,
+)
+instrument_queries(engine)
+if async_engine is not None:
+    instrument_queries(async_engine.sync_engine)
+if replica_engine is not None:
+    instrument_queries(replica_engine)
+if async_replica_engine is not None:
+    instrument_queries(async_replica_engine.sync_engine)
+
+# --- Read replica routing (GET reads from the replica unless the client just wrote) ---
+app.add_middleware(ReplicaRoutingMiddleware, router=replicas)
 
-app = FastAPI(title="Expenses", version="1.0.0")
+# --- Admission control (503 + Retry-After instead of an ever-deeper queue under overload) ---
+app.add_middleware(
+    AdmissionControlMiddleware,
+    max_concurrency=ADMISSION_MAX_CONCURRENCY,
+    queue=ADMISSION_QUEUE,
+    max_wait=ADMISSION_QUEUE_WAIT_SECONDS,
+    route_concurrency=ADMISSION_ROUTE_CONCURRENCY,
+    priority_paths=("/expense/health", "/metrics"),
+    priority_concurrency=ADMISSION_PRIORITY_CONCURRENCY,
+    retry_after=ADMISSION_RETRY_AFTER_SECONDS,
+)
 
+# --- CORS ---
+# Added after admission control, so outside it: its 503s carry the CORS headers a browser
+# needs to read them
 app.add_middleware(
     CORSMiddleware,
     allow_origins=ALLOWED_ORIGINS if ALLOWED_ORIGINS != ["*"] else ["*"],
@@ -17,14 +77,39 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    body = await request.body()
-    logging.getLogger("uvicorn").info(
-        f"Incoming {request.method} {request.url} | Body: {body.decode() if body else 'EMPTY'}"
-    )
-    response = await call_next(request)
-    return response
+
+# --- Metrics (Prometheus text at /metrics) ---
+app.add_middleware(MetricsMiddleware)
+instrument_engine(engine)
+if async_engine is not None:
+    instrument_engine(async_engine.sync_engine, "async")
+if replica_engine is not None:
+    instrument_engine(replica_engine, "replica")
+if async_replica_engine is not None:
+    instrument_engine(async_replica_engine.sync_engine, "async_replica")
+app.include_router(metrics_router)
+# Raw SQL, parameter shapes and plans: only exposed alongside the X-DB-Query-* headers
+if DEBUG:
+    app.include_router(slow_queries_router(slow_queries))
+
+# --- Access log (streams bodies through, never buffers them) ---
+# Added last, so it is the outermost middleware: 503s from admission control and the time
+# requests spend queued show up in its status and duration
+app.add_middleware(
+    AccessLogMiddleware,
+    logger_name="expense-service.access",
+    body_sample_rate=ACCESS_LOG_BODY_SAMPLE_RATE,
+    body_max_bytes=ACCESS_LOG_BODY_MAX_BYTES,
+)
+
+# Malformed ids in paths and bodies are 404s, not database errors
+add_invalid_id_handler(app)
+
+# DB_ASYNC=true serves the same routes from the AsyncEngine instead of the threadpool
+if DB_ASYNC:
+    from routes.expense_async import router as expense_router
+else:
+    from routes.expense import router as expense_router
 
 app.include_router(expense_router, prefix="/expense", tags=["expense"])
 
@@ -1,17 +1,25 @@
 # backend/insurance_service/models/insurance.py
-import uuid
-from sqlalchemy import Column, String, Integer, TIMESTAMP, func
+from sqlalchemy import Column, String, Integer, Index, TIMESTAMP, func
 from core.db import Base
+from core.ids import UUIDKey, new_id
 
 class Expense(Base):
     __tablename__ = "expenses"
-    __table_args__ = {"schema": "expense"}
+    __table_args__ = (
+        # Keyset pagination on (created_at, id), globally and per owner
+        Index("ix_expenses_created_at_id", "created_at", "id"),
+        Index("ix_expenses_owner_id_created_at_id", "owner_id", "created_at", "id"),
+        # Change feed: an owner's changes since a cursor
+        Index("ix_expenses_owner_id_updated_at_id", "owner_id", "updated_at", "id"),
+        {"schema": "expense"},
+    )
     
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    owner_id = Column(Integer, index=True)
-    vehicle_id = Column(String, index=True)
-    provider_id = Column(String, index=True)
-    expense_type = Column(String, index=True)
-    location = Column(String, index=True)
-    cost = Column(Integer, index=True)    
+    id = Column(UUIDKey, primary_key=True, default=new_id)
+    owner_id = Column(Integer)
+    vehicle_id = Column(String)
+    provider_id = Column(String)
+    expense_type = Column(String)
+    location = Column(String)
+    cost = Column(Integer)    
     created_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
+    updated_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
@@ -1,47 +1,80 @@
 # insurance_service/routes/insurance.py
 
-from fastapi import APIRouter, Depends, status
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query, Response, status
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
+from core.changes import CHANGES_DEFAULT_LIMIT, CHANGES_MAX_LIMIT, ChangeFeed, ChangePage, Source
+from core.config import CHANGES_SETTLE_SECONDS
 from core.db import get_db
+from core.pagination import DEFAULT_LIMIT, MAX_LIMIT, paginate, page, set_next_cursor
+from core.reads import row_select
+from core.responses import json_response, raw_json_response
 from models.expense import Expense
 from schemas.expense import ExpenseCreate, ExpenseRead, ExpenseUpdate
 
 router = APIRouter()
 
+# Keyset sort key: newest first, id breaks created_at ties
+EXPENSE_PAGE_KEY = (Expense.created_at, Expense.id)
+
+# Delta sync: an owner's expenses created or changed after the client's cursor
+feed = ChangeFeed([Source("expense", Expense, "owner_id", ExpenseRead)], settle_seconds=CHANGES_SETTLE_SECONDS)
+
 @router.post("/create-expense", response_model=ExpenseRead, status_code=status.HTTP_201_CREATED)
 def create_expense(
     payload: ExpenseCreate,
     db: Session = Depends(get_db),
 ):
     
-    expense = Expense(
+    stmt = insert(Expense).values(
         owner_id=payload.owner_id,
         vehicle_id=payload.vehicle_id,
-        exoense_type=payload.expense_type,
+        expense_type=payload.expense_type,
         provider_id=payload.provider_id, 
         location=payload.location, 
         cost=payload.cost, 
-    )
-    db.add(expense)
+    ).returning(Expense)
+    expense = db.scalars(stmt).one()
     db.commit()
-    db.refresh(expense)
     return expense
 
 #GET all insurance policies
 @router.get("/get-expenses", response_model=list[ExpenseRead], status_code=status.HTTP_200_OK)
 def get_expenses(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
     db: Session = Depends(get_db),
 ):
-    expenses = db.query(Expense).all()
-    return expenses
+    stmt = paginate(row_select(Expense), EXPENSE_PAGE_KEY, cursor, limit, descending=True)
+    expenses, next_cursor = page(db.execute(stmt).all(), EXPENSE_PAGE_KEY, limit)
+    set_next_cursor(response, next_cursor)
+    return json_response(list[ExpenseRead], expenses, response)
 
 #GET insurance policy by owner ID
 @router.get("/get-expenses-by-owner/{owner_id}", response_model=list[ExpenseRead], status_code=status.HTTP_200_OK)
 def get_expenses_by_owner(
     owner_id: int,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
     db: Session = Depends(get_db),
 ):
-    expenses = db.query(Expense).filter(Expense.owner_id == owner_id).all()
-    return expenses
+    stmt = paginate(row_select(Expense).where(Expense.owner_id == owner_id), EXPENSE_PAGE_KEY, cursor, limit, descending=True)
+    expenses, next_cursor = page(db.execute(stmt).all(), EXPENSE_PAGE_KEY, limit)
+    set_next_cursor(response, next_cursor)
+    return json_response(list[ExpenseRead], expenses, response)
+
 
+@router.get("/changes", response_model=ChangePage, status_code=status.HTTP_200_OK)
+def get_changes(
+    owner_id: int,
+    since: Optional[str] = None,
+    limit: int = Query(CHANGES_DEFAULT_LIMIT, ge=1, le=CHANGES_MAX_LIMIT),
+    db: Session = Depends(get_db),
+):
+    results = [db.execute(stmt).all() for stmt in feed.queries(owner_id, since, limit)]
+    return raw_json_response(feed.page(results, since, limit))
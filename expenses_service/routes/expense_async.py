@@ -0,0 +1,80 @@
+# expenses_service/routes/expense_async.py
+# Same routes as routes/expense.py, served from the AsyncEngine (DB_ASYNC=true).
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query, Response, status
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.changes import CHANGES_DEFAULT_LIMIT, CHANGES_MAX_LIMIT, ChangeFeed, ChangePage, Source
+from core.config import CHANGES_SETTLE_SECONDS
+from core.db import get_async_db
+from core.pagination import DEFAULT_LIMIT, MAX_LIMIT, paginate, page, set_next_cursor
+from core.reads import row_select
+from core.responses import json_response, raw_json_response
+from models.expense import Expense
+from schemas.expense import ExpenseCreate, ExpenseRead
+
+router = APIRouter()
+
+# Keyset sort key: newest first, id breaks created_at ties
+EXPENSE_PAGE_KEY = (Expense.created_at, Expense.id)
+
+# Delta sync: an owner's expenses created or changed after the client's cursor
+feed = ChangeFeed([Source("expense", Expense, "owner_id", ExpenseRead)], settle_seconds=CHANGES_SETTLE_SECONDS)
+
+@router.post("/create-expense", response_model=ExpenseRead, status_code=status.HTTP_201_CREATED)
+async def create_expense(
+    payload: ExpenseCreate,
+    db: AsyncSession = Depends(get_async_db),
+):
+    stmt = insert(Expense).values(
+        owner_id=payload.owner_id,
+        vehicle_id=payload.vehicle_id,
+        expense_type=payload.expense_type,
+        provider_id=payload.provider_id,
+        location=payload.location,
+        cost=payload.cost,
+    ).returning(Expense)
+    expense = (await db.scalars(stmt)).one()
+    await db.commit()
+    return expense
+
+#GET all expenses
+@router.get("/get-expenses", response_model=list[ExpenseRead], status_code=status.HTTP_200_OK)
+async def get_expenses(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    db: AsyncSession = Depends(get_async_db),
+):
+    result = await db.execute(paginate(row_select(Expense), EXPENSE_PAGE_KEY, cursor, limit, descending=True))
+    rows, next_cursor = page(result.all(), EXPENSE_PAGE_KEY, limit)
+    set_next_cursor(response, next_cursor)
+    return json_response(list[ExpenseRead], rows, response)
+
+#GET expenses by owner ID
+@router.get("/get-expenses-by-owner/{owner_id}", response_model=list[ExpenseRead], status_code=status.HTTP_200_OK)
+async def get_expenses_by_owner(
+    owner_id: int,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    db: AsyncSession = Depends(get_async_db),
+):
+    result = await db.execute(paginate(row_select(Expense).where(Expense.owner_id == owner_id), EXPENSE_PAGE_KEY, cursor, limit, descending=True))
+    rows, next_cursor = page(result.all(), EXPENSE_PAGE_KEY, limit)
+    set_next_cursor(response, next_cursor)
+    return json_response(list[ExpenseRead], rows, response)
+
+
+@router.get("/changes", response_model=ChangePage, status_code=status.HTTP_200_OK)
+async def get_changes(
+    owner_id: int,
+    since: Optional[str] = None,
+    limit: int = Query(CHANGES_DEFAULT_LIMIT, ge=1, le=CHANGES_MAX_LIMIT),
+    db: AsyncSession = Depends(get_async_db),
+):
+    results = [(await db.execute(stmt)).all() for stmt in feed.queries(owner_id, since, limit)]
+    return raw_json_response(feed.page(results, since, limit))
@@ -1,5 +1,5 @@
 #backend/insurance_service/schemas/insurance.py
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from datetime import datetime
 from typing import Optional
 
@@ -25,8 +25,7 @@ class ExpenseRead(BaseModel):
     cost:int 
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class ExpenseUpdate(BaseModel):
     expense_type: Optional[str] = None
@@ -0,0 +1,28 @@
+"""Add keyset pagination indexes
+
+Revision ID: 00be19f7aafa
+Revises: 
+Create Date: 2026-10-18 14:34:05.529737
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '00be19f7aafa'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_insurance_policies_created_at_id', 'insurance_policies', ['created_at', 'id'], unique=False, schema='insurance')
+    op.create_index('ix_insurance_policies_owner_id_created_at_id', 'insurance_policies', ['owner_id', 'created_at', 'id'], unique=False, schema='insurance')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_insurance_policies_owner_id_created_at_id', table_name='insurance_policies', schema='insurance')
+    op.drop_index('ix_insurance_policies_created_at_id', table_name='insurance_policies', schema='insurance')
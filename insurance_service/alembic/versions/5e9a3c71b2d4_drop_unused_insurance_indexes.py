@@ -0,0 +1,31 @@
+"""Drop unused insurance indexes
+
+Revision ID: 5e9a3c71b2d4
+Revises: f2b6d0a84c17
+Create Date: 2026-10-18 21:42:17.306518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e9a3c71b2d4'
+down_revision: Union[str, None] = 'f2b6d0a84c17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# No query filters or sorts on these; owner_id is the leading column of ix_insurance_policies_owner_id_created_at_id
+COLUMNS = ['owner_id', 'vehicle_id', 'provider_id', 'insurance_type']
+
+
+def upgrade() -> None:
+    for column in COLUMNS:
+        op.drop_index(op.f(f'ix_insurance_insurance_policies_{column}'), table_name='insurance_policies', schema='insurance')
+
+
+def downgrade() -> None:
+    for column in reversed(COLUMNS):
+        op.create_index(op.f(f'ix_insurance_insurance_policies_{column}'), 'insurance_policies', [column], unique=False, schema='insurance')
@@ -0,0 +1,33 @@
+"""Native uuid primary keys
+
+Revision ID: f2b6d0a84c17
+Revises: 00be19f7aafa
+Create Date: 2026-10-18 20:05:02.431870
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b6d0a84c17'
+down_revision: Union[str, None] = '00be19f7aafa'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Existing ids are uuid4 text and convert in place; new rows get time-ordered uuid7 keys
+TABLES = ['insurance_policies']
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        op.alter_column(table, 'id', type_=sa.Uuid(), existing_type=sa.String(), existing_nullable=False,
+                        postgresql_using='id::uuid', schema='insurance')
+
+
+def downgrade() -> None:
+    for table in reversed(TABLES):
+        op.alter_column(table, 'id', type_=sa.String(), existing_type=sa.Uuid(), existing_nullable=False,
+                        postgresql_using='id::text', schema='insurance')
@@ -0,0 +1,61 @@
+# core/reads.py
+# Read-only query layer for large lists. row_select() is a Core select() of a model's
+# columns: results are tuple-backed Rows, with no ORM instances and nothing held in the
+# Session identity map. stream_json() sends every row of a query as one JSON array,
+# fetched chunk by chunk from a server-side cursor and serialized chunk by chunk, so
+# memory stays flat however many rows there are.
+from sqlalchemy import inspect, select
+from starlette.responses import StreamingResponse
+
+from .responses import adapter
+
+STREAM_CHUNK_SIZE = 1000
+
+
+def row_select(model):
+    """select() of every mapped column, labelled with the attribute name the ORM uses."""
+    return select(*[column.label(key) for key, column in inspect(model).columns.items()])
+
+
+def _encode(ta, rows, first: bool) -> bytes:
+    # Each chunk is dumped as a JSON array; without its brackets the chunks join into one array
+    body = ta.dump_json(ta.validate_python(rows, from_attributes=True), by_alias=True)[1:-1]
+    return body if first or not body else b"," + body
+
+
+def stream_json(tp, session_factory, stmt, chunk_size: int = STREAM_CHUNK_SIZE) -> StreamingResponse:
+    """Stream ``stmt``'s rows as a JSON array of ``tp`` (a ``List[...]`` type).
+
+    The body opens its own session: request-scoped ones from get_db are closed before
+    a streaming body is sent.
+    """
+    ta = adapter(tp)
+
+    def body():
+        with session_factory() as db:
+            result = db.execute(stmt.execution_options(yield_per=chunk_size)).mappings()
+            yield b"["
+            first = True
+            for rows in result.partitions():
+                yield _encode(ta, rows, first)
+                first = False
+            yield b"]"
+
+    return StreamingResponse(body(), media_type="application/json")
+
+
+def stream_json_async(tp, session_factory, stmt, chunk_size: int = STREAM_CHUNK_SIZE) -> StreamingResponse:
+    """Async twin of stream_json() for AsyncSession factories."""
+    ta = adapter(tp)
+
+    async def body():
+        async with session_factory() as db:
+            result = (await db.stream(stmt.execution_options(yield_per=chunk_size))).mappings()
+            yield b"["
+            first = True
+            async for rows in result.partitions():
+                yield _encode(ta, rows, first)
+                first = False
+            yield b"]"
+
+    return StreamingResponse(body(), media_type="application/json")
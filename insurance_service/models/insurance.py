@@ -1,17 +1,22 @@
 # backend/insurance_service/models/insurance.py
-import uuid
-from sqlalchemy import Column, String, Integer, TIMESTAMP, func
+from sqlalchemy import Column, String, Integer, Index, TIMESTAMP, func
 from core.db import Base
+from core.ids import UUIDKey, new_id
 
 class Insurance_Policy(Base):
     __tablename__ = "insurance_policies"
-    __table_args__ = {"schema": "insurance"}
+    __table_args__ = (
+        # Keyset pagination on (created_at, id), globally and per owner
+        Index("ix_insurance_policies_created_at_id", "created_at", "id"),
+        Index("ix_insurance_policies_owner_id_created_at_id", "owner_id", "created_at", "id"),
+        {"schema": "insurance"},
+    )
     
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    owner_id = Column(Integer, index=True)
-    vehicle_id = Column(String, index=True)
-    provider_id = Column(String, index=True)
-    insurance_type = Column(String, index=True)
+    id = Column(UUIDKey, primary_key=True, default=new_id)
+    owner_id = Column(Integer)
+    vehicle_id = Column(String)
+    provider_id = Column(String)
+    insurance_type = Column(String)
     commencement_date = Column(TIMESTAMP(timezone=True), nullable=True)
     expiry_date = Column(TIMESTAMP(timezone=True), nullable=True)
     created_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
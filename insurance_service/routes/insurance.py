@@ -1,47 +1,65 @@
 # insurance_service/routes/insurance.py
 
-from fastapi import APIRouter, Depends, status
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query, Response, status
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
 from core.db import get_db
+from core.pagination import DEFAULT_LIMIT, MAX_LIMIT, paginate, page, set_next_cursor
+from core.reads import row_select
+from core.responses import json_response
 from models.insurance import Insurance_Policy
 from schemas.insurance import InsurancePolicyCreate, InsurancePolicyRead, InsurancePolicyUpdate
 
 router = APIRouter()
 
+# Keyset sort key: newest first, id breaks created_at ties
+POLICY_PAGE_KEY = (Insurance_Policy.created_at, Insurance_Policy.id)
+
 @router.post("/create-insurance-policy", response_model=InsurancePolicyRead, status_code=status.HTTP_201_CREATED)
 def create_insurance_policy(
     payload: InsurancePolicyCreate,
     db: Session = Depends(get_db),
 ):
     
-    insurance_policy = Insurance_Policy(
+    stmt = insert(Insurance_Policy).values(
         owner_id=payload.owner_id,
         vehicle_id=payload.vehicle_id,
         insurance_type=payload.insurance_type,
         provider_id=payload.provider_id, 
         commencement_date=payload.commencement_date,
         expiry_date=payload.expiry_date,
-    )
-    db.add(insurance_policy)
+    ).returning(Insurance_Policy)
+    insurance_policy = db.scalars(stmt).one()
     db.commit()
-    db.refresh(insurance_policy)
     return insurance_policy
 
 #GET all insurance policies
 @router.get("/get-insurance-policies", response_model=list[InsurancePolicyRead], status_code=status.HTTP_200_OK)
 def get_insurance_policies(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
     db: Session = Depends(get_db),
 ):
-    insurance_policies = db.query(Insurance_Policy).all()
-    return insurance_policies
+    stmt = paginate(row_select(Insurance_Policy), POLICY_PAGE_KEY, cursor, limit, descending=True)
+    insurance_policies, next_cursor = page(db.execute(stmt).all(), POLICY_PAGE_KEY, limit)
+    set_next_cursor(response, next_cursor)
+    return json_response(list[InsurancePolicyRead], insurance_policies, response)
 
 #GET insurance policy by owner ID
 @router.get("/get-insurance-policy-by-owner/{owner_id}", response_model=list[InsurancePolicyRead], status_code=status.HTTP_200_OK)
 def get_insurance_policy_by_owner(
     owner_id: int,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
     db: Session = Depends(get_db),
 ):
-    insurance_policies = db.query(Insurance_Policy).filter(Insurance_Policy.owner_id == owner_id).all()
-    return insurance_policies
+    stmt = paginate(row_select(Insurance_Policy).where(Insurance_Policy.owner_id == owner_id), POLICY_PAGE_KEY, cursor, limit, descending=True)
+    insurance_policies, next_cursor = page(db.execute(stmt).all(), POLICY_PAGE_KEY, limit)
+    set_next_cursor(response, next_cursor)
+    return json_response(list[InsurancePolicyRead], insurance_policies, response)
 
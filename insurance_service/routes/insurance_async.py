@@ -0,0 +1,64 @@
+# insurance_service/routes/insurance_async.py
+# Same routes as routes/insurance.py, served from the AsyncEngine (DB_ASYNC=true).
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query, Response, status
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.db import get_async_db
+from core.pagination import DEFAULT_LIMIT, MAX_LIMIT, paginate, page, set_next_cursor
+from core.reads import row_select
+from core.responses import json_response
+from models.insurance import Insurance_Policy
+from schemas.insurance import InsurancePolicyCreate, InsurancePolicyRead
+
+router = APIRouter()
+
+# Keyset sort key: newest first, id breaks created_at ties
+POLICY_PAGE_KEY = (Insurance_Policy.created_at, Insurance_Policy.id)
+
+@router.post("/create-insurance-policy", response_model=InsurancePolicyRead, status_code=status.HTTP_201_CREATED)
+async def create_insurance_policy(
+    payload: InsurancePolicyCreate,
+    db: AsyncSession = Depends(get_async_db),
+):
+    stmt = insert(Insurance_Policy).values(
+        owner_id=payload.owner_id,
+        vehicle_id=payload.vehicle_id,
+        insurance_type=payload.insurance_type,
+        provider_id=payload.provider_id,
+        commencement_date=payload.commencement_date,
+        expiry_date=payload.expiry_date,
+    ).returning(Insurance_Policy)
+    insurance_policy = (await db.scalars(stmt)).one()
+    await db.commit()
+    return insurance_policy
+
+#GET all insurance policies
+@router.get("/get-insurance-policies", response_model=list[InsurancePolicyRead], status_code=status.HTTP_200_OK)
+async def get_insurance_policies(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    db: AsyncSession = Depends(get_async_db),
+):
+    result = await db.execute(paginate(row_select(Insurance_Policy), POLICY_PAGE_KEY, cursor, limit, descending=True))
+    rows, next_cursor = page(result.all(), POLICY_PAGE_KEY, limit)
+    set_next_cursor(response, next_cursor)
+    return json_response(list[InsurancePolicyRead], rows, response)
+
+#GET insurance policy by owner ID
+@router.get("/get-insurance-policy-by-owner/{owner_id}", response_model=list[InsurancePolicyRead], status_code=status.HTTP_200_OK)
+async def get_insurance_policy_by_owner(
+    owner_id: int,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    db: AsyncSession = Depends(get_async_db),
+):
+    result = await db.execute(paginate(row_select(Insurance_Policy).where(Insurance_Policy.owner_id == owner_id), POLICY_PAGE_KEY, cursor, limit, descending=True))
+    rows, next_cursor = page(result.all(), POLICY_PAGE_KEY, limit)
+    set_next_cursor(response, next_cursor)
+    return json_response(list[InsurancePolicyRead], rows, response)
@@ -1,5 +1,5 @@
 #backend/insurance_service/schemas/insurance.py
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from datetime import datetime
 from typing import Optional
 
@@ -24,8 +24,7 @@ class InsurancePolicyRead(BaseModel):
     expiry_date: Optional[datetime]
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class InsurancePolicyUpdate(BaseModel):
     insurance_type: Optional[str] = None
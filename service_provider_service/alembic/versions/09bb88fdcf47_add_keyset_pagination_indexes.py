@@ -0,0 +1,28 @@
+"""Add keyset pagination indexes
+
+Revision ID: 09bb88fdcf47
+Revises: 
+Create Date: 2026-10-18 14:03:30.171876
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '09bb88fdcf47'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_providers_category_id_id', 'providers', ['category_id', 'id'], unique=False, schema='service_providers')
+    op.create_index('ix_services_category_id_id', 'services', ['category_id', 'id'], unique=False, schema='service_providers')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_services_category_id_id', table_name='services', schema='service_providers')
+    op.drop_index('ix_providers_category_id_id', table_name='providers', schema='service_providers')
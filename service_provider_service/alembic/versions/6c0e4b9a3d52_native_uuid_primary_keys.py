@@ -0,0 +1,62 @@
+"""Native uuid primary keys
+
+Revision ID: 6c0e4b9a3d52
+Revises: 09bb88fdcf47
+Create Date: 2026-10-18 20:06:38.215064
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6c0e4b9a3d52'
+down_revision: Union[str, None] = '09bb88fdcf47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SCHEMA = 'service_providers'
+
+# Existing ids are uuid4 text and convert in place; new rows get time-ordered uuid7 keys.
+# (table, column) pairs, referenced keys before the columns that point at them.
+COLUMNS = [
+    ('providers', 'id'),
+    ('services', 'id'),
+    ('service_templates', 'id'),
+    ('provider_services', 'id'),
+    ('service_template_items', 'id'),
+    ('provider_services', 'provider_id'),
+    ('provider_services', 'service_id'),
+    ('service_templates', 'provider_id'),
+    ('service_template_items', 'template_id'),
+    ('service_template_items', 'service_id'),
+]
+
+# Foreign keys must go while both ends change type
+FOREIGN_KEYS = [
+    ('provider_services_provider_id_fkey', 'provider_services', 'providers', 'provider_id'),
+    ('provider_services_service_id_fkey', 'provider_services', 'services', 'service_id'),
+    ('service_templates_provider_id_fkey', 'service_templates', 'providers', 'provider_id'),
+    ('service_template_items_template_id_fkey', 'service_template_items', 'service_templates', 'template_id'),
+    ('service_template_items_service_id_fkey', 'service_template_items', 'services', 'service_id'),
+]
+
+
+def _retype(type_, existing_type, using):
+    for name, table, _, _ in FOREIGN_KEYS:
+        op.drop_constraint(name, table, type_='foreignkey', schema=SCHEMA)
+    for table, column in COLUMNS:
+        op.alter_column(table, column, type_=type_, existing_type=existing_type,
+                        postgresql_using=f'{column}::{using}', schema=SCHEMA)
+    for name, table, referred, column in FOREIGN_KEYS:
+        op.create_foreign_key(name, table, referred, [column], ['id'], source_schema=SCHEMA, referent_schema=SCHEMA)
+
+
+def upgrade() -> None:
+    _retype(sa.Uuid(), sa.String(), 'uuid')
+
+
+def downgrade() -> None:
+    _retype(sa.String(), sa.Uuid(), 'text')
@@ -0,0 +1,130 @@
+# core/query_stats.py
+# Per-request SQL statement count and DB time, with an N+1 detector and a query budget guard.
+import contextvars
+import logging
+import time
+from collections import Counter
+
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+_current = contextvars.ContextVar("query_stats", default=None)
+
+
+class QueryBudgetExceeded(RuntimeError):
+    pass
+
+
+def parse_route_budgets(raw: str) -> dict:
+    """``"GET /bookings/{booking_id}=2, POST /bookings/=4"`` -> ``{"GET /bookings/{booking_id}": 2, ...}``."""
+    budgets = {}
+    for item in raw.split(","):
+        if item.strip():
+            route, _, n = item.rpartition("=")
+            budgets[" ".join(route.split())] = int(n)
+    return budgets
+
+
+class QueryStats:
+    __slots__ = ("count", "seconds", "statements", "budget", "route_budgets", "scope", "_started")
+
+    def __init__(self, budget: int = 0, scope=None, route_budgets=None):
+        self.count = 0
+        self.seconds = 0.0
+        self.statements = Counter()
+        self.budget = budget
+        self.route_budgets = route_budgets
+        self.scope = scope
+        self._started = None
+
+    def limit(self) -> int:
+        """The budget of the matched route if it has one, else the global budget (0 = none)."""
+        if self.route_budgets:
+            return self.route_budgets.get(current_route(self), self.budget)
+        return self.budget
+
+
+def current_route(stats=None) -> str:
+    """"METHOD /route/template" of the request issuing the current statement, if any."""
+    stats = stats if stats is not None else _current.get()
+    if stats is None or stats.scope is None:
+        return "-"
+    route = stats.scope.get("route")
+    return f"{stats.scope['method']} {getattr(route, 'path', stats.scope['path'])}"
+
+
+def instrument_queries(engine):
+    """Attach statement counting to ``engine`` (pass ``async_engine.sync_engine`` for async)."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        stats = _current.get()
+        if stats is None:
+            return
+        stats.count += 1
+        stats.statements[statement] += 1
+        limit = stats.limit()
+        if limit and stats.count > limit:
+            raise QueryBudgetExceeded(
+                f"query budget of {limit} exceeded on {current_route(stats)}; "
+                f"statement #{stats.count}: {statement[:200]}"
+            )
+        stats._started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        stats = _current.get()
+        if stats is not None and stats._started is not None:
+            stats.seconds += time.perf_counter() - stats._started
+            stats._started = None
+
+
+class QueryStatsMiddleware:
+    """Tracks statements per request.
+
+    debug_headers: add X-DB-Query-Count / X-DB-Query-Ms to every response.
+    budget: fail any request issuing more than this many statements (0 = off; for tests).
+    route_budgets: per-route budgets, ``{"METHOD /route/template": n}``, overriding ``budget``;
+        an N+1 on a route that should take two statements fails at the third.
+    n_plus_one_threshold: warn when one statement repeats this often in a request.
+    """
+
+    def __init__(
+        self, app, debug_headers: bool = False, budget: int = 0, route_budgets=None, n_plus_one_threshold: int = 10
+    ):
+        self.app = app
+        self.debug_headers = debug_headers
+        self.budget = budget
+        self.route_budgets = route_budgets or None
+        self.n_plus_one_threshold = n_plus_one_threshold
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats(self.budget, scope, self.route_budgets)
+        token = _current.set(stats)
+
+        async def send_wrapper(message):
+            if self.debug_headers and message["type"] == "http.response.start":
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [
+                    (b"x-db-query-count", str(stats.count).encode()),
+                    (b"x-db-query-ms", f"{stats.seconds * 1000:.2f}".encode()),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            if self.n_plus_one_threshold:
+                route = getattr(scope.get("route"), "path", scope["path"])
+                for statement, n in stats.statements.items():
+                    if n >= self.n_plus_one_threshold:
+                        logger.warning(
+                            "possible N+1 on %s %s: statement ran %d times: %s",
+                            scope["method"], route, n, statement[:200],
+                        )
@@ -0,0 +1,53 @@
+# core/responses.py
+# Fast JSON for responses.
+#
+# By default FastAPI validates a route's return value against response_model, turns the
+# result into plain dicts and json.dumps them, all in Python. For list endpoints returning
+# hundreds of ORM rows that is most of the request's CPU time. json_response() runs
+# validation and encoding inside pydantic-core with a TypeAdapter built once per type;
+# ORJSONResponse is the default response class for every other route.
+from functools import lru_cache
+
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy.engine import Row
+from starlette.responses import Response
+
+__all__ = ["ORJSONResponse", "adapter", "json_body", "json_response", "raw_json_response"]
+
+
+@lru_cache(maxsize=None)
+def adapter(tp) -> TypeAdapter:
+    """The compiled validator + serializer for ``tp`` (e.g. ``List[BookingOut]``)."""
+    return TypeAdapter(tp)
+
+
+def json_body(tp, content) -> bytes:
+    """``content`` (ORM objects, Rows or dicts) validated as ``tp`` and encoded to JSON."""
+    ta = adapter(tp)
+    if isinstance(content, list) and content and isinstance(content[0], Row):
+        # Core rows validate faster as mappings: attribute access on a Row is a Python-level lookup
+        content = [row._mapping for row in content]
+    return ta.dump_json(ta.validate_python(content, from_attributes=True), by_alias=True)
+
+
+def raw_json_response(body: bytes, response: Response = None, status_code: int = 200) -> Response:
+    """A JSON Response for an already encoded ``body``, carrying ``response``'s headers."""
+    out = Response(
+        body,
+        status_code=(response.status_code if response is not None and response.status_code else status_code),
+        media_type="application/json",
+    )
+    if response is not None:
+        out.raw_headers.extend(response.raw_headers)
+    return out
+
+
+def json_response(tp, content, response: Response = None, status_code: int = 200) -> Response:
+    """Serialize ``content`` (ORM objects or dicts) as ``tp`` straight to JSON bytes.
+
+    Returning a Response skips FastAPI's own response_model pass, so the route keeps
+    response_model for the OpenAPI schema only. Headers and status set on the injected
+    ``response`` (e.g. X-Next-Cursor) are carried over.
+    """
+    return raw_json_response(json_body(tp, content), response, status_code)
@@ -0,0 +1,42 @@
+# Async twins of crud/category.py, used when DB_ASYNC is enabled.
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.provider import ProviderCategory, ServiceCategory
+from typing import List
+from sqlalchemy.exc import IntegrityError
+
+# -----------------------
+# ProviderCategory CRUD
+# -----------------------
+async def create_provider_category(db: AsyncSession, name: str) -> ProviderCategory:
+    category = ProviderCategory(name=name)
+    db.add(category)
+    try:
+        await db.commit()
+        await db.refresh(category)
+        return category
+    except IntegrityError:
+        await db.rollback()
+        result = await db.execute(select(ProviderCategory).filter_by(name=name))
+        return result.scalars().first()
+
+
+async def list_provider_categories(db: AsyncSession) -> List[ProviderCategory]:
+    result = await db.execute(select(ProviderCategory))
+    return result.scalars().all()
+
+
+# -----------------------
+# ServiceCategory CRUD
+# -----------------------
+async def create_service_category(db: AsyncSession, name: str) -> ServiceCategory:
+    category = ServiceCategory(name=name)
+    db.add(category)
+    await db.commit()
+    await db.refresh(category)
+    return category
+
+
+async def list_service_categories(db: AsyncSession) -> List[ServiceCategory]:
+    result = await db.execute(select(ServiceCategory))
+    return result.scalars().all()
@@ -1,22 +1,28 @@
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import delete, insert, update
+from sqlalchemy.orm import Session, joinedload, noload, selectinload
 from app.models.provider import Provider, ServiceTemplate, ServiceTemplateItem, ProviderService
 from app.schemas.provider import ProviderCreate, ProviderUpdate, ServiceTemplateCreate
 from typing import List, Optional
 from uuid import UUID
 
+from app.core.pagination import DEFAULT_LIMIT, paginate, page
+
+# Keyset sort key for catalog listings
+PROVIDER_PAGE_KEY = (Provider.id,)
+
 
 def create_provider(db: Session, provider_in: ProviderCreate) -> Provider:
-    provider = Provider(
+    # INSERT ... RETURNING; a brand-new provider has no services to load
+    stmt = insert(Provider).values(
         name=provider_in.name,
         category_id=provider_in.category_id,
         description=provider_in.description,
         contact_info=provider_in.contact_info,
         location=provider_in.location,
         is_registered=provider_in.is_registered,
-    )
-    db.add(provider)
+    ).returning(Provider).options(noload(Provider.provider_services))
+    provider = db.scalars(stmt).one()
     db.commit()
-    db.refresh(provider)
     return provider
 
 
@@ -24,30 +30,46 @@ def get_provider(db: Session, provider_id: str) -> Optional[Provider]:
     return db.query(Provider).filter(Provider.id == provider_id).first()
 
 
-def list_providers(db: Session, category_id: Optional[int] = None, limit: int = 50, offset: int = 0):
-    q = db.query(Provider)
+def get_providers(db: Session, provider_ids: List[str]) -> List[Provider]:
+    # Batch lookup: one IN query for the providers, one selectin for their services
+    if not provider_ids:
+        return []
+    return db.query(Provider).options(
+        selectinload(Provider.provider_services).selectinload(ProviderService.service)
+    ).filter(Provider.id.in_(provider_ids)).all()
+
+
+def list_providers(db: Session, category_id: Optional[int] = None, limit: int = DEFAULT_LIMIT, cursor: Optional[str] = None):
+    # Provider responses nest provider_services -> service; load both up front instead of per row
+    q = db.query(Provider).options(
+        selectinload(Provider.provider_services).selectinload(ProviderService.service)
+    )
     if category_id:
         q = q.filter(Provider.category_id == category_id)
-    return q.offset(offset).limit(limit).all()
+    return page(paginate(q, PROVIDER_PAGE_KEY, cursor, limit).all(), PROVIDER_PAGE_KEY, limit)
 
 
 def delete_provider(db: Session, provider_id: str):
-    p = db.query(Provider).filter(Provider.id == provider_id).first()
-    if not p:
-        return False
-    db.delete(p)
+    # Detach attached services the way the ORM cascade did, then delete in the same transaction
+    db.execute(update(ProviderService).where(ProviderService.provider_id == provider_id).values(provider_id=None))
+    deleted = db.execute(delete(Provider).where(Provider.id == provider_id).returning(Provider.id)).first()
     db.commit()
-    return True
+    return deleted is not None
 
 
 def update_provider(db: Session, provider_id: str, updates: ProviderUpdate):
-    p = db.query(Provider).filter(Provider.id == provider_id).first()
-    if not p:
-        return None
-    for k, v in updates.dict(exclude_unset=True).items():
-        setattr(p, k, v)
+    changes = updates.dict(exclude_unset=True)
+    if not changes:
+        return get_provider(db, provider_id)
+    stmt = (
+        update(Provider)
+        .where(Provider.id == provider_id)
+        .values(**changes)
+        .returning(Provider)
+        .options(selectinload(Provider.provider_services).selectinload(ProviderService.service))
+    )
+    p = db.scalars(stmt).first()
     db.commit()
-    db.refresh(p)
     return p
 
 def create_service_template(db: Session, payload: ServiceTemplateCreate):
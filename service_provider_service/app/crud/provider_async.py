@@ -0,0 +1,115 @@
+# Async twins of crud/provider.py, used when DB_ASYNC is enabled.
+# Relationships are loaded eagerly (selectinload): lazy loads are not possible on an AsyncSession.
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import noload, selectinload
+from app.models.provider import Provider, ServiceTemplate, ServiceTemplateItem, ProviderService
+from app.schemas.provider import ProviderCreate, ProviderUpdate, ServiceTemplateCreate
+from typing import List, Optional
+
+from app.core.pagination import DEFAULT_LIMIT, paginate, page
+
+# Provider responses nest provider_services -> service
+PROVIDER_LOAD = selectinload(Provider.provider_services).selectinload(ProviderService.service)
+PROVIDER_PAGE_KEY = (Provider.id,)
+
+
+async def create_provider(db: AsyncSession, provider_in: ProviderCreate) -> Provider:
+    stmt = insert(Provider).values(
+        name=provider_in.name,
+        category_id=provider_in.category_id,
+        description=provider_in.description,
+        contact_info=provider_in.contact_info,
+        location=provider_in.location,
+        is_registered=provider_in.is_registered,
+    ).returning(Provider).options(noload(Provider.provider_services))
+    provider = (await db.scalars(stmt)).one()
+    await db.commit()
+    return provider
+
+
+async def get_provider(db: AsyncSession, provider_id: str) -> Optional[Provider]:
+    result = await db.execute(
+        select(Provider)
+        .where(Provider.id == provider_id)
+        .options(PROVIDER_LOAD)
+        .execution_options(populate_existing=True)
+    )
+    return result.scalars().first()
+
+
+async def get_providers(db: AsyncSession, provider_ids: List[str]) -> List[Provider]:
+    if not provider_ids:
+        return []
+    result = await db.execute(select(Provider).where(Provider.id.in_(provider_ids)).options(PROVIDER_LOAD))
+    return result.scalars().all()
+
+
+async def list_providers(db: AsyncSession, category_id: Optional[int] = None, limit: int = DEFAULT_LIMIT, cursor: Optional[str] = None):
+    q = select(Provider).options(PROVIDER_LOAD)
+    if category_id:
+        q = q.where(Provider.category_id == category_id)
+    result = await db.execute(paginate(q, PROVIDER_PAGE_KEY, cursor, limit))
+    return page(result.scalars().all(), PROVIDER_PAGE_KEY, limit)
+
+
+async def delete_provider(db: AsyncSession, provider_id: str):
+    await db.execute(update(ProviderService).where(ProviderService.provider_id == provider_id).values(provider_id=None))
+    result = await db.execute(delete(Provider).where(Provider.id == provider_id).returning(Provider.id))
+    deleted = result.first()
+    await db.commit()
+    return deleted is not None
+
+
+async def update_provider(db: AsyncSession, provider_id: str, updates: ProviderUpdate):
+    changes = updates.dict(exclude_unset=True)
+    if not changes:
+        return await get_provider(db, provider_id)
+    stmt = update(Provider).where(Provider.id == provider_id).values(**changes).returning(Provider).options(PROVIDER_LOAD)
+    p = (await db.scalars(stmt)).first()
+    await db.commit()
+    return p
+
+
+async def get_service_template(db: AsyncSession, template_id: str) -> Optional[ServiceTemplate]:
+    result = await db.execute(
+        select(ServiceTemplate)
+        .where(ServiceTemplate.id == template_id)
+        .options(selectinload(ServiceTemplate.items))
+        .execution_options(populate_existing=True)
+    )
+    return result.scalars().first()
+
+
+async def create_service_template(db: AsyncSession, payload: ServiceTemplateCreate):
+    # Create template
+    template = ServiceTemplate(
+        provider_id=payload.provider_id,
+        name=payload.name,
+    )
+    db.add(template)
+    await db.flush()  # ensures template.id is available before inserting items
+
+    # Create items
+    items = [ServiceTemplateItem(template_id=template.id, service_id=item.service_id) for item in payload.items]
+    db.add_all(items)
+    await db.commit()
+    return await get_service_template(db, template.id)
+
+
+async def get_service_templates_by_provider(db: AsyncSession, provider_id: str):
+    result = await db.execute(
+        select(ServiceTemplate)
+        .where(ServiceTemplate.provider_id == provider_id)
+        .options(selectinload(ServiceTemplate.items))
+    )
+    return result.scalars().all()
+
+async def get_providers_by_service(db: AsyncSession, service_id: str):
+    result = await db.execute(
+        select(Provider)
+        .join(Provider.provider_services)  # inner join
+        .where(ProviderService.service_id == service_id)
+        .options(PROVIDER_LOAD)
+    )
+    return result.scalars().unique().all()
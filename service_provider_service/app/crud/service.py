@@ -1,9 +1,14 @@
+from sqlalchemy import delete, insert, update
 from sqlalchemy.orm import Session
 from app.models.provider import Service, ProviderService
 from app.schemas.provider import ServiceCreate, ServiceUpdate
 from typing import Optional, List, Dict
 from uuid import UUID
 
+from app.core.pagination import DEFAULT_LIMIT, paginate, page
+
+SERVICE_PAGE_KEY = (Service.id,)
+
 
 
 def create_service(db: Session, service_in: ServiceCreate) -> Service:
@@ -18,15 +23,14 @@ def create_service(db: Session, service_in: ServiceCreate) -> Service:
             ]
         }
 
-    service = Service(
+    stmt = insert(Service).values(
         category_id=service_in.category_id,
         name=service_in.name,
         description=service_in.description,
         requirements=req
-    )
-    db.add(service)
+    ).returning(Service)
+    service = db.scalars(stmt).one()
     db.commit()
-    db.refresh(service)
     return service
 
 
@@ -34,18 +38,21 @@ def get_service(db: Session, service_id: str) -> Optional[Service]:
     return db.query(Service).filter(Service.id == service_id).first()
 
 
-def list_services(db: Session, category_id: Optional[int] = None, limit: int = 50, offset: int = 0):
+def get_services(db: Session, service_ids: List[str]) -> List[Service]:
+    # Batch lookup: one IN query, in no particular order
+    if not service_ids:
+        return []
+    return db.query(Service).filter(Service.id.in_(service_ids)).all()
+
+
+def list_services(db: Session, category_id: Optional[int] = None, limit: int = DEFAULT_LIMIT, cursor: Optional[str] = None):
     q = db.query(Service)
     if category_id:
         q = q.filter(Service.category_id == category_id)
-    return q.offset(offset).limit(limit).all()
+    return page(paginate(q, SERVICE_PAGE_KEY, cursor, limit).all(), SERVICE_PAGE_KEY, limit)
 
 
 def update_service(db: Session, service_id: str, updates: ServiceUpdate):
-    s = db.query(Service).filter(Service.id == service_id).first()
-    if not s:
-        return None
-
     update_data = updates.dict(exclude_unset=True)
 
     if "requirements" in update_data and update_data["requirements"] is not None:
@@ -59,21 +66,19 @@ def update_service(db: Session, service_id: str, updates: ServiceUpdate):
             }
         update_data["requirements"] = req
 
-    for k, v in update_data.items():
-        setattr(s, k, v)
+    if not update_data:
+        return get_service(db, service_id)
 
+    s = db.scalars(update(Service).where(Service.id == service_id).values(**update_data).returning(Service)).first()
     db.commit()
-    db.refresh(s)
     return s
 
 
 def delete_service(db: Session, service_id: str) -> bool:
-    s = db.query(Service).filter(Service.id == service_id).first()
-    if not s:
-        return False
-    db.delete(s)
+    db.execute(update(ProviderService).where(ProviderService.service_id == service_id).values(service_id=None))
+    deleted = db.execute(delete(Service).where(Service.id == service_id).returning(Service.id)).first()
     db.commit()
-    return True
+    return deleted is not None
 
 def create_provider_service(db: Session, provider_id: str, payload: Dict) -> ProviderService:
     ps = ProviderService(
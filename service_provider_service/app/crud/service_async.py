@@ -0,0 +1,126 @@
+# Async twins of crud/service.py, used when DB_ASYNC is enabled.
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from app.models.provider import Service, ProviderService
+from app.schemas.provider import ServiceCreate, ServiceUpdate
+from typing import Optional, List, Dict
+
+from app.core.pagination import DEFAULT_LIMIT, paginate, page
+
+SERVICE_PAGE_KEY = (Service.id,)
+
+
+def _normalize_requirements(req: Dict) -> Dict:
+    if "fields" not in req:
+        req = {
+            "fields": [
+                {"name": k, "type": "string", "label": str(v)}
+                for k, v in req.items()
+            ]
+        }
+    return req
+
+
+async def create_service(db: AsyncSession, service_in: ServiceCreate) -> Service:
+    # ensure it's always a dict
+    req = service_in.requirements.dict() if service_in.requirements else {}
+
+    stmt = insert(Service).values(
+        category_id=service_in.category_id,
+        name=service_in.name,
+        description=service_in.description,
+        requirements=_normalize_requirements(req)
+    ).returning(Service)
+    service = (await db.scalars(stmt)).one()
+    await db.commit()
+    return service
+
+
+async def get_service(db: AsyncSession, service_id: str) -> Optional[Service]:
+    return await db.get(Service, service_id)
+
+
+async def get_services(db: AsyncSession, service_ids: List[str]) -> List[Service]:
+    if not service_ids:
+        return []
+    return (await db.scalars(select(Service).where(Service.id.in_(service_ids)))).all()
+
+
+async def list_services(db: AsyncSession, category_id: Optional[int] = None, limit: int = DEFAULT_LIMIT, cursor: Optional[str] = None):
+    q = select(Service)
+    if category_id:
+        q = q.where(Service.category_id == category_id)
+    result = await db.execute(paginate(q, SERVICE_PAGE_KEY, cursor, limit))
+    return page(result.scalars().all(), SERVICE_PAGE_KEY, limit)
+
+
+async def update_service(db: AsyncSession, service_id: str, updates: ServiceUpdate):
+    update_data = updates.dict(exclude_unset=True)
+
+    if "requirements" in update_data and update_data["requirements"] is not None:
+        update_data["requirements"] = _normalize_requirements(update_data["requirements"])
+
+    if not update_data:
+        return await get_service(db, service_id)
+
+    s = (await db.scalars(update(Service).where(Service.id == service_id).values(**update_data).returning(Service))).first()
+    await db.commit()
+    return s
+
+
+async def delete_service(db: AsyncSession, service_id: str) -> bool:
+    await db.execute(update(ProviderService).where(ProviderService.service_id == service_id).values(service_id=None))
+    result = await db.execute(delete(Service).where(Service.id == service_id).returning(Service.id))
+    deleted = result.first()
+    await db.commit()
+    return deleted is not None
+
+
+async def _get_provider_service(db: AsyncSession, provider_id: str, service_id: str) -> Optional[ProviderService]:
+    # ProviderServiceAttach responses nest the service itself
+    result = await db.execute(
+        select(ProviderService)
+        .where(
+            ProviderService.provider_id == provider_id,
+            ProviderService.service_id == service_id,
+        )
+        .options(selectinload(ProviderService.service))
+        .execution_options(populate_existing=True)
+    )
+    return result.scalars().first()
+
+
+async def create_provider_service(db: AsyncSession, provider_id: str, payload: Dict) -> ProviderService:
+    ps = ProviderService(
+        provider_id=provider_id,
+        service_id=payload.get("service_id"),
+        price=payload.get("price"),
+        duration=payload.get("duration"),
+        booking_required=payload.get("booking_required", False),
+        metadata=payload.get("metadata") or {}
+    )
+    db.add(ps)
+    await db.commit()
+    return await _get_provider_service(db, provider_id, ps.service_id)
+
+async def get_provider_services(db: AsyncSession, provider_id: str) -> List[ProviderService]:
+    result = await db.execute(
+        select(ProviderService)
+        .where(ProviderService.provider_id == provider_id)
+        .options(selectinload(ProviderService.service))
+    )
+    return result.scalars().all()
+
+async def upsert_provider_service(db: AsyncSession, provider_id: str, payload: Dict):
+    # payload contains service_id and metadata, price etc.
+    existing = await _get_provider_service(db, provider_id, payload["service_id"])
+    if existing:
+        # update
+        for k in ["price", "duration", "booking_required", "metadata"]:
+            if k in payload:
+                setattr(existing, k, payload.get(k))
+        await db.commit()
+        return await _get_provider_service(db, provider_id, existing.service_id)
+    else:
+        return await create_provider_service(db, provider_id, payload)
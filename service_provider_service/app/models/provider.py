@@ -1,8 +1,8 @@
-from sqlalchemy import Column, Integer, String, Text, JSON, Numeric, TIMESTAMP, func, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, Text, JSON, Numeric, TIMESTAMP, func, ForeignKey, Boolean, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
-import uuid
 from app.core.db import Base
+from app.core.ids import UUIDKey, new_id
 from sqlalchemy.sql import expression
 from app.core.db import Base
 from sqlalchemy.sql import expression
@@ -28,9 +28,13 @@ class ServiceCategory(Base):
 
 class Provider(Base):
     __tablename__ = "providers"
-    __table_args__ = {"schema": "service_providers"}
+    __table_args__ = (
+        # Keyset pagination: category-filtered catalog pages walk (category_id, id)
+        Index("ix_providers_category_id_id", "category_id", "id"),
+        {"schema": "service_providers"},
+    )
 
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(UUIDKey, primary_key=True, default=new_id)
     name = Column(String(255), nullable=False)
     category_id = Column(Integer, ForeignKey("service_providers.provider_categories.id"))
     description = Column(Text)
@@ -45,9 +49,12 @@ class Provider(Base):
 
 class Service(Base):
     __tablename__ = "services"
-    __table_args__ = {"schema": "service_providers"}
+    __table_args__ = (
+        Index("ix_services_category_id_id", "category_id", "id"),
+        {"schema": "service_providers"},
+    )
 
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(UUIDKey, primary_key=True, default=new_id)
     category_id = Column(Integer, ForeignKey("service_providers.service_categories.id"))
     name = Column(String(255), nullable=False)
     description = Column(Text)
@@ -61,9 +68,9 @@ class ProviderService(Base):
     __tablename__ = "provider_services"
     __table_args__ = {"schema": "service_providers"}
 
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    provider_id = Column(String, ForeignKey("service_providers.providers.id"))
-    service_id = Column(String, ForeignKey("service_providers.services.id"))
+    id = Column(UUIDKey, primary_key=True, default=new_id)
+    provider_id = Column(UUIDKey, ForeignKey("service_providers.providers.id"))
+    service_id = Column(UUIDKey, ForeignKey("service_providers.services.id"))
     display_name = Column(String(255), nullable=True)  # provider-specific alias
     price = Column(String(50))
     duration = Column(String(50))
@@ -78,8 +85,8 @@ class ServiceTemplate(Base):
     __tablename__ = "service_templates"
     __table_args__ = {"schema": "service_providers"}
 
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    provider_id = Column(String, ForeignKey("service_providers.providers.id"))
+    id = Column(UUIDKey, primary_key=True, default=new_id)
+    provider_id = Column(UUIDKey, ForeignKey("service_providers.providers.id"))
     name = Column(String(255), nullable=False)  # e.g., "Standard Oil Service"
 
     # Instead of raw JSON items, make it a relationship
@@ -90,9 +97,9 @@ class ServiceTemplateItem(Base):
     __tablename__ = "service_template_items"
     __table_args__ = {"schema": "service_providers"}
 
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    template_id = Column(String, ForeignKey("service_providers.service_templates.id"))
-    service_id = Column(String, ForeignKey("service_providers.services.id"))
+    id = Column(UUIDKey, primary_key=True, default=new_id)
+    template_id = Column(UUIDKey, ForeignKey("service_providers.service_templates.id"))
+    service_id = Column(UUIDKey, ForeignKey("service_providers.services.id"))
 
     template = relationship("ServiceTemplate", back_populates="items")
     service = relationship("Service")
@@ -1,9 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from uuid import UUID
 
+from app.core.config import CATALOG_CACHE_SECONDS, SINGLE_FLIGHT_TTL_SECONDS
 from app.core.db import get_db
+from app.core.batch import Batch, batch_body, batch_ids, lookup_keys, valid
+from app.core.etag import PUBLIC_REVALIDATE, ResponseCache, catalog_cache_control, conditional
+from app.core.ids import canonical_id
+from app.core.pagination import DEFAULT_LIMIT, MAX_LIMIT, set_next_cursor
+from app.core.responses import json_body, json_response, raw_json_response
+from app.core.singleflight import SingleFlight
 from app.schemas.provider import (
     ProviderCreate, Provider, ProviderUpdate, ProviderOut,
     Service as ServiceSchema,  # ✅ alias schema
@@ -21,27 +28,48 @@ from app.crud import category as crud_category
 
 router = APIRouter()
 
+# Catalog GETs (categories, services) reuse the rendered response for a short TTL;
+# catalog writes in this process drop it straight away
+catalog_cache = ResponseCache(CATALOG_CACHE_SECONDS)
+CATALOG_CACHE_CONTROL = catalog_cache_control(CATALOG_CACHE_SECONDS)
+
+# Concurrent requests for the same provider or service share one lookup and rendered body.
+# Provider bodies embed their services, so service writes clear every entry.
+flights = SingleFlight(SINGLE_FLIGHT_TTL_SECONDS)
+
 # -----------------------
 # Categories
 # -----------------------
 @router.post("/categories/provider-categories", response_model=ProviderCategory)
 def create_provider_category(payload: ProviderCategoryCreate, db: Session = Depends(get_db)):
-    return crud_category.create_provider_category(db, payload.name)
+    category = crud_category.create_provider_category(db, payload.name)
+    catalog_cache.invalidate()
+    return category
 
 
 @router.get("/categories/provider-categories", response_model=List[ProviderCategory])
-def list_provider_categories(db: Session = Depends(get_db)):
-    return crud_category.list_provider_categories(db)
+def list_provider_categories(request: Request, db: Session = Depends(get_db)):
+    cached = catalog_cache.get(request)
+    if cached is None:
+        rows = crud_category.list_provider_categories(db)
+        cached = catalog_cache.put(request, json_response(List[ProviderCategory], rows))
+    return cached.respond(request, CATALOG_CACHE_CONTROL)
 
 
 @router.post("/categories/service-categories", response_model=ServiceCategory)
 def create_service_category(payload: ServiceCategoryCreate, db: Session = Depends(get_db)):
-    return crud_category.create_service_category(db, payload.name)
+    category = crud_category.create_service_category(db, payload.name)
+    catalog_cache.invalidate()
+    return category
 
 
 @router.get("/categories/service-categories", response_model=List[ServiceCategory])
-def list_service_categories(db: Session = Depends(get_db)):
-    return crud_category.list_service_categories(db)
+def list_service_categories(request: Request, db: Session = Depends(get_db)):
+    cached = catalog_cache.get(request)
+    if cached is None:
+        rows = crud_category.list_service_categories(db)
+        cached = catalog_cache.put(request, json_response(List[ServiceCategory], rows))
+    return cached.respond(request, CATALOG_CACHE_CONTROL)
 
 
 # -----------------------
@@ -49,23 +77,48 @@ def list_service_categories(db: Session = Depends(get_db)):
 # -----------------------
 @router.post("/services", response_model=ServiceSchema)
 def create_service(payload: ServiceCreate, db: Session = Depends(get_db)):
-    return crud_service.create_service(db, payload)
+    service = crud_service.create_service(db, payload)
+    catalog_cache.invalidate()
+    return service
 
 
 @router.get("/services", response_model=List[ServiceSchema])
 def list_services(
+    request: Request,
+    response: Response,
     category_id: Optional[int] = Query(None),
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
     db: Session = Depends(get_db)
 ):
-    return crud_service.list_services(db=db, category_id=category_id)
+    cached = catalog_cache.get(request)
+    if cached is None:
+        rows, next_cursor = crud_service.list_services(db=db, category_id=category_id, limit=limit, cursor=cursor)
+        set_next_cursor(response, next_cursor)
+        cached = catalog_cache.put(request, json_response(List[ServiceSchema], rows, response))
+    return cached.respond(request, CATALOG_CACHE_CONTROL)
+
+
+# Batch lookups: ?ids=a,b,c in one IN query, in request order, misses listed
+@router.get("/services/batch", response_model=Batch[ServiceSchema])
+def get_services(request: Request, ids: List[str] = Depends(batch_ids), db: Session = Depends(get_db)):
+    keys = lookup_keys(ids, canonical_id)
+    rows = crud_service.get_services(db, valid(keys))
+    return conditional(request, raw_json_response(batch_body(ServiceSchema, keys, rows)), PUBLIC_REVALIDATE)
 
 
 @router.get("/services/{service_id}", response_model=ServiceSchema)
-def get_service(service_id: str, db: Session = Depends(get_db)):
-    s = crud_service.get_service(db, service_id)
-    if not s:
-        raise HTTPException(status_code=404, detail="Service not found")
-    return s
+def get_service(service_id: str, request: Request, db: Session = Depends(get_db)):
+    def load():
+        s = crud_service.get_service(db, service_id)
+        if not s:
+            raise HTTPException(status_code=404, detail="Service not found")
+        return catalog_cache.put(request, json_response(ServiceSchema, s))
+
+    cached = catalog_cache.get(request)
+    if cached is None:
+        cached = flights.do(("get_service", service_id), load)
+    return cached.respond(request, CATALOG_CACHE_CONTROL)
 
 
 @router.put("/services/{service_id}", response_model=ServiceSchema)
@@ -73,6 +126,8 @@ def update_service(service_id: str, updates: ServiceUpdate, db: Session = Depend
     s = crud_service.update_service(db, service_id, updates)
     if not s:
         raise HTTPException(status_code=404, detail="Service not found")
+    catalog_cache.invalidate()
+    flights.clear()
     return s
 
 
@@ -81,6 +136,8 @@ def delete_service(service_id: str, db: Session = Depends(get_db)):
     ok = crud_service.delete_service(db, service_id)
     if not ok:
         raise HTTPException(status_code=404, detail="Service not found")
+    catalog_cache.invalidate()
+    flights.clear()
     return {}
 
 
@@ -94,29 +151,43 @@ def create_provider(payload: ProviderCreate, db: Session = Depends(get_db)):
 
 @router.get("/", response_model=List[Provider])
 def list_providers(
+    response: Response,
     category_id: Optional[int] = Query(None),
-    limit: int = 50,
-    offset: int = 0,
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
     db: Session = Depends(get_db)
 ):
-    return crud_provider.list_providers(db=db, category_id=category_id, limit=limit, offset=offset)
+    rows, next_cursor = crud_provider.list_providers(db=db, category_id=category_id, limit=limit, cursor=cursor)
+    set_next_cursor(response, next_cursor)
+    return json_response(List[Provider], rows, response)
+
+
+@router.get("/batch", response_model=Batch[Provider])
+def get_providers(request: Request, ids: List[str] = Depends(batch_ids), db: Session = Depends(get_db)):
+    keys = lookup_keys(ids, canonical_id)
+    rows = crud_provider.get_providers(db, valid(keys))
+    return conditional(request, raw_json_response(batch_body(Provider, keys, rows)), PUBLIC_REVALIDATE)
 
 
 # -----------------------
 # Provider-specific routes (placed LAST to avoid collisions)
 # -----------------------
 @router.get("/{provider_id}", response_model=Provider)
-def get_provider(provider_id: str, db: Session = Depends(get_db)):
-    provider = crud_provider.get_provider(db, provider_id)
-    if not provider:
-        raise HTTPException(status_code=404, detail="Provider not found")
+def get_provider(provider_id: str, request: Request, db: Session = Depends(get_db)):
+    def load():
+        provider = crud_provider.get_provider(db, provider_id)
+        if not provider:
+            raise HTTPException(status_code=404, detail="Provider not found")
+
+        services = [ps.service for ps in provider.provider_services]
 
-    services = [ps.service for ps in provider.provider_services]
+        return json_body(Provider, {
+            **provider.__dict__,
+            "services": services  # ✅ explicit merge
+        })
 
-    return {
-        **provider.__dict__,
-        "services": services  # ✅ explicit merge
-    }
+    body = flights.do(("get_provider", provider_id), load)
+    return conditional(request, raw_json_response(body), PUBLIC_REVALIDATE)
 
 
 
@@ -125,6 +196,7 @@ def update_provider(provider_id: str, updates: ProviderUpdate, db: Session = Dep
     p = crud_provider.update_provider(db, provider_id, updates)
     if not p:
         raise HTTPException(status_code=404, detail="Provider not found")
+    flights.forget(("get_provider", provider_id))
     return p
 
 
@@ -133,6 +205,7 @@ def delete_provider(provider_id: str, db: Session = Depends(get_db)):
     ok = crud_provider.delete_provider(db, provider_id)
     if not ok:
         raise HTTPException(status_code=404, detail="Provider not found")
+    flights.forget(("get_provider", provider_id))
     return {}
 
 
@@ -142,7 +215,8 @@ def get_provider_services(provider_id: str, db: Session = Depends(get_db)):
     if not provider:
         raise HTTPException(status_code=404, detail="Provider not found")
 
-    return provider.provider_services  # includes both provider-specific fields + service
+    # includes both provider-specific fields + service
+    return json_response(List[ProviderServiceAttach], provider.provider_services)
 
 
 
@@ -169,6 +243,7 @@ def attach_services_to_provider(
         ps = crud_service.upsert_provider_service(db, provider_id, payload)
         created_or_updated.append(ps)
 
+    flights.forget(("get_provider", provider_id))
     return created_or_updated
 
 # -----------------------
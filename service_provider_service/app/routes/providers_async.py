@@ -0,0 +1,278 @@
+# Same routes as routes/providers.py, served from the AsyncEngine (DB_ASYNC=true).
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+
+from app.core.config import CATALOG_CACHE_SECONDS, SINGLE_FLIGHT_TTL_SECONDS
+from app.core.db import get_async_db
+from app.core.batch import Batch, batch_body, batch_ids, lookup_keys, valid
+from app.core.etag import PUBLIC_REVALIDATE, ResponseCache, catalog_cache_control, conditional
+from app.core.ids import canonical_id
+from app.core.pagination import DEFAULT_LIMIT, MAX_LIMIT, set_next_cursor
+from app.core.responses import json_body, json_response, raw_json_response
+from app.core.singleflight import SingleFlight
+from app.schemas.provider import (
+    ProviderCreate, Provider, ProviderUpdate,
+    Service as ServiceSchema,  # ✅ alias schema
+    ServiceCreate, ServiceUpdate,
+    ProviderServiceAttach, ProviderServiceCreate, ServiceTemplateCreate, ServiceTemplateRead
+)
+from app.schemas.category import (
+    ProviderCategory, ProviderCategoryCreate,
+    ServiceCategory, ServiceCategoryCreate,
+)
+from app.crud import provider_async as crud_provider
+from app.crud import service_async as crud_service
+from app.crud import category_async as crud_category
+
+router = APIRouter()
+
+# Catalog GETs (categories, services) reuse the rendered response for a short TTL;
+# catalog writes in this process drop it straight away
+catalog_cache = ResponseCache(CATALOG_CACHE_SECONDS)
+CATALOG_CACHE_CONTROL = catalog_cache_control(CATALOG_CACHE_SECONDS)
+
+# Concurrent requests for the same provider or service share one lookup and rendered body.
+# Provider bodies embed their services, so service writes clear every entry.
+flights = SingleFlight(SINGLE_FLIGHT_TTL_SECONDS)
+
+# -----------------------
+# Categories
+# -----------------------
+@router.post("/categories/provider-categories", response_model=ProviderCategory)
+async def create_provider_category(payload: ProviderCategoryCreate, db: AsyncSession = Depends(get_async_db)):
+    category = await crud_category.create_provider_category(db, payload.name)
+    catalog_cache.invalidate()
+    return category
+
+
+@router.get("/categories/provider-categories", response_model=List[ProviderCategory])
+async def list_provider_categories(request: Request, db: AsyncSession = Depends(get_async_db)):
+    cached = catalog_cache.get(request)
+    if cached is None:
+        rows = await crud_category.list_provider_categories(db)
+        cached = catalog_cache.put(request, json_response(List[ProviderCategory], rows))
+    return cached.respond(request, CATALOG_CACHE_CONTROL)
+
+
+@router.post("/categories/service-categories", response_model=ServiceCategory)
+async def create_service_category(payload: ServiceCategoryCreate, db: AsyncSession = Depends(get_async_db)):
+    category = await crud_category.create_service_category(db, payload.name)
+    catalog_cache.invalidate()
+    return category
+
+
+@router.get("/categories/service-categories", response_model=List[ServiceCategory])
+async def list_service_categories(request: Request, db: AsyncSession = Depends(get_async_db)):
+    cached = catalog_cache.get(request)
+    if cached is None:
+        rows = await crud_category.list_service_categories(db)
+        cached = catalog_cache.put(request, json_response(List[ServiceCategory], rows))
+    return cached.respond(request, CATALOG_CACHE_CONTROL)
+
+
+# -----------------------
+# Global Services
+# -----------------------
+@router.post("/services", response_model=ServiceSchema)
+async def create_service(payload: ServiceCreate, db: AsyncSession = Depends(get_async_db)):
+    service = await crud_service.create_service(db, payload)
+    catalog_cache.invalidate()
+    return service
+
+
+@router.get("/services", response_model=List[ServiceSchema])
+async def list_services(
+    request: Request,
+    response: Response,
+    category_id: Optional[int] = Query(None),
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    db: AsyncSession = Depends(get_async_db)
+):
+    cached = catalog_cache.get(request)
+    if cached is None:
+        rows, next_cursor = await crud_service.list_services(db=db, category_id=category_id, limit=limit, cursor=cursor)
+        set_next_cursor(response, next_cursor)
+        cached = catalog_cache.put(request, json_response(List[ServiceSchema], rows, response))
+    return cached.respond(request, CATALOG_CACHE_CONTROL)
+
+
+# Batch lookups: ?ids=a,b,c in one IN query, in request order, misses listed
+@router.get("/services/batch", response_model=Batch[ServiceSchema])
+async def get_services(request: Request, ids: List[str] = Depends(batch_ids), db: AsyncSession = Depends(get_async_db)):
+    keys = lookup_keys(ids, canonical_id)
+    rows = await crud_service.get_services(db, valid(keys))
+    return conditional(request, raw_json_response(batch_body(ServiceSchema, keys, rows)), PUBLIC_REVALIDATE)
+
+
+@router.get("/services/{service_id}", response_model=ServiceSchema)
+async def get_service(service_id: str, request: Request, db: AsyncSession = Depends(get_async_db)):
+    async def load():
+        s = await crud_service.get_service(db, service_id)
+        if not s:
+            raise HTTPException(status_code=404, detail="Service not found")
+        return catalog_cache.put(request, json_response(ServiceSchema, s))
+
+    cached = catalog_cache.get(request)
+    if cached is None:
+        cached = await flights.do_async(("get_service", service_id), load)
+    return cached.respond(request, CATALOG_CACHE_CONTROL)
+
+
+@router.put("/services/{service_id}", response_model=ServiceSchema)
+async def update_service(service_id: str, updates: ServiceUpdate, db: AsyncSession = Depends(get_async_db)):
+    s = await crud_service.update_service(db, service_id, updates)
+    if not s:
+        raise HTTPException(status_code=404, detail="Service not found")
+    catalog_cache.invalidate()
+    flights.clear()
+    return s
+
+
+@router.delete("/services/{service_id}", status_code=204)
+async def delete_service(service_id: str, db: AsyncSession = Depends(get_async_db)):
+    ok = await crud_service.delete_service(db, service_id)
+    if not ok:
+        raise HTTPException(status_code=404, detail="Service not found")
+    catalog_cache.invalidate()
+    flights.clear()
+    return {}
+
+
+# -----------------------
+# Providers
+# -----------------------
+@router.post("/", response_model=Provider)
+async def create_provider(payload: ProviderCreate, db: AsyncSession = Depends(get_async_db)):
+    return await crud_provider.create_provider(db, payload)
+
+
+@router.get("/", response_model=List[Provider])
+async def list_providers(
+    response: Response,
+    category_id: Optional[int] = Query(None),
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    db: AsyncSession = Depends(get_async_db)
+):
+    rows, next_cursor = await crud_provider.list_providers(db=db, category_id=category_id, limit=limit, cursor=cursor)
+    set_next_cursor(response, next_cursor)
+    return json_response(List[Provider], rows, response)
+
+
+@router.get("/batch", response_model=Batch[Provider])
+async def get_providers(request: Request, ids: List[str] = Depends(batch_ids), db: AsyncSession = Depends(get_async_db)):
+    keys = lookup_keys(ids, canonical_id)
+    rows = await crud_provider.get_providers(db, valid(keys))
+    return conditional(request, raw_json_response(batch_body(Provider, keys, rows)), PUBLIC_REVALIDATE)
+
+
+# -----------------------
+# Provider-specific routes (placed LAST to avoid collisions)
+# -----------------------
+@router.get("/{provider_id}", response_model=Provider)
+async def get_provider(provider_id: str, request: Request, db: AsyncSession = Depends(get_async_db)):
+    async def load():
+        provider = await crud_provider.get_provider(db, provider_id)
+        if not provider:
+            raise HTTPException(status_code=404, detail="Provider not found")
+
+        services = [ps.service for ps in provider.provider_services]
+
+        return json_body(Provider, {
+            **provider.__dict__,
+            "services": services  # ✅ explicit merge
+        })
+
+    body = await flights.do_async(("get_provider", provider_id), load)
+    return conditional(request, raw_json_response(body), PUBLIC_REVALIDATE)
+
+
+@router.put("/{provider_id}", response_model=Provider)
+async def update_provider(provider_id: str, updates: ProviderUpdate, db: AsyncSession = Depends(get_async_db)):
+    p = await crud_provider.update_provider(db, provider_id, updates)
+    if not p:
+        raise HTTPException(status_code=404, detail="Provider not found")
+    flights.forget(("get_provider", provider_id))
+    return p
+
+
+@router.delete("/{provider_id}", status_code=204)
+async def delete_provider(provider_id: str, db: AsyncSession = Depends(get_async_db)):
+    ok = await crud_provider.delete_provider(db, provider_id)
+    if not ok:
+        raise HTTPException(status_code=404, detail="Provider not found")
+    flights.forget(("get_provider", provider_id))
+    return {}
+
+
+@router.get("/{provider_id}/services", response_model=List[ProviderServiceAttach])
+async def get_provider_services(provider_id: str, db: AsyncSession = Depends(get_async_db)):
+    provider = await crud_provider.get_provider(db, provider_id)
+    if not provider:
+        raise HTTPException(status_code=404, detail="Provider not found")
+
+    # includes both provider-specific fields + service
+    return json_response(List[ProviderServiceAttach], provider.provider_services)
+
+
+@router.post("/{provider_id}/services", response_model=List[ProviderServiceAttach])
+async def attach_services_to_provider(
+    provider_id: str,
+    services: List[ProviderServiceCreate],   # <-- INPUT
+    db: AsyncSession = Depends(get_async_db)
+):
+    provider = await crud_provider.get_provider(db, provider_id)
+    if not provider:
+        raise HTTPException(status_code=404, detail="Provider not found")
+
+    created_or_updated = []
+    for s in services:
+        payload = {
+            "service_id": s.service_id,
+            "display_name": s.display_name,
+            "price": s.price,
+            "duration": s.duration,
+            "booking_required": s.booking_required,
+            "extra_data": s.extra_data or {}
+        }
+        ps = await crud_service.upsert_provider_service(db, provider_id, payload)
+        created_or_updated.append(ps)
+
+    flights.forget(("get_provider", provider_id))
+    return created_or_updated
+
+# -----------------------
+# Provider Templates
+# -----------------------
+
+@router.post("/{provider_id}/templates", response_model=ServiceTemplateRead)
+async def create_service_template_for_provider(
+    provider_id: str,
+    payload: ServiceTemplateCreate,
+    db: AsyncSession = Depends(get_async_db)
+):
+    # Ensure provider exists
+    provider = await crud_provider.get_provider(db, provider_id)
+    if not provider:
+        raise HTTPException(status_code=404, detail="Provider not found")
+
+    # Ensure provider consistency
+    if provider_id != payload.provider_id:
+        raise HTTPException(status_code=400, detail="Provider ID mismatch in payload")
+
+    return await crud_provider.create_service_template(db, payload)
+
+
+@router.get("/{provider_id}/templates", response_model=List[ServiceTemplateRead])
+async def list_service_templates_for_provider(
+    provider_id: str,
+    db: AsyncSession = Depends(get_async_db)
+):
+    # Ensure provider exists
+    provider = await crud_provider.get_provider(db, provider_id)
+    if not provider:
+        raise HTTPException(status_code=404, detail="Provider not found")
+
+    return await crud_provider.get_service_templates_by_provider(db, provider_id)
@@ -1,6 +1,6 @@
 
 # backend/service_provider_service/app/schemas/category.py
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import List
 
 
@@ -15,8 +15,7 @@ class ProviderCategoryCreate(ProviderCategoryBase):
 class ProviderCategory(ProviderCategoryBase):
     id: int
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class ServiceCategoryBase(BaseModel):
@@ -30,6 +29,5 @@ class ServiceCategoryCreate(ServiceCategoryBase):
 class ServiceCategory(ServiceCategoryBase):
     id: int
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
@@ -1,5 +1,5 @@
 #backend/service_provider_service/app/schemas/provider.py
-from pydantic import BaseModel
+from pydantic import AliasChoices, BaseModel, ConfigDict, Field
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 
@@ -34,8 +34,7 @@ class Service(ServiceBase):
     id: str
     created_at: Optional[datetime]
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 # -----------------------
 # Providers
@@ -67,9 +66,8 @@ class ProviderServiceCreate(BaseModel):
     price: Optional[str] = None
     duration: Optional[str] = None
     booking_required: Optional[bool] = False
-    extra_data: Optional[Dict[str, Any]] = None
-    class Config:
-        fields = {"extra_data": "metadata"}
+    # v1 read this field from "metadata"; both names are accepted
+    extra_data: Optional[Dict[str, Any]] = Field(None, validation_alias=AliasChoices("extra_data", "metadata"))
 
 # For response payload (output)        
 class ProviderServiceAttach(BaseModel):
@@ -84,9 +82,7 @@ class ProviderServiceAttach(BaseModel):
     # 🔹 include nested service details
     service: Optional[Service] = None   
 
-    class Config:
-        orm_mode = True   # ✅ important
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class ProviderOut(BaseModel):
     id: str
@@ -94,8 +90,7 @@ class ProviderOut(BaseModel):
     location: Optional[str] = None
     services: List[ProviderServiceAttach] = []
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class Provider(ProviderBase):
@@ -105,9 +100,7 @@ class Provider(ProviderBase):
     category_id: int
     provider_services: Optional[List[ProviderServiceAttach]] = []
 
-    class Config:
-        orm_mode = True   # ✅ important
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 # -----------------------
 # Templates for Providers
 # -----------------------
@@ -124,9 +117,7 @@ class ServiceTemplateItemCreate(ServiceTemplateItemBase):
 class ServiceTemplateItemRead(ServiceTemplateItemBase):
     id: str
 
-    class Config:
-        orm_mode = True
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # The template itself
@@ -144,7 +135,5 @@ class ServiceTemplateRead(ServiceTemplateBase):
     provider_id: str
     items: List[ServiceTemplateItemRead] = []  # ✅ expanded list of items
 
-    class Config:
-        orm_mode = True
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
@@ -0,0 +1,26 @@
+"""Add keyset pagination indexes
+
+Revision ID: 8032274314f4
+Revises: 3b1d7e5a9c02
+Create Date: 2026-10-18 11:45:05.229314
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8032274314f4'
+down_revision: Union[str, None] = '3b1d7e5a9c02'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_provider_user_links_user_id_id', 'provider_user_links', ['user_id', 'id'], unique=False, schema='users')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_provider_user_links_user_id_id', table_name='provider_user_links', schema='users')
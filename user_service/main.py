@@ -1,15 +1,81 @@
 # backend/user_service/main.py and user.py working perfectly for authentication apparently
+import os
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from routes import users as users_router
-from core.db import Base, engine
+from core.access_log import AccessLogMiddleware
+from core.admission import AdmissionControlMiddleware
+from core.db import Base, engine, async_engine, replica_engine, async_replica_engine, replicas, slow_queries
+from core.metrics import MetricsMiddleware, instrument_engine, router as metrics_router
+from core.query_stats import QueryStatsMiddleware, instrument_queries, parse_route_budgets
+from core.replica import ReplicaRoutingMiddleware
+from core.slow_queries import debug_router as slow_queries_router
+from core.responses import ORJSONResponse
+from core.startup import lifespan_for
+from core.config import (
+    DB_ASYNC, ACCESS_LOG_BODY_SAMPLE_RATE, ACCESS_LOG_BODY_MAX_BYTES,
+    DEBUG, QUERY_BUDGET, QUERY_ROUTE_BUDGETS, N_PLUS_ONE_THRESHOLD, SCHEMA_MODE, DB_WARMUP_CONNECTIONS,
+    ADMISSION_MAX_CONCURRENCY, ADMISSION_ROUTE_CONCURRENCY, ADMISSION_PRIORITY_CONCURRENCY,
+    ADMISSION_QUEUE, ADMISSION_QUEUE_WAIT_SECONDS, ADMISSION_RETRY_AFTER_SECONDS,
+)
+
+# DB_ASYNC=true serves the same routes from the AsyncEngine instead of the threadpool
+if DB_ASYNC:
+    from routes import users_async as users_router
+else:
+    from routes import users as users_router
+
+# Schema check and pool warm-up happen once at startup, not at import.
+# Tables are no longer created here: run `alembic upgrade head`, or SCHEMA_MODE=create_all in dev.
+# A database whose tables the old create_all made: `alembic stamp 3b1d7e5a9c02` first.
+app = FastAPI(
+    title="User Service",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan_for(
+        engine,
+        async_engine,
+        schema_mode=SCHEMA_MODE,
+        metadata=Base.metadata,
+        alembic_ini=os.path.join(os.path.dirname(__file__), "alembic.ini"),
+        warmup_connections=DB_WARMUP_CONNECTIONS,
+        background=(replicas, slow_queries),
+    ),
+)
+
+# --- Query stats (statement count/time per request, N+1 warnings) ---
+app.add_middleware(
+    QueryStatsMiddleware,
+    debug_headers=DEBUG,
+    budget=QUERY_BUDGET,
+    route_budgets=parse_route_budgets(QUERY_ROUTE_BUDGETS),
+    n_plus_one_threshold=N_PLUS_ONE_THRESHOLD,
+)
+instrument_queries(engine)
+if async_engine is not None:
+    instrument_queries(async_engine.sync_engine)
+if replica_engine is not None:
+    instrument_queries(replica_engine)
+if async_replica_engine is not None:
+    instrument_queries(async_replica_engine.sync_engine)
 
-# Create DB tables (use Alembic in prod instead of this)
-Base.metadata.create_all(bind=engine)
+# --- Read replica routing (GET reads from the replica unless the client just wrote) ---
+app.add_middleware(ReplicaRoutingMiddleware, router=replicas)
 
-app = FastAPI(title="User Service")
+# --- Admission control (503 + Retry-After instead of an ever-deeper queue under overload) ---
+app.add_middleware(
+    AdmissionControlMiddleware,
+    max_concurrency=ADMISSION_MAX_CONCURRENCY,
+    queue=ADMISSION_QUEUE,
+    max_wait=ADMISSION_QUEUE_WAIT_SECONDS,
+    route_concurrency=ADMISSION_ROUTE_CONCURRENCY,
+    priority_paths=("/", "/verify-code", "/metrics"),
+    priority_concurrency=ADMISSION_PRIORITY_CONCURRENCY,
+    retry_after=ADMISSION_RETRY_AFTER_SECONDS,
+)
 
 # Allow CORS (update allowed origins in prod!)
+# Added after admission control, so outside it: its 503s carry the CORS headers a browser
+# needs to read them
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -18,6 +84,30 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# --- Metrics (Prometheus text at /metrics) ---
+app.add_middleware(MetricsMiddleware)
+instrument_engine(engine)
+if async_engine is not None:
+    instrument_engine(async_engine.sync_engine, "async")
+if replica_engine is not None:
+    instrument_engine(replica_engine, "replica")
+if async_replica_engine is not None:
+    instrument_engine(async_replica_engine.sync_engine, "async_replica")
+app.include_router(metrics_router)
+# Raw SQL, parameter shapes and plans: only exposed alongside the X-DB-Query-* headers
+if DEBUG:
+    app.include_router(slow_queries_router(slow_queries))
+
+# --- Access log (streams bodies through, never buffers them) ---
+# Added last, so it is the outermost middleware: 503s from admission control and the time
+# requests spend queued show up in its status and duration
+app.add_middleware(
+    AccessLogMiddleware,
+    logger_name="user-service.access",
+    body_sample_rate=ACCESS_LOG_BODY_SAMPLE_RATE,
+    body_max_bytes=ACCESS_LOG_BODY_MAX_BYTES,
+)
+
 # Routes
 app.include_router(users_router.router, prefix="", tags=["users"])
 
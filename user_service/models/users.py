@@ -1,6 +1,6 @@
 # backend/user_service/models/users.py
 
-from sqlalchemy import Column, Integer, String, Text, JSON, Numeric, TIMESTAMP, func, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, Text, JSON, Numeric, TIMESTAMP, func, ForeignKey, Boolean, Index
 
 from datetime import datetime
 from core.db import Base
@@ -61,7 +61,11 @@ class User_Roles(Base):
 
 class ProviderUserLink(Base):
     __tablename__ = "provider_user_links"
-    __table_args__ = {"schema": "users"}  # or service_providers if you prefer
+    __table_args__ = (
+        # /all resolves each page's links by user_id, earliest id first
+        Index("ix_provider_user_links_user_id_id", "user_id", "id"),
+        {"schema": "users"},  # or service_providers if you prefer
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     user_id = Column(Integer, ForeignKey("users.tbl_auth.id"), nullable=False)
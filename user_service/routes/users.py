@@ -2,13 +2,19 @@
 import random
 from datetime import datetime, timedelta
 
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query, Response
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from fastapi_mail import FastMail, MessageSchema, MessageType
 from jose import jwt, JWTError
 
+from core.batch import Batch, batch_body, batch_ids, int_key, lookup_keys, valid
 from core.db import get_db
+from core.pagination import DEFAULT_LIMIT, MAX_LIMIT, paginate, page, set_next_cursor
+from core.reads import row_select
+from core.responses import json_response, raw_json_response
 from core.security import create_access_token
 from models.users import User, Roles, OTP, ProviderUserLink
 from schemas.users import (
@@ -20,16 +26,44 @@ from schemas.users import (
     UserRead,Role, GuestUserRequest
 )
 from core.config import DATABASE_URL, SECRET_KEY, ALGORITHM
-from mailconfig import conf
 
 router = APIRouter()
 
+# Keyset sort key for the admin user listing
+USER_PAGE_KEY = (User.id,)
+
 # --------------------------
 # Auth dependencies
 # --------------------------
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="users/verify-code")
 
 
+def provider_links(user_ids):
+    # one query for a set of users' links instead of one per user
+    return (
+        select(ProviderUserLink.user_id, ProviderUserLink.provider_id)
+        .where(ProviderUserLink.user_id.in_(user_ids))
+        .order_by(ProviderUserLink.id)
+    )
+
+
+def user_reads(users, links) -> list:
+    """UserRead dicts for ``users``, given the rows of provider_links(); earliest link wins."""
+    provider_ids = {}
+    for user_id, provider_id in links:
+        provider_ids.setdefault(user_id, provider_id)
+    return [
+        {
+            "id": user.id,
+            "email": user.email,
+            "name": user.name,
+            "phone": user.phone,
+            "provider_id": provider_ids.get(user.id),
+        }
+        for user in users
+    ]
+
+
 def generate_otp(length: int = 6) -> str:
     return "".join(str(random.randint(0, 9)) for _ in range(length))
 
@@ -54,6 +88,10 @@ def get_current_user(
 
 
 def send_email(email: EmailSchema, background_tasks: BackgroundTasks):
+    # fastapi_mail is slow to import and only needed when a code is actually sent
+    from fastapi_mail import FastMail, MessageSchema, MessageType
+    from mailconfig import conf
+
     message = MessageSchema(
         subject=email.subject,
         recipients=[email.email],
@@ -177,24 +215,26 @@ def read_users_me(current_user: User = Depends(get_current_user), db: Session =
 # Get all users (Admin only)
 # --------------------------
 @router.get("/all", response_model=list[UserRead])
-def get_all_users(db: Session = Depends(get_db)):
-    users = db.query(User).all()
-
-    result = []
-    for user in users:
-        provider_link = db.query(ProviderUserLink).filter(
-            ProviderUserLink.user_id == user.id
-        ).first()
-
-        result.append({
-            "id": user.id,
-            "email": user.email,
-            "name": user.name,
-            "phone": user.phone,
-            "provider_id": provider_link.provider_id if provider_link else None
-        })
+def get_all_users(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    db: Session = Depends(get_db),
+):
+    users, next_cursor = page(db.execute(paginate(row_select(User), USER_PAGE_KEY, cursor, limit)).all(), USER_PAGE_KEY, limit)
+    set_next_cursor(response, next_cursor)
+    links = db.execute(provider_links([u.id for u in users]))
+    return json_response(list[UserRead], user_reads(users, links), response)
 
-    return result
+# --------------------------
+# Batch lookup: ?ids=1,2,3 in one IN query, in request order, misses listed
+# --------------------------
+@router.get("/batch", response_model=Batch[UserRead])
+def get_users(ids: list[str] = Depends(batch_ids), db: Session = Depends(get_db)):
+    keys = lookup_keys(ids, int_key)
+    users = db.execute(row_select(User).where(User.id.in_(valid(keys)))).all() if valid(keys) else []
+    links = db.execute(provider_links([u.id for u in users])) if users else []
+    return raw_json_response(batch_body(UserRead, keys, user_reads(users, links)))
 
 @router.post("/link-user-provider")
 def link_user_to_provider(req: LinkUserToProviderRequest, db: Session = Depends(get_db)):
@@ -0,0 +1,238 @@
+#backend/user_service/routes/users_async.py
+# Same routes as routes/users.py, served from the AsyncEngine (DB_ASYNC=true).
+from datetime import datetime, timedelta
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from jose import jwt, JWTError
+
+from core.batch import Batch, batch_body, batch_ids, int_key, lookup_keys, valid
+from core.db import get_async_db
+from core.pagination import DEFAULT_LIMIT, MAX_LIMIT, paginate, page, set_next_cursor
+from core.reads import row_select
+from core.responses import json_response, raw_json_response
+from core.security import create_access_token
+from models.users import User, OTP, ProviderUserLink
+from schemas.users import (
+    SendCodeRequest,
+    VerifyCodeRequest,
+    LinkUserToProviderRequest,
+    Token,
+    EmailSchema,
+    UserRead, GuestUserRequest
+)
+from core.config import SECRET_KEY, ALGORITHM
+from routes.users import oauth2_scheme, generate_otp, provider_links, send_email, user_reads
+
+router = APIRouter()
+
+# Keyset sort key for the admin user listing
+USER_PAGE_KEY = (User.id,)
+
+
+async def _first(db: AsyncSession, stmt):
+    result = await db.execute(stmt.limit(1))
+    return result.scalars().first()
+
+
+async def get_current_user(
+    token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)
+):
+    try:
+        payload = jwt.decode(
+            token, SECRET_KEY, algorithms=[ALGORITHM]
+        )
+        user_id: str = payload.get("sub")
+        if user_id is None:
+            raise HTTPException(status_code=401, detail="Invalid token")
+    except JWTError:
+        raise HTTPException(status_code=401, detail="Invalid token")
+
+    user = await db.get(User, int(user_id))
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    return user
+
+
+# --------------------------
+# Send OTP  ##create user if user does not exist
+# --------------------------
+@router.post("/send-code")
+async def send_code(
+    req: SendCodeRequest,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db),
+):
+    # ensure user exists
+    db_user = await _first(db, select(User).where(User.email == req.email))
+    if not db_user:
+        db_user = User(email=req.email, verified=False)
+        db.add(db_user)
+        await db.commit()
+
+    # generate OTP
+    code = generate_otp(4)
+    expires_at = datetime.utcnow() + timedelta(minutes=5)
+
+    # save OTP in DB
+    otp_entry = OTP(email=req.email, code=code, expires_at=expires_at)
+    db.add(otp_entry)
+    await db.commit()
+
+    # send email
+    send_email(
+        EmailSchema(
+            email=req.email,
+            subject="Your Login Code",
+            body=f"Your code is: {code} and expires in 5 minutes.",
+        ),
+        background_tasks,
+    )
+
+    return {"message": "OTP sent to email"}
+
+
+# --------------------------
+# Verify OTP
+# --------------------------
+@router.post("/verify-code", response_model=Token)
+async def verify_code(req: VerifyCodeRequest, db: AsyncSession = Depends(get_async_db)):
+    otp_entry = await _first(
+        db,
+        select(OTP)
+        .where(OTP.email == req.email, OTP.code == req.code)
+        .order_by(OTP.created_at.desc()),
+    )
+
+    if not otp_entry:
+        raise HTTPException(status_code=401, detail="Invalid code")
+
+    if otp_entry.expires_at < datetime.utcnow():
+        raise HTTPException(status_code=401, detail="Code expired")
+
+    # delete OTP once used
+    await db.delete(otp_entry)
+
+    # mark user as verified
+    db_user = await _first(db, select(User).where(User.email == req.email))
+    if not db_user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    db_user.verified = True
+
+    # ✅ Link user to provider if provided and not already linked
+    if req.provider_id:
+        existing_link = await _first(
+            db,
+            select(ProviderUserLink).where(
+                ProviderUserLink.user_id == db_user.id,
+                ProviderUserLink.provider_id == req.provider_id,
+            ),
+        )
+        if not existing_link:
+            link = ProviderUserLink(user_id=db_user.id, provider_id=req.provider_id)
+            db.add(link)
+
+    await db.commit()
+
+    # issue token
+    token = create_access_token({"sub": str(db_user.id)})
+    return {"access_token": token, "token_type": "bearer"}
+
+
+# --------------------------
+# Get current user
+# --------------------------
+@router.get("/me", response_model=UserRead)
+async def read_users_me(current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
+    # Check if user is linked to any provider
+    provider_link = await _first(
+        db, select(ProviderUserLink).where(ProviderUserLink.user_id == current_user.id)
+    )
+
+    return {
+        "id": current_user.id,
+        "email": current_user.email,
+        "name": current_user.name,
+        "phone": current_user.phone,
+        "provider_id": provider_link.provider_id if provider_link else None
+    }
+
+# --------------------------
+# Get all users (Admin only)
+# --------------------------
+@router.get("/all", response_model=list[UserRead])
+async def get_all_users(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    db: AsyncSession = Depends(get_async_db),
+):
+    result = await db.execute(paginate(row_select(User), USER_PAGE_KEY, cursor, limit))
+    users, next_cursor = page(result.all(), USER_PAGE_KEY, limit)
+    set_next_cursor(response, next_cursor)
+    links = await db.execute(provider_links([u.id for u in users]))
+    return json_response(list[UserRead], user_reads(users, links), response)
+
+# --------------------------
+# Batch lookup: ?ids=1,2,3 in one IN query, in request order, misses listed
+# --------------------------
+@router.get("/batch", response_model=Batch[UserRead])
+async def get_users(ids: list[str] = Depends(batch_ids), db: AsyncSession = Depends(get_async_db)):
+    keys = lookup_keys(ids, int_key)
+    users = (await db.execute(row_select(User).where(User.id.in_(valid(keys))))).all() if valid(keys) else []
+    links = await db.execute(provider_links([u.id for u in users])) if users else []
+    return raw_json_response(batch_body(UserRead, keys, user_reads(users, links)))
+
+@router.post("/link-user-provider")
+async def link_user_to_provider(req: LinkUserToProviderRequest, db: AsyncSession = Depends(get_async_db)):
+    existing_link = await _first(
+        db,
+        select(ProviderUserLink).where(
+            ProviderUserLink.user_id == req.user_id,
+            ProviderUserLink.provider_id == req.provider_id
+        ),
+    )
+
+    if existing_link:
+        raise HTTPException(status_code=400, detail="User already linked to this provider")
+
+    link = ProviderUserLink(user_id=req.user_id, provider_id=req.provider_id)
+    db.add(link)
+    await db.commit()
+
+    return {"message": "User linked to provider successfully"}
+
+@router.post("/guest", response_model=UserRead)
+async def create_or_get_guest_user(
+    req: GuestUserRequest,
+    db: AsyncSession = Depends(get_async_db),
+):
+    if not req.email and not req.phone:
+        raise HTTPException(status_code=400, detail="Email or phone required")
+
+    if req.email:
+        user = await _first(db, select(User).where(User.email == req.email))
+    elif req.phone:
+        user = await _first(db, select(User).where(User.phone == req.phone))
+    else:
+        user = None
+
+    if user:
+        return user
+
+    guest = User(
+        email=req.email,
+        phone=req.phone,
+        name=req.name,
+        is_guest=True,
+        created_by_provider_id=req.provider_id,
+        verified=False,
+    )
+    db.add(guest)
+    await db.commit()
+    await db.refresh(guest)
+    return guest
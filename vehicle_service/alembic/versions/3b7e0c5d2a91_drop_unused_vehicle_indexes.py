@@ -0,0 +1,31 @@
+"""Drop unused vehicle indexes
+
+Revision ID: 3b7e0c5d2a91
+Revises: 9c91d8466edc
+Create Date: 2026-10-18 19:12:40.318702
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b7e0c5d2a91'
+down_revision: Union[str, None] = '9c91d8466edc'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# No query filters or sorts on these; owner_id is the leading column of ix_vehicles_owner_id_id
+COLUMNS = ['owner_id', 'make', 'model', 'yom', 'fuel_type', 'transmission', 'color']
+
+
+def upgrade() -> None:
+    for column in COLUMNS:
+        op.drop_index(op.f(f'ix_vehicles_vehicles_{column}'), table_name='vehicles', schema='vehicles')
+
+
+def downgrade() -> None:
+    for column in reversed(COLUMNS):
+        op.create_index(op.f(f'ix_vehicles_vehicles_{column}'), 'vehicles', [column], unique=False, schema='vehicles')
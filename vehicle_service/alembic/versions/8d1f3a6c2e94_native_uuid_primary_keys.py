@@ -0,0 +1,33 @@
+"""Native uuid primary keys
+
+Revision ID: 8d1f3a6c2e94
+Revises: 3b7e0c5d2a91
+Create Date: 2026-10-18 20:03:47.102955
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d1f3a6c2e94'
+down_revision: Union[str, None] = '3b7e0c5d2a91'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Existing ids are uuid4 text and convert in place; new rows get time-ordered uuid7 keys
+TABLES = ['vehicles']
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        op.alter_column(table, 'id', type_=sa.Uuid(), existing_type=sa.String(), existing_nullable=False,
+                        postgresql_using='id::uuid', schema='vehicles')
+
+
+def downgrade() -> None:
+    for table in reversed(TABLES):
+        op.alter_column(table, 'id', type_=sa.String(), existing_type=sa.Uuid(), existing_nullable=False,
+                        postgresql_using='id::text', schema='vehicles')
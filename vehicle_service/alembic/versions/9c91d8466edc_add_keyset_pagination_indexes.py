@@ -0,0 +1,26 @@
+"""Add keyset pagination indexes
+
+Revision ID: 9c91d8466edc
+Revises: 
+Create Date: 2026-10-18 16:54:14.790210
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c91d8466edc'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_vehicles_owner_id_id', 'vehicles', ['owner_id', 'id'], unique=False, schema='vehicles')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_vehicles_owner_id_id', table_name='vehicles', schema='vehicles')
@@ -0,0 +1,46 @@
+"""Change feed: updated_at and tombstones
+
+Revision ID: b91e27d4c6a0
+Revises: 8d1f3a6c2e94
+Create Date: 2026-10-18 21:10:52.604118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b91e27d4c6a0'
+down_revision: Union[str, None] = '8d1f3a6c2e94'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = [('vehicles', 'owner_id')]  # (table, owner column)
+
+
+def upgrade() -> None:
+    # Existing rows get the migration time, so each client's first sync is a full one
+    for table, owner in TABLES:
+        op.add_column(table, sa.Column('updated_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False), schema='vehicles')
+        op.create_index(f'ix_{table}_{owner}_updated_at_id', table, [owner, 'updated_at', 'id'], unique=False, schema='vehicles')
+    op.create_table(
+        'tombstones',
+        sa.Column('id', sa.Uuid(), nullable=False),
+        sa.Column('entity', sa.String(length=50), nullable=False),
+        sa.Column('entity_id', sa.String(), nullable=False),
+        sa.Column('owner_id', sa.Integer(), nullable=True),
+        sa.Column('deleted_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        schema='vehicles',
+    )
+    op.create_index('ix_tombstones_owner_id_deleted_at_id', 'tombstones', ['owner_id', 'deleted_at', 'id'], unique=False, schema='vehicles')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tombstones_owner_id_deleted_at_id', table_name='tombstones', schema='vehicles')
+    op.drop_table('tombstones', schema='vehicles')
+    for table, owner in reversed(TABLES):
+        op.drop_index(f'ix_{table}_{owner}_updated_at_id', table_name=table, schema='vehicles')
+        op.drop_column(table, 'updated_at', schema='vehicles')
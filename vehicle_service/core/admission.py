@@ -0,0 +1,162 @@
+# core/admission.py
+# Admission control. When the database slows down, requests pile up in the threadpool
+# and the connection-pool queue until clients time out and retry into an even longer
+# queue. This middleware caps how many requests run at once. A bounded number of
+# requests may wait for a slot, each for a limited time. Everything else gets an
+# immediate 503 with Retry-After, which is cheap to send and tells clients to back off.
+#
+# Lanes:
+#   priority   health checks, logins: their own slots, so overload elsewhere never blocks them
+#   default    every other request; sized below the threadpool so priority work finds a thread
+#   per route  optional cap per "METHOD /template", so one slow endpoint cannot take every slot
+#
+# OPTIONS (CORS preflights) skips admission: it touches no database, and shedding it would
+# fail the real request behind it in the browser before it is even sent.
+import asyncio
+import collections
+
+from starlette.responses import JSONResponse
+from starlette.routing import Match
+
+from .metrics import ADMISSION_ACTIVE, ADMISSION_QUEUED, ADMISSION_REJECTED
+
+
+class Overloaded(Exception):
+    def __init__(self, lane: str, reason: str):
+        super().__init__(f"{lane}: {reason}")
+        self.lane = lane
+        self.reason = reason
+
+
+class Lane:
+    """At most ``limit`` requests hold a slot; up to ``queue`` more wait in FIFO order."""
+
+    def __init__(self, name: str, limit: int, queue: int):
+        self.name = name
+        self.limit = limit
+        self.queue = queue
+        self.active = 0
+        self._waiters = collections.deque()
+        ADMISSION_ACTIVE.labels(name).set_function(lambda: self.active)
+        ADMISSION_QUEUED.labels(name).set_function(lambda: len(self._waiters))
+
+    async def acquire(self, deadline: float):
+        """Take a slot, waiting until ``deadline`` (event-loop time) at the latest."""
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            return
+        if len(self._waiters) >= self.queue:
+            raise Overloaded(self.name, "queue_full")
+
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, deadline - loop.time())
+        except (asyncio.TimeoutError, asyncio.CancelledError) as exc:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as we gave up: pass it on
+                self.release()
+            else:
+                try:
+                    self._waiters.remove(waiter)
+                except ValueError:
+                    pass
+            if isinstance(exc, asyncio.TimeoutError):
+                raise Overloaded(self.name, "queue_timeout") from None
+            raise
+
+    def release(self):
+        # Hand the slot straight to the oldest waiter, so newcomers cannot jump the queue
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+
+class AdmissionControlMiddleware:
+    """Sheds load with 503 + Retry-After once a lane's slots and queue are full.
+
+    max_concurrency: slots in the default lane (0 = admission control off).
+    queue: requests allowed to wait per lane; max_wait: seconds a request may wait in total.
+    route_concurrency: slots per route (0 = no per-route cap).
+    priority_paths: exact paths served from the priority lane, with priority_concurrency slots.
+    """
+
+    def __init__(
+        self,
+        app,
+        *,
+        max_concurrency: int,
+        queue: int = 64,
+        max_wait: float = 2.0,
+        route_concurrency: int = 0,
+        priority_paths=(),
+        priority_concurrency: int = 8,
+        retry_after: int = 1,
+    ):
+        self.app = app
+        self.enabled = max_concurrency > 0
+        self.queue = queue
+        self.max_wait = max_wait
+        self.route_concurrency = route_concurrency
+        self.priority_paths = frozenset(priority_paths)
+        self.retry_after = str(retry_after)
+        if self.enabled:
+            self.default = Lane("default", max_concurrency, queue)
+            self.priority = Lane("priority", priority_concurrency, queue)
+        self._routes = {}
+
+    def _route_lane(self, scope):
+        app = scope.get("app")
+        for route in getattr(getattr(app, "router", None), "routes", ()):
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                name = f"{scope['method']} {route.path}"
+                lane = self._routes.get(name)
+                if lane is None:
+                    lane = self._routes[name] = Lane(name, self.route_concurrency, self.queue)
+                return lane
+        return None
+
+    def _lanes(self, scope):
+        if scope["path"] in self.priority_paths:
+            return [self.priority]
+        lane = self._route_lane(scope) if self.route_concurrency else None
+        # Route lane first: a request queued behind a slow route holds no default slot
+        return [lane, self.default] if lane is not None else [self.default]
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.enabled or scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+
+        deadline = asyncio.get_running_loop().time() + self.max_wait
+        held = []
+        try:
+            for lane in self._lanes(scope):
+                await lane.acquire(deadline)
+                held.append(lane)
+        except Overloaded as exc:
+            for lane in held:
+                lane.release()
+            ADMISSION_REJECTED.labels(exc.lane, exc.reason).inc()
+            response = JSONResponse(
+                {"detail": "Service overloaded, retry later"},
+                status_code=503,
+                headers={"Retry-After": self.retry_after},
+            )
+            await response(scope, receive, send)
+            return
+        except BaseException:
+            for lane in held:
+                lane.release()
+            raise
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            for lane in held:
+                lane.release()
@@ -0,0 +1,70 @@
+# core/batch.py
+# Batch lookups for cross-service id resolution. A caller holding a page of foreign ids
+# (vehicle_id on bookings, provider_id on users, ...) resolves them with one request and one
+# IN query instead of a request and a query per id. Items come back in the order the ids
+# were asked for; ids with no row, and ids that are not valid ids at all, are listed in
+# "missing" rather than failing the whole batch.
+from typing import Callable, Dict, Generic, List, Mapping, Optional, TypeVar
+
+from fastapi import HTTPException, Query
+from pydantic import BaseModel
+
+from .responses import json_body
+
+BATCH_MAX_IDS = 100
+
+T = TypeVar("T")
+
+
+class Batch(BaseModel, Generic[T]):
+    items: List[T]
+    missing: List[str]
+
+
+def batch_ids(
+    ids: List[str] = Query(..., description=f"Up to {BATCH_MAX_IDS} ids, comma-separated or repeated"),
+) -> List[str]:
+    """FastAPI dependency: the requested ids in request order, without blanks or repeats."""
+    requested = list(dict.fromkeys(i.strip() for value in ids for i in value.split(",") if i.strip()))
+    if not requested:
+        raise HTTPException(status_code=422, detail="ids is empty")
+    if len(requested) > BATCH_MAX_IDS:
+        raise HTTPException(status_code=422, detail=f"At most {BATCH_MAX_IDS} ids per request")
+    return requested
+
+
+def lookup_keys(ids: List[str], parse: Callable = str) -> Dict[str, Optional[object]]:
+    """Requested id -> the key its row would have (``parse(id)``), or None if it cannot parse."""
+    keys = {}
+    for requested in ids:
+        try:
+            keys[requested] = parse(requested)
+        except ValueError:
+            keys[requested] = None
+    return keys
+
+
+def int_key(value: str) -> int:
+    """An integer primary key; ValueError for anything an INTEGER column cannot hold."""
+    key = int(value)
+    if not 0 < key < 2**31:
+        raise ValueError(value)
+    return key
+
+
+def valid(keys: Dict[str, Optional[object]]) -> list:
+    """The keys worth sending to the IN query."""
+    return [key for key in keys.values() if key is not None]
+
+
+def batch_body(tp, keys: Dict[str, Optional[object]], rows, key: str = "id") -> bytes:
+    """``rows`` (ORM objects, Rows or dicts) as a ``Batch[tp]`` in the order of ``keys``, as JSON."""
+    found = {}
+    for row in rows:
+        if isinstance(row, Mapping):
+            found[row[key]] = row
+        else:
+            found[getattr(row, key)] = getattr(row, "_mapping", row)
+    items = [found[k] for k in keys.values() if k in found]
+    missing = [requested for requested, k in keys.items() if k not in found]
+    return json_body(Batch[tp], {"items": items, "missing": missing})
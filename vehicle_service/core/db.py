@@ -1,13 +1,32 @@
 # backend/vehicle_service/core/db.py
 from sqlalchemy import create_engine, MetaData
 from sqlalchemy.orm import sessionmaker, declarative_base
-from core.config import DATABASE_URL
+from core.config import (
+    DATABASE_URL, DB_ASYNC, ASYNC_DATABASE_URL, REPLICA_DATABASE_URL, ASYNC_REPLICA_DATABASE_URL,
+    READ_YOUR_WRITES_SECONDS, REPLICA_MAX_LAG_SECONDS, REPLICA_LAG_CHECK_SECONDS,
+    SLOW_QUERY_MS, SLOW_QUERY_EXPLAIN_SAMPLE_RATE, SLOW_QUERY_EXPLAIN_TIMEOUT_MS,
+)
+from core.replica import ReplicaRouter
+from core.slow_queries import SlowQueryLog
 
 # Engine
 engine = create_engine(DATABASE_URL)
 
+# Optional read replica: GET requests read from it (see core/replica.py)
+replica_engine = create_engine(REPLICA_DATABASE_URL) if REPLICA_DATABASE_URL else None
+replicas = ReplicaRouter(
+    replica_engine,
+    sticky_seconds=READ_YOUR_WRITES_SECONDS,
+    max_lag_seconds=REPLICA_MAX_LAG_SECONDS,
+    check_seconds=REPLICA_LAG_CHECK_SECONDS,
+)
+
 # Session
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# expire_on_commit=False: rows returned by INSERT/UPDATE ... RETURNING stay usable after commit
+SessionLocal = sessionmaker(
+    class_=replicas.session_class(engine, replica_engine),
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=engine,
+)
 
 # Metadata for 'vehicles' schema
 metadata = MetaData(schema="vehicles")
@@ -20,3 +39,47 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# Async engine (DB_ASYNC=true)
+async_engine = None
+async_replica_engine = None
+AsyncSessionLocal = None
+
+if DB_ASYNC:
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+    async_engine = create_async_engine(ASYNC_DATABASE_URL)
+    if ASYNC_REPLICA_DATABASE_URL:
+        async_replica_engine = create_async_engine(ASYNC_REPLICA_DATABASE_URL)
+    # expire_on_commit=False: attribute access after commit must not trigger implicit IO
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine,
+        sync_session_class=replicas.session_class(
+            async_engine.sync_engine, async_replica_engine and async_replica_engine.sync_engine
+        ),
+        autoflush=False,
+        expire_on_commit=False,
+    )
+
+
+# Slow-query log (see core/slow_queries.py); EXPLAINs always run on a sync engine
+slow_queries = SlowQueryLog(
+    SLOW_QUERY_MS,
+    explain_sample_rate=SLOW_QUERY_EXPLAIN_SAMPLE_RATE,
+    explain_timeout_ms=SLOW_QUERY_EXPLAIN_TIMEOUT_MS,
+    logger_name="vehicle-service.slow_query",
+)
+slow_queries.instrument(engine)
+if replica_engine is not None:
+    slow_queries.instrument(replica_engine, "replica")
+if async_engine is not None:
+    slow_queries.instrument(async_engine.sync_engine, "async", explain_engine=engine)
+if async_replica_engine is not None:
+    slow_queries.instrument(async_replica_engine.sync_engine, "async_replica", explain_engine=replica_engine)
+
+
+# Async dependency
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,203 @@
+# core/replica.py
+# Read-replica routing. GET/HEAD requests read from the replica pool; other methods, and any
+# flush or INSERT/UPDATE/DELETE, go to the primary. A client that just wrote keeps reading
+# from the primary for a short window (read-your-writes), and reads fall back to the primary
+# while the replica lags or cannot be reached.
+import contextvars
+import hashlib
+import logging
+import math
+import threading
+import time
+from http.cookies import SimpleCookie
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.dml import UpdateBase
+from starlette.datastructures import MutableHeaders
+
+from .metrics import DB_REPLICA_AVAILABLE, DB_REPLICA_LAG, DB_ROUTED_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+READ_METHODS = ("GET", "HEAD")
+STICKY_COOKIE = "db_primary_until"
+
+# Seconds the replica is behind; 0 when it has replayed everything it received
+PG_REPLICA_LAG = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+_read_replica = contextvars.ContextVar("read_replica", default=False)
+
+
+def reading_from_replica() -> bool:
+    """True while serving a request whose reads may go to the replica."""
+    return _read_replica.get()
+
+
+class ReplicaRouter:
+    """Decides per request whether reads may go to ``replica``; a no-op when it is None."""
+
+    def __init__(self, replica=None, *, sticky_seconds: float = 5.0, max_lag_seconds: float = 10.0,
+                 check_seconds: float = 5.0):
+        self.replica = replica
+        self.sticky_seconds = sticky_seconds
+        self.max_lag_seconds = max_lag_seconds
+        self.check_seconds = check_seconds
+        self.lag = None  # None until measured, or on backends without replication (SQLite)
+        self.available = True
+        self._writes = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.replica is not None
+
+    def session_class(self, primary, replica):
+        """Session class for a sessionmaker: plain Session when there is no replica."""
+        if replica is None:
+            return Session
+
+        class RoutingSession(Session):
+            def get_bind(self, mapper=None, clause=None, **kw):
+                if (
+                    self._flushing
+                    or isinstance(clause, UpdateBase)
+                    or getattr(clause, "_for_update_arg", None) is not None
+                    or not _read_replica.get()
+                ):
+                    return primary
+                return replica
+
+        return RoutingSession
+
+    # --- read-your-writes ---
+    def record_write(self, client: Optional[str]) -> float:
+        """Time until which ``client`` reads from the primary; only the cookie carries it for
+        anonymous clients (``client`` None)."""
+        until = time.time() + self.sticky_seconds
+        if client is None:
+            return until
+        if len(self._writes) > 10000:
+            now = time.time()
+            self._writes = {k: v for k, v in self._writes.items() if v > now}
+        self._writes[client] = until
+        return until
+
+    def route(self, client: Optional[str], sticky_until: float = 0.0):
+        """(target, reason) for a read request from ``client``."""
+        written = self._writes.get(client, 0.0) if client is not None else 0.0
+        if max(written, sticky_until) > time.time():
+            return "primary", "sticky"
+        if not self.available:
+            return "primary", "unavailable"
+        if self.lag is not None and self.lag > self.max_lag_seconds:
+            return "primary", "lagging"
+        return "replica", "read"
+
+    # --- lag checks ---
+    def measure_lag(self):
+        try:
+            with self.replica.connect() as conn:
+                if conn.dialect.name == "postgresql":
+                    self.lag = float(conn.execute(PG_REPLICA_LAG).scalar())
+                    DB_REPLICA_LAG.set(self.lag)
+                else:
+                    conn.exec_driver_sql("SELECT 1")
+            if not self.available:
+                logger.info("read replica is reachable again")
+            self.available = True
+        except Exception:
+            if self.available:
+                logger.warning("read replica check failed; reading from the primary", exc_info=True)
+            self.available = False
+        DB_REPLICA_AVAILABLE.set(1 if self.available else 0)
+
+    def _run(self):
+        while True:
+            self.measure_lag()
+            if self._stop.wait(self.check_seconds):
+                return
+
+    def start(self):
+        if not self.enabled or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="replica-lag", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join(timeout=self.check_seconds)
+            self._thread = None
+
+
+def _client_key(scope) -> Optional[str]:
+    # Never the peer address: behind the gateway every client shares it, and one anonymous
+    # write would send every anonymous reader to the primary
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            return hashlib.sha1(value).hexdigest()
+    return None
+
+
+def _sticky_cookie(scope) -> float:
+    for name, value in scope["headers"]:
+        if name == b"cookie":
+            morsel = SimpleCookie(value.decode("latin-1")).get(STICKY_COOKIE)
+            if morsel is not None:
+                try:
+                    return float(morsel.value)
+                except ValueError:
+                    return 0.0
+    return 0.0
+
+
+class ReplicaRoutingMiddleware:
+    """Marks read requests that may use the replica and tracks who just wrote.
+
+    Stickiness is kept in a short-lived cookie, so a client that lands on another worker still
+    reads its writes, and per Authorization header in this process for clients that drop
+    cookies. Anonymous clients are only sticky through the cookie.
+    """
+
+    def __init__(self, app, router: ReplicaRouter):
+        self.app = app
+        self.router = router
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.router.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        client = _client_key(scope)
+        if scope["method"] in READ_METHODS:
+            target, reason = self.router.route(client, _sticky_cookie(scope))
+            DB_ROUTED_REQUESTS.labels(target, reason).inc()
+            token = _read_replica.set(target == "replica")
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                _read_replica.reset(token)
+            return
+
+        DB_ROUTED_REQUESTS.labels("primary", "write").inc()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                until = self.router.record_write(client)
+                MutableHeaders(scope=message).append(
+                    "set-cookie",
+                    f"{STICKY_COOKIE}={until:.3f}; Max-Age={math.ceil(self.router.sticky_seconds)}; "
+                    "Path=/; HttpOnly; SameSite=Lax",
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
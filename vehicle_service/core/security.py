@@ -1,5 +1,10 @@
 #Vehicle_Service/core/security.py
 # This module handles JWT token decoding and user authentication.
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 import jwt
@@ -8,24 +13,68 @@ from core.config import SECRET_KEY, ALGORITHM
 # Adjust tokenUrl if your gateway exposes it under a different path
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="users/login")
 
+# Verified-claims cache: sha256(token) -> (evict_at, claims). Entries never outlive the
+# token's own exp; tokens without exp are re-verified after CLAIMS_CACHE_MAX_TTL seconds.
+CLAIMS_CACHE_SIZE = 4096
+CLAIMS_CACHE_MAX_TTL = 300
+
+_claims_cache = OrderedDict()
+_claims_lock = threading.Lock()
+
+
+def _cached_claims(key: bytes):
+    now = time.time()
+    with _claims_lock:
+        hit = _claims_cache.get(key)
+        if hit is None:
+            return None
+        evict_at, claims = hit
+        if evict_at <= now:
+            del _claims_cache[key]
+            return None
+        _claims_cache.move_to_end(key)
+        return claims
+
+
+def _cache_claims(key: bytes, claims: dict):
+    now = time.time()
+    evict_at = now + CLAIMS_CACHE_MAX_TTL
+    exp = claims.get("exp")
+    if isinstance(exp, (int, float)):
+        evict_at = min(evict_at, exp)
+    with _claims_lock:
+        _claims_cache[key] = (evict_at, claims)
+        _claims_cache.move_to_end(key)
+        while len(_claims_cache) > CLAIMS_CACHE_SIZE:
+            _claims_cache.popitem(last=False)
+
+
 def decode_access_token(token: str) -> dict:
+    # The returned claims are shared through the cache: read them, don't mutate them
+    key = hashlib.sha256(token.encode()).digest()
+    claims = _cached_claims(key)
+    if claims is not None:
+        return claims
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
     except Exception:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired token",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    _cache_claims(key, payload)
+    return payload
+
+def get_current_principal(token: str = Depends(oauth2_scheme)) -> dict:
+    # FastAPI resolves a dependency once per request, so every dependant shares one decode
+    return decode_access_token(token)
 
-def get_current_user_id(token: str = Depends(oauth2_scheme)) -> str:
-    payload = decode_access_token(token)
+def get_current_user_id(payload: dict = Depends(get_current_principal)) -> str:
     sub = payload.get("sub")
     if not sub:
         raise HTTPException(status_code=401, detail="Invalid token payload")
     return sub
 
-def get_current_user_role(token: str = Depends(oauth2_scheme)) -> str:
-    payload = decode_access_token(token)
+def get_current_user_role(payload: dict = Depends(get_current_principal)) -> str:
     return payload.get("role", "user")
@@ -0,0 +1,104 @@
+# core/startup.py
+# Startup work runs once in the lifespan handler instead of at import time, so importing
+# main does no I/O: the schema is checked against the alembic head (or created, in dev)
+# and a few pool connections are opened before the first request arrives.
+import logging
+import os
+from contextlib import AsyncExitStack, asynccontextmanager
+
+from anyio import to_thread
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_MODES = ("check", "create_all", "off")
+
+
+def alembic_heads(alembic_ini: str) -> set:
+    # alembic is only needed here, not on the request path
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+
+    config = Config(alembic_ini)
+    # script_location is relative to the service directory, not the process cwd
+    location = config.get_main_option("script_location")
+    config.set_main_option("script_location", os.path.join(os.path.dirname(alembic_ini), location))
+    return set(ScriptDirectory.from_config(config).get_heads())
+
+
+def check_schema(engine, alembic_ini: str) -> bool:
+    """Compare the database revision with the migration head; one query, no DDL."""
+    from alembic.config import Config
+    from alembic.runtime.migration import MigrationContext
+
+    config = Config(alembic_ini)
+    expected = alembic_heads(alembic_ini)
+    with engine.connect() as conn:
+        context = MigrationContext.configure(conn, opts={
+            "version_table": config.get_main_option("version_table", "alembic_version"),
+            "version_table_schema": config.get_main_option("version_table_schema"),
+        })
+        current = set(context.get_current_heads())
+    if current != expected:
+        logger.error(
+            "database schema is at %s but the code expects %s; run `alembic upgrade head`",
+            sorted(current) or "no revision", sorted(expected),
+        )
+        return False
+    return True
+
+
+def prepare_schema(engine, mode: str, metadata=None, alembic_ini: str = None):
+    if mode == "check":
+        try:
+            check_schema(engine, alembic_ini)
+        except Exception:
+            logger.warning("could not check the database schema", exc_info=True)
+    elif mode == "create_all":
+        metadata.create_all(bind=engine)
+    elif mode != "off":
+        raise ValueError(f"SCHEMA_MODE must be one of {SCHEMA_MODES}, got {mode!r}")
+
+
+def warm_up(engine, connections: int):
+    # Hold them all at once so the pool really ends up with `connections` open sockets
+    opened = []
+    try:
+        for _ in range(connections):
+            conn = engine.connect()
+            opened.append(conn)
+            conn.exec_driver_sql("SELECT 1")
+    finally:
+        for conn in opened:
+            conn.close()
+
+
+async def warm_up_async(async_engine, connections: int):
+    async with AsyncExitStack() as stack:
+        for _ in range(connections):
+            conn = await stack.enter_async_context(async_engine.connect())
+            await conn.exec_driver_sql("SELECT 1")
+
+
+def lifespan_for(engine, async_engine=None, *, schema_mode="check", metadata=None, alembic_ini=None, warmup_connections=2,
+                 background=()):
+    """``background``: objects with start()/stop() that run for the lifetime of the app."""
+
+    @asynccontextmanager
+    async def lifespan(app):
+        await to_thread.run_sync(prepare_schema, engine, schema_mode, metadata, alembic_ini)
+        try:
+            await to_thread.run_sync(warm_up, engine, warmup_connections)
+            if async_engine is not None:
+                await warm_up_async(async_engine, warmup_connections)
+        except Exception:
+            # Not fatal: the pool connects lazily on first use, as it did before
+            logger.warning("database warm-up failed", exc_info=True)
+        for task in background:
+            task.start()
+        try:
+            yield
+        finally:
+            for task in background:
+                await to_thread.run_sync(task.stop)
+
+    return lifespan
@@ -1,11 +1,16 @@
 # vehicle_service/crud/vehicles.py
 
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from fastapi import HTTPException
+from sqlalchemy import delete, insert, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from models.vehicles import Vehicle
-from schemas.vehicles import VehicleCreate, VehicleUpdate
+from core.changes import ChangeFeed, Source
+from core.config import CHANGES_SETTLE_SECONDS
+from core.pagination import DEFAULT_LIMIT, paginate, page
+from models.vehicles import Tombstone, Vehicle
+from schemas.vehicles import VehicleCreate, VehicleRead, VehicleUpdate
 import httpx
 
 
@@ -13,91 +18,118 @@ def normalize_plate(plate: str) -> str:
     return plate.strip().upper()
 
 
-# --- CREATE ---
-def create_vehicle(db: Session, user_id: str, payload: VehicleCreate) -> Vehicle:
-    plate = normalize_plate(payload.plate)
+UPDATE_FIELDS = ["make", "model", "mileage", "yom", "fuel_type", "transmission", "color"]
+
+
+def owned_by(user_id: str, vehicle_id: str):
+    # Ownership is part of the WHERE clause, so one statement both checks and acts
+    return (Vehicle.id == vehicle_id, Vehicle.owner_id == int(user_id))
+
+
+def vehicle_changes(payload: VehicleUpdate) -> dict:
+    changes = {f: getattr(payload, f) for f in UPDATE_FIELDS if getattr(payload, f) is not None}
+    if payload.plate is not None:
+        changes["plate"] = normalize_plate(payload.plate)
+    return changes
 
-    existing = db.query(Vehicle).filter(Vehicle.plate == plate).first()
-    if existing:
-        raise HTTPException(status_code=400, detail="Plate already registered")
 
-    vehicle = Vehicle(
-        owner_id=user_id,
+def plate_taken() -> HTTPException:
+    return HTTPException(status_code=400, detail="Plate already registered")
+
+
+# --- CREATE ---
+def create_vehicle(db: Session, user_id: str, payload: VehicleCreate) -> Vehicle:
+    # INSERT ... RETURNING; the unique index on plate replaces the pre-insert lookup
+    stmt = insert(Vehicle).values(
+        owner_id=int(user_id),
         make=payload.make,
         model=payload.model,
-        plate=plate,
+        plate=normalize_plate(payload.plate),
         mileage=payload.mileage or 0,
         yom=payload.yom,
         fuel_type=payload.fuel_type,
         transmission=payload.transmission,
         color=payload.color,
-    )
-
-    db.add(vehicle)
-    db.commit()
-    db.refresh(vehicle)
+    ).returning(Vehicle)
+    try:
+        vehicle = db.scalars(stmt).one()
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise plate_taken()
     return vehicle
 
 
 # --- READ (LIST) ---
+# Vehicles carry no created_at, so pages walk the primary key
+VEHICLE_PAGE_KEY = (Vehicle.id,)
+
+
 def list_vehicles(
     db: Session,
     user_id: str,
     plate: Optional[str] = None,
-    skip: int = 0,
-    limit: int = 50,
-) -> List[Vehicle]:
-    q = db.query(Vehicle).filter(Vehicle.owner_id == user_id)
+    limit: int = DEFAULT_LIMIT,
+    cursor: Optional[str] = None,
+) -> Tuple[List[Vehicle], Optional[str]]:
+    q = db.query(Vehicle).filter(Vehicle.owner_id == int(user_id))
     if plate:
         q = q.filter(Vehicle.plate == normalize_plate(plate))
-    return q.offset(skip).limit(limit).all()
+    return page(paginate(q, VEHICLE_PAGE_KEY, cursor, limit).all(), VEHICLE_PAGE_KEY, limit)
 
 
 # --- READ (SINGLE) ---
 def get_vehicle(db: Session, user_id: str, vehicle_id: str) -> Vehicle:
-    v = db.query(Vehicle).filter(Vehicle.id == vehicle_id).first()
-    if not v or v.owner_id != user_id:
+    v = db.query(Vehicle).filter(*owned_by(user_id, vehicle_id)).first()
+    if not v:
         raise HTTPException(status_code=404, detail="Vehicle not found")
     return v
 
 
+def get_vehicles(db: Session, user_id: str, vehicle_ids: List[str]) -> List[Vehicle]:
+    # One IN query for a batch; ids the user does not own simply do not come back
+    if not vehicle_ids:
+        return []
+    return db.query(Vehicle).filter(Vehicle.owner_id == int(user_id), Vehicle.id.in_(vehicle_ids)).all()
+
+
 # --- UPDATE ---
 def update_vehicle(
     db: Session, user_id: str, vehicle_id: str, payload: VehicleUpdate
 ) -> Vehicle:
-    v = db.query(Vehicle).filter(Vehicle.id == vehicle_id).first()
-    if not v or v.owner_id != user_id:
+    changes = vehicle_changes(payload)
+    if not changes:
+        return get_vehicle(db, user_id, vehicle_id)
+
+    stmt = update(Vehicle).where(*owned_by(user_id, vehicle_id)).values(**changes).returning(Vehicle)
+    try:
+        v = db.scalars(stmt).first()
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise plate_taken()
+    if not v:
         raise HTTPException(status_code=404, detail="Vehicle not found")
-
-    if payload.plate is not None:
-        new_plate = normalize_plate(payload.plate)
-        if new_plate != v.plate:
-            exists = db.query(Vehicle).filter(Vehicle.plate == new_plate).first()
-            if exists:
-                raise HTTPException(status_code=400, detail="Plate already registered")
-            v.plate = new_plate
-
-    update_fields = [
-        "make", "model", "mileage", "yom", "fuel_type", "transmission", "color"
-    ]
-    for field in update_fields:
-        value = getattr(payload, field)
-        if value is not None:
-            setattr(v, field, value)
-
-    db.add(v)
-    db.commit()
-    db.refresh(v)
     return v
 
 
 # --- DELETE ---
 def delete_vehicle(db: Session, user_id: str, vehicle_id: str):
-    v = db.query(Vehicle).filter(Vehicle.id == vehicle_id).first()
-    if not v or v.owner_id != user_id:
-        raise HTTPException(status_code=404, detail="Vehicle not found")
-    db.delete(v)
+    deleted = db.execute(delete(Vehicle).where(*owned_by(user_id, vehicle_id)).returning(Vehicle.id, Vehicle.owner_id)).first()
+    if deleted:
+        # Same transaction: the change feed sees the delete exactly when the row is gone
+        db.execute(insert(Tombstone).values(entity="vehicle", entity_id=deleted.id, owner_id=deleted.owner_id))
     db.commit()
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Vehicle not found")
+
+# --- CHANGE FEED ---
+feed = ChangeFeed([Source("vehicle", Vehicle, "owner_id", VehicleRead)], Tombstone, CHANGES_SETTLE_SECONDS)
+
+
+def list_changes(db: Session, user_id: str, since: Optional[str], limit: int) -> bytes:
+    results = [db.execute(stmt).all() for stmt in feed.queries(int(user_id), since, limit)]
+    return feed.page(results, since, limit)
 
 # --- ASYNC GUEST VEHICLE CREATION ---
 async def create_guest_vehicle(db: Session, payload: VehicleCreate) -> Vehicle:
@@ -105,7 +137,7 @@ async def create_guest_vehicle(db: Session, payload: VehicleCreate) -> Vehicle:
     Creates a guest user in user-service, then registers their vehicle.
     """
     # 2️⃣ Create their vehicle
-    vehicle = Vehicle(
+    stmt = insert(Vehicle).values(
         owner_id=payload.owner_id,  # This is the guest user ID from user-service
         make=payload.make,
         model=payload.model,
@@ -119,11 +151,8 @@ async def create_guest_vehicle(db: Session, payload: VehicleCreate) -> Vehicle:
         guest_owner_email=payload.guest_owner_email,
         guest_owner_phone=payload.guest_owner_phone,
         created_by_provider_id=payload.created_by_provider_id,
-    )
+    ).returning(Vehicle)
 
-    db.add(vehicle)
+    vehicle = db.scalars(stmt).one()
     db.commit()
-    db.refresh(vehicle)
     return vehicle
-
-
@@ -0,0 +1,116 @@
+# vehicle_service/crud/vehicles_async.py
+# Async twins of crud/vehicles.py, used when DB_ASYNC is enabled.
+
+from typing import List, Optional, Tuple
+from fastapi import HTTPException
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.pagination import DEFAULT_LIMIT, paginate, page
+from models.vehicles import Tombstone, Vehicle
+from schemas.vehicles import VehicleCreate, VehicleUpdate
+from crud.vehicles import feed, normalize_plate, owned_by, plate_taken, vehicle_changes
+
+
+# --- CREATE ---
+async def create_vehicle(db: AsyncSession, user_id: str, payload: VehicleCreate) -> Vehicle:
+    stmt = insert(Vehicle).values(
+        owner_id=int(user_id),
+        make=payload.make,
+        model=payload.model,
+        plate=normalize_plate(payload.plate),
+        mileage=payload.mileage or 0,
+        yom=payload.yom,
+        fuel_type=payload.fuel_type,
+        transmission=payload.transmission,
+        color=payload.color,
+    ).returning(Vehicle)
+    try:
+        vehicle = (await db.scalars(stmt)).one()
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise plate_taken()
+    return vehicle
+
+
+# --- READ (LIST) ---
+# Vehicles carry no created_at, so pages walk the primary key
+VEHICLE_PAGE_KEY = (Vehicle.id,)
+
+
+async def list_vehicles(
+    db: AsyncSession,
+    user_id: str,
+    plate: Optional[str] = None,
+    limit: int = DEFAULT_LIMIT,
+    cursor: Optional[str] = None,
+) -> Tuple[List[Vehicle], Optional[str]]:
+    q = select(Vehicle).where(Vehicle.owner_id == int(user_id))
+    if plate:
+        q = q.where(Vehicle.plate == normalize_plate(plate))
+    result = await db.execute(paginate(q, VEHICLE_PAGE_KEY, cursor, limit))
+    return page(result.scalars().all(), VEHICLE_PAGE_KEY, limit)
+
+
+# --- READ (SINGLE) ---
+async def get_vehicle(db: AsyncSession, user_id: str, vehicle_id: str) -> Vehicle:
+    result = await db.execute(select(Vehicle).where(*owned_by(user_id, vehicle_id)))
+    v = result.scalars().first()
+    if not v:
+        raise HTTPException(status_code=404, detail="Vehicle not found")
+    return v
+
+
+async def get_vehicles(db: AsyncSession, user_id: str, vehicle_ids: List[str]) -> List[Vehicle]:
+    if not vehicle_ids:
+        return []
+    result = await db.execute(
+        select(Vehicle).where(Vehicle.owner_id == int(user_id), Vehicle.id.in_(vehicle_ids))
+    )
+    return result.scalars().all()
+
+
+# --- UPDATE ---
+async def update_vehicle(
+    db: AsyncSession, user_id: str, vehicle_id: str, payload: VehicleUpdate
+) -> Vehicle:
+    changes = vehicle_changes(payload)
+    if not changes:
+        return await get_vehicle(db, user_id, vehicle_id)
+
+    stmt = update(Vehicle).where(*owned_by(user_id, vehicle_id)).values(**changes).returning(Vehicle)
+    try:
+        v = (await db.scalars(stmt)).first()
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise plate_taken()
+    if not v:
+        raise HTTPException(status_code=404, detail="Vehicle not found")
+    return v
+
+
+# --- DELETE ---
+async def delete_vehicle(db: AsyncSession, user_id: str, vehicle_id: str):
+    result = await db.execute(delete(Vehicle).where(*owned_by(user_id, vehicle_id)).returning(Vehicle.id, Vehicle.owner_id))
+    deleted = result.first()
+    if deleted:
+        await db.execute(insert(Tombstone).values(entity="vehicle", entity_id=deleted.id, owner_id=deleted.owner_id))
+    await db.commit()
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Vehicle not found")
+
+
+# --- CHANGE FEED ---
+async def list_changes(db: AsyncSession, user_id: str, since: Optional[str], limit: int) -> bytes:
+    results = [(await db.execute(stmt)).all() for stmt in feed.queries(int(user_id), since, limit)]
+    return feed.page(results, since, limit)
+
+
+# --- GUEST VEHICLE CREATION ---
+async def create_guest_vehicle(db: AsyncSession, payload: VehicleCreate) -> Vehicle:
+    vehicle = (await db.scalars(insert(Vehicle).values(**payload.dict()).returning(Vehicle))).one()
+    await db.commit()
+    return vehicle
@@ -1,23 +1,29 @@
 # services/vehicle_service/models/vehicles.py
 
-import uuid
-from sqlalchemy import Column, String, Integer
+from sqlalchemy import Column, String, Integer, Index, TIMESTAMP, func
 from core.db import Base
+from core.ids import UUIDKey, new_id
 
 class Vehicle(Base):
     __tablename__ = "vehicles"
-    __table_args__ = {"schema": "vehicles"}
+    __table_args__ = (
+        # Keyset pagination: an owner's garage is paged by id off this index
+        Index("ix_vehicles_owner_id_id", "owner_id", "id"),
+        # Change feed: an owner's changes since a cursor
+        Index("ix_vehicles_owner_id_updated_at_id", "owner_id", "updated_at", "id"),
+        {"schema": "vehicles"},
+    )
 
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    owner_id = Column(Integer, index=True, nullable=True)  # 🔹 make optional
-    make = Column(String, index=True)
-    model = Column(String, index=True)
+    id = Column(UUIDKey, primary_key=True, default=new_id)
+    owner_id = Column(Integer, nullable=True)  # 🔹 make optional
+    make = Column(String)
+    model = Column(String)
     plate = Column(String, unique=True, index=True)
     mileage = Column(Integer, default=0)
-    yom = Column(Integer, index=True)
-    fuel_type = Column(String, index=True)
-    transmission = Column(String, index=True, nullable=True)
-    color = Column(String, index=True, nullable=True)
+    yom = Column(Integer)
+    fuel_type = Column(String)
+    transmission = Column(String, nullable=True)
+    color = Column(String, nullable=True)
 
     # 🔹 NEW: guest vehicle metadata
     guest_owner_name = Column(String, nullable=True)
@@ -25,6 +31,24 @@ class Vehicle(Base):
     guest_owner_phone = Column(String, nullable=True)
     created_by_provider_id = Column(String, nullable=True)
 
+    updated_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+
+class Tombstone(Base):
+    """A deleted vehicle, kept so the change feed can tell clients to drop it."""
+
+    __tablename__ = "tombstones"
+    __table_args__ = (
+        Index("ix_tombstones_owner_id_deleted_at_id", "owner_id", "deleted_at", "id"),
+        {"schema": "vehicles"},
+    )
+
+    id = Column(UUIDKey, primary_key=True, default=new_id)
+    entity = Column(String(50), nullable=False)
+    entity_id = Column(String, nullable=False)
+    owner_id = Column(Integer, nullable=True)
+    deleted_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
+
 
     
 
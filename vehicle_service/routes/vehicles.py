@@ -1,20 +1,30 @@
 # vehicle_service/routes/vehicles.py
 
 from typing import List, Optional
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Query, Request, Response, status
 from sqlalchemy.orm import Session
 import httpx
 
+from core.batch import Batch, batch_body, batch_ids, lookup_keys, valid
+from core.changes import CHANGES_DEFAULT_LIMIT, CHANGES_MAX_LIMIT, ChangePage
+from core.config import SINGLE_FLIGHT_TTL_SECONDS
 from core.db import get_db
+from core.etag import PRIVATE_REVALIDATE, conditional
+from core.ids import canonical_id
+from core.pagination import DEFAULT_LIMIT, set_next_cursor
+from core.responses import json_body, json_response, raw_json_response
 from core.security import get_current_user_id
+from core.singleflight import SingleFlight
 from schemas.vehicles import VehicleCreate, VehicleRead, VehicleUpdate
 from crud.vehicles import (
     create_vehicle,
     list_vehicles,
     get_vehicle,
+    get_vehicles,
     update_vehicle,
     delete_vehicle,
     create_guest_vehicle,
+    list_changes,
 )
 from models.vehicles import Vehicle
 from fastapi.exceptions import RequestValidationError
@@ -25,6 +35,9 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Concurrent requests for the same vehicle share one lookup and rendered body
+flights = SingleFlight(SINGLE_FLIGHT_TTL_SECONDS)
+
 
 @router.post("/", response_model=VehicleRead, status_code=status.HTTP_201_CREATED)
 def create_vehicle_route(
@@ -37,13 +50,40 @@ def create_vehicle_route(
 
 @router.get("/", response_model=List[VehicleRead])
 def list_vehicles_route(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     user_id: str = Depends(get_current_user_id),
     plate: Optional[str] = Query(None),
-    skip: int = Query(0, ge=0),
-    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=100),
 ):
-    return list_vehicles(db, user_id, plate, skip, limit)
+    rows, next_cursor = list_vehicles(db, user_id, plate, limit, cursor)
+    set_next_cursor(response, next_cursor)
+    return conditional(request, json_response(List[VehicleRead], rows, response), PRIVATE_REVALIDATE)
+
+
+# Delta sync: only what changed (or was deleted) after the client's cursor
+@router.get("/changes", response_model=ChangePage)
+def list_changes_route(
+    since: Optional[str] = Query(None),
+    limit: int = Query(CHANGES_DEFAULT_LIMIT, ge=1, le=CHANGES_MAX_LIMIT),
+    db: Session = Depends(get_db),
+    user_id: str = Depends(get_current_user_id),
+):
+    return raw_json_response(list_changes(db, user_id, since, limit))
+
+
+# Batch lookup: ?ids=a,b,c in one IN query, in request order, misses listed
+@router.get("/batch", response_model=Batch[VehicleRead])
+def get_vehicles_route(
+    ids: List[str] = Depends(batch_ids),
+    db: Session = Depends(get_db),
+    user_id: str = Depends(get_current_user_id),
+):
+    keys = lookup_keys(ids, canonical_id)
+    rows = get_vehicles(db, user_id, valid(keys))
+    return raw_json_response(batch_body(VehicleRead, keys, rows))
 
 
 @router.get("/{vehicle_id}", response_model=VehicleRead)
@@ -52,7 +92,10 @@ def get_vehicle_route(
     db: Session = Depends(get_db),
     user_id: str = Depends(get_current_user_id),
 ):
-    return get_vehicle(db, user_id, vehicle_id)
+    def load():
+        return json_body(VehicleRead, get_vehicle(db, user_id, vehicle_id))
+
+    return raw_json_response(flights.do(("get_vehicle", user_id, vehicle_id), load))
 
 
 @router.put("/{vehicle_id}", response_model=VehicleRead)
@@ -62,7 +105,9 @@ def update_vehicle_route(
     db: Session = Depends(get_db),
     user_id: str = Depends(get_current_user_id),
 ):
-    return update_vehicle(db, user_id, vehicle_id, payload)
+    vehicle = update_vehicle(db, user_id, vehicle_id, payload)
+    flights.forget(("get_vehicle", user_id, vehicle_id))
+    return vehicle
 
 
 @router.delete("/{vehicle_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -72,6 +117,7 @@ def delete_vehicle_route(
     user_id: str = Depends(get_current_user_id),
 ):
     delete_vehicle(db, user_id, vehicle_id)
+    flights.forget(("get_vehicle", user_id, vehicle_id))
     return None
 
 @router.post("/guest", response_model=VehicleRead)
@@ -0,0 +1,121 @@
+# vehicle_service/routes/vehicles_async.py
+# Same routes as routes/vehicles.py, served from the AsyncEngine (DB_ASYNC=true).
+
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.batch import Batch, batch_body, batch_ids, lookup_keys, valid
+from core.changes import CHANGES_DEFAULT_LIMIT, CHANGES_MAX_LIMIT, ChangePage
+from core.config import SINGLE_FLIGHT_TTL_SECONDS
+from core.db import get_async_db
+from core.etag import PRIVATE_REVALIDATE, conditional
+from core.ids import canonical_id
+from core.pagination import DEFAULT_LIMIT, set_next_cursor
+from core.responses import json_body, json_response, raw_json_response
+from core.security import get_current_user_id
+from core.singleflight import SingleFlight
+from schemas.vehicles import VehicleCreate, VehicleRead, VehicleUpdate
+from crud.vehicles_async import (
+    create_vehicle,
+    list_vehicles,
+    get_vehicle,
+    get_vehicles,
+    update_vehicle,
+    delete_vehicle,
+    create_guest_vehicle,
+    list_changes,
+)
+
+router = APIRouter()
+
+# Concurrent requests for the same vehicle share one lookup and rendered body
+flights = SingleFlight(SINGLE_FLIGHT_TTL_SECONDS)
+
+
+@router.post("/", response_model=VehicleRead, status_code=status.HTTP_201_CREATED)
+async def create_vehicle_route(
+    payload: VehicleCreate,
+    db: AsyncSession = Depends(get_async_db),
+    user_id: str = Depends(get_current_user_id),
+):
+    return await create_vehicle(db, user_id, payload)
+
+
+@router.get("/", response_model=List[VehicleRead])
+async def list_vehicles_route(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    user_id: str = Depends(get_current_user_id),
+    plate: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=100),
+):
+    rows, next_cursor = await list_vehicles(db, user_id, plate, limit, cursor)
+    set_next_cursor(response, next_cursor)
+    return conditional(request, json_response(List[VehicleRead], rows, response), PRIVATE_REVALIDATE)
+
+
+# Delta sync: only what changed (or was deleted) after the client's cursor
+@router.get("/changes", response_model=ChangePage)
+async def list_changes_route(
+    since: Optional[str] = Query(None),
+    limit: int = Query(CHANGES_DEFAULT_LIMIT, ge=1, le=CHANGES_MAX_LIMIT),
+    db: AsyncSession = Depends(get_async_db),
+    user_id: str = Depends(get_current_user_id),
+):
+    return raw_json_response(await list_changes(db, user_id, since, limit))
+
+
+# Batch lookup: ?ids=a,b,c in one IN query, in request order, misses listed
+@router.get("/batch", response_model=Batch[VehicleRead])
+async def get_vehicles_route(
+    ids: List[str] = Depends(batch_ids),
+    db: AsyncSession = Depends(get_async_db),
+    user_id: str = Depends(get_current_user_id),
+):
+    keys = lookup_keys(ids, canonical_id)
+    rows = await get_vehicles(db, user_id, valid(keys))
+    return raw_json_response(batch_body(VehicleRead, keys, rows))
+
+
+@router.get("/{vehicle_id}", response_model=VehicleRead)
+async def get_vehicle_route(
+    vehicle_id: str,
+    db: AsyncSession = Depends(get_async_db),
+    user_id: str = Depends(get_current_user_id),
+):
+    async def load():
+        return json_body(VehicleRead, await get_vehicle(db, user_id, vehicle_id))
+
+    return raw_json_response(await flights.do_async(("get_vehicle", user_id, vehicle_id), load))
+
+
+@router.put("/{vehicle_id}", response_model=VehicleRead)
+async def update_vehicle_route(
+    vehicle_id: str,
+    payload: VehicleUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    user_id: str = Depends(get_current_user_id),
+):
+    vehicle = await update_vehicle(db, user_id, vehicle_id, payload)
+    flights.forget(("get_vehicle", user_id, vehicle_id))
+    return vehicle
+
+
+@router.delete("/{vehicle_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_vehicle_route(
+    vehicle_id: str,
+    db: AsyncSession = Depends(get_async_db),
+    user_id: str = Depends(get_current_user_id),
+):
+    await delete_vehicle(db, user_id, vehicle_id)
+    flights.forget(("get_vehicle", user_id, vehicle_id))
+    return None
+
+@router.post("/guest", response_model=VehicleRead)
+async def create_guest_vehicle_route(payload: VehicleCreate, db: AsyncSession = Depends(get_async_db)):
+    if not payload.owner_id:
+        raise HTTPException(status_code=400, detail="Owner ID required for guest vehicle")
+    return await create_guest_vehicle(db, payload)
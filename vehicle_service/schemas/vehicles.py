@@ -1,5 +1,5 @@
 #vehicle_service/schemas/vehicles.py
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional
 
 class VehicleBase(BaseModel):
@@ -36,5 +36,4 @@ class VehicleRead(VehicleBase):
     id: str
     owner_id: int
 
-    class Config:
-        from_attributes = True  # replaces orm_mode in Pydantic v2
+    model_config = ConfigDict(from_attributes=True)